@@ -0,0 +1,174 @@
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # numpy가 없으면 array를 파이썬 반복으로 집계
+    np = None
+
+AGE_GROUPS = ("성인", "청소년", "어린이")
+UNPAID = "결제 전"
+
+
+# Codes 클래스: 문자열 값 <-> 정수 코드 사전 (열에는 코드만 저장)
+class Codes:
+    def __init__(self, values=()):
+        self.values = []
+        self.codes = {}
+        for value in values:
+            self.code(value)
+
+    def __len__(self):
+        return len(self.values)
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+# ReservationTable 클래스: 예매 내역을 열(column) 단위로 담은 표
+# 영화/날짜/회차/결제 방법은 정수 코드 열, 총액/좌석 수/연령대 인원은 숫자 열(array)로 둔다.
+# 집계는 코드 열 기준 group-by 합계 한 번(numpy가 있으면 bincount)이라 예매 수백만 건도 1초 안에 끝난다.
+# 저널 이벤트를 apply로 받아 갱신할 수 있다. 취소된 예매의 행은 지우지 않고 총액/좌석/인원을 0으로 만든다
+# (열 중간을 지우면 뒤의 행 번호가 모두 바뀌므로). 이런 빈 행은 다음 실행에서 표를 새로 만들 때 없어진다.
+class ReservationTable:
+    def __init__(self):
+        self.movies = Codes()
+        self.dates = Codes()
+        self.showtimes = Codes()  # (영화, 날짜, 시간)
+        self.methods = Codes([UNPAID])  # 코드 0은 결제 전
+        self.movie = array('I')
+        self.date = array('I')
+        self.showtime = array('I')
+        self.method = array('I')
+        self.total = array('q')
+        self.seats = array('I')
+        self.ages = {group: array('I') for group in AGE_GROUPS}
+        self.rows = {}  # 예약번호 -> (행 번호, 전화번호)
+        self.phone_rows = {}  # 전화번호 -> 예약번호 집합
+
+    def __len__(self):
+        return len(self.total)
+
+    @classmethod
+    def from_contacts(cls, contacts):
+        table = cls()
+        for contact in contacts:
+            for reservation in contact.reservations:
+                table.add(reservation, contact.phone_number)
+        return table
+
+    # 저널 이벤트 하나를 반영 (ReservationJournal.listeners에 등록해서 사용)
+    def apply(self, event):
+        kind = event["type"]
+        if kind == "reserve":
+            self.add(event["reservation"], event["phone"])
+        elif kind == "pay":
+            entry = self.rows.get(event["reservation_id"])
+            if entry is not None:
+                self.method[entry[0]] = self.methods.code(event["method"])
+        elif kind == "cancel":
+            self.remove(event["reservation_id"])
+        elif kind == "delete_contact":
+            for reservation_id in list(self.phone_rows.get(event["phone"], ())):
+                self.remove(reservation_id)
+
+    def add(self, reservation, phone_number=None):
+        reservation_id = reservation.get("예약번호")
+        if reservation_id is not None:
+            if reservation_id in self.rows:
+                return
+            self.rows[reservation_id] = (len(self), phone_number)
+            if phone_number is not None:
+                self.phone_rows.setdefault(phone_number, set()).add(reservation_id)
+        age_groups = reservation.get("연령대", {})
+        self.append(reservation["영화"], reservation["날짜"], reservation["시간"], reservation.get("결제 방법") or UNPAID,
+                    reservation["총액"], len(reservation["좌석"]), [age_groups.get(group, 0) for group in AGE_GROUPS])
+
+    def append(self, movie, date, time, method, total, seats, age_counts):
+        self.movie.append(self.movies.code(movie))
+        self.date.append(self.dates.code(date))
+        self.showtime.append(self.showtimes.code((movie, date, time)))
+        self.method.append(self.methods.code(method))
+        self.total.append(total)
+        self.seats.append(seats)
+        for group, count in zip(AGE_GROUPS, age_counts):
+            self.ages[group].append(count)
+
+    # 취소된 예매의 행을 집계에 잡히지 않도록 비움
+    def remove(self, reservation_id):
+        entry = self.rows.pop(reservation_id, None)
+        if entry is None:
+            return
+        row, phone_number = entry
+        reservation_ids = self.phone_rows.get(phone_number)
+        if reservation_ids is not None:
+            reservation_ids.discard(reservation_id)
+            if not reservation_ids:
+                del self.phone_rows[phone_number]
+        self.method[row] = 0
+        self.total[row] = 0
+        self.seats[row] = 0
+        for group in AGE_GROUPS:
+            self.ages[group][row] = 0
+
+    # 결제 완료된 예매의 영화별/날짜별/결제 방법별 매출
+    def revenue_by_movie(self):
+        return _labelled(self.movies.values, _group_sum(self.movie, self._paid_totals(), len(self.movies)))
+
+    def revenue_by_date(self):
+        return _labelled(self.dates.values, _group_sum(self.date, self._paid_totals(), len(self.dates)))
+
+    def revenue_by_method(self):
+        sums = _group_sum(self.method, self.total, len(self.methods))
+        return _labelled(self.methods.values[1:], sums[1:])
+
+    # 회차별 점유율 = 예매 좌석 수 / 상영관 좌석 수. capacity_for(영화 제목) -> 좌석 수
+    def occupancy(self, capacity_for):
+        booked = _group_sum(self.showtime, self.seats, len(self.showtimes))
+        rates = {}
+        for showtime, seats in zip(self.showtimes.values, booked):
+            capacity = capacity_for(showtime[0])
+            if seats and capacity:
+                rates[showtime] = seats / capacity
+        return dict(sorted(rates.items()))
+
+    # 연령대별 인원. movie를 주면 그 영화만
+    def age_mix(self, movie=None):
+        if movie is None:
+            return {group: sum(self.ages[group]) if np is None else int(_column(self.ages[group]).sum()) for group in AGE_GROUPS}
+        code = self.movies.codes.get(movie)
+        if code is None:
+            return {group: 0 for group in AGE_GROUPS}
+        return {group: _group_sum(self.movie, self.ages[group], len(self.movies))[code] for group in AGE_GROUPS}
+
+    # 결제 전 예매는 0으로 만든 총액 열
+    def _paid_totals(self):
+        if np is not None:
+            return _column(self.total) * (_column(self.method) != 0)
+        return array('q', (total if method else 0 for total, method in zip(self.total, self.method)))
+
+
+def _column(values):
+    if not len(values):
+        return np.zeros(0, dtype=values.typecode)
+    return np.frombuffer(values, dtype=values.typecode)
+
+
+# codes[i]가 같은 행끼리 weights[i]를 더함 -> 코드별 합계 목록
+def _group_sum(codes, weights, size):
+    if np is not None:
+        if not isinstance(weights, np.ndarray):
+            weights = _column(weights)
+        sums = np.bincount(_column(codes), weights=weights, minlength=size)
+        return [int(round(value)) for value in sums]
+    sums = [0] * size
+    for code, weight in zip(codes, weights):
+        sums[code] += weight
+    return sums
+
+
+def _labelled(labels, sums):
+    return {label: value for label, value in sorted(zip(labels, sums)) if value}
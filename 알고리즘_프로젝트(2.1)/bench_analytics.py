@@ -0,0 +1,61 @@
+import datetime
+import random
+import sys
+import time
+
+import analytics
+from analytics import ReservationTable
+
+# 매출/점유율 집계 벤치마크
+# 무작위 예매 내역(기본 100만 건)을 열 단위 표에 채운 뒤 각 집계에 걸리는 시간을 잰다.
+# 사용법: python bench_analytics.py [예매 수] [영화 수] [날짜 수]
+
+
+def run(bookings=1000000, movies=50, days=365, seed=0):
+    rng = random.Random(seed)
+    titles = [f"영화{number}" for number in range(movies)]
+    first_day = datetime.date(2024, 1, 1)
+    dates = [(first_day + datetime.timedelta(days=day)).strftime('%Y-%m-%d') for day in range(days)]
+    times = ["10:00", "13:00", "16:00", "19:00", "22:00"]
+    methods = ["카드", "현금", None]
+
+    table = ReservationTable()
+    started = time.perf_counter()
+    for _ in range(bookings):
+        adults = rng.randint(0, 3)
+        teens = rng.randint(0, 2)
+        children = rng.randint(0, 2)
+        if adults + teens + children == 0:
+            adults = 1
+        table.append(rng.choice(titles), rng.choice(dates), rng.choice(times), rng.choice(methods) or analytics.UNPAID,
+                     adults * 10000 + teens * 8000 + children * 5000, adults + teens + children, [adults, teens, children])
+    build = time.perf_counter() - started
+    print(f"예매 {bookings}건 적재 {build:.2f}s ({'numpy' if analytics.np is not None else 'array'})")
+
+    reports = [
+        ("영화별 매출", table.revenue_by_movie),
+        ("날짜별 매출", table.revenue_by_date),
+        ("결제 방법별 매출", table.revenue_by_method),
+        ("회차별 점유율", lambda: table.occupancy(lambda title: 36 * 50)),
+        ("연령대 구성", table.age_mix),
+    ]
+    total = 0.0
+    for name, report in reports:
+        started = time.perf_counter()
+        result = report()
+        elapsed = time.perf_counter() - started
+        total += elapsed
+        print(f"{name}: {len(result)}개 그룹, {elapsed * 1000:.1f}ms")
+
+    # 집계 결과가 전체 합과 맞는지 확인
+    paid = sum(table.revenue_by_method().values())
+    if sum(table.revenue_by_movie().values()) != paid or sum(table.revenue_by_date().values()) != paid:
+        raise AssertionError("매출 합계가 맞지 않습니다")
+    if sum(table.age_mix().values()) != sum(table.seats):
+        raise AssertionError("연령대 인원 합이 좌석 수와 다릅니다")
+    print(f"집계 전체 {total * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    run(*args)
@@ -0,0 +1,142 @@
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+
+from booking_service import open_service
+from booking_system import Contact
+from password_hash import hash_password
+
+# 예매 흐름 전체 부하 측정
+# 임시 폴더에 영화/회원/과거 예매 내역을 규모별(10^3 ~ 10^6)로 만들어 BookingService를 띄우고,
+# 로그인 -> 영화 선택 -> 좌석(추천 + 홀드) -> 결제를 반복하며 단계별 p50/p99 지연과 처리량을 잰다.
+# 예매는 로그인해 있는 회원 SESSIONS명 중에서 나오고, 회원마다 첫 로그인만 비밀번호 해시를 확인하고 이후는 세션 토큰을 쓴다.
+# 전체 저장(스냅샷)과 재시작(스냅샷 + 저널 재생)에 걸리는 시간도 따로 잰다.
+# 사용법: python bench_booking_flow.py [회원 수] [영화 수] [예매 수] [회원당 과거 예매 수] [fsync 0/1]
+
+TIMES = "10:00;13:00;16:00;19:00"
+AGE_LIMITS = ["ALL", "ALL", "15세", "19세"]
+SESSIONS = 200
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def timed(label, function):
+    started = time.perf_counter()
+    result = function()
+    print(f"{label}: {time.perf_counter() - started:.2f}s")
+    return result
+
+
+def make_history(rng, titles, count):
+    today = datetime.date.today()
+    history = []
+    for _ in range(count):
+        party = rng.randint(1, 4)
+        history.append({
+            "예약번호": f"{rng.getrandbits(64):016x}",
+            "영화": rng.choice(titles),
+            "날짜": (today - datetime.timedelta(days=rng.randint(1, 365))).strftime('%Y-%m-%d'),
+            "시간": rng.choice(TIMES.split(';')),
+            "좌석": [f"A{k + 1}" for k in range(party)],
+            "연령대": {"성인": party},
+            "총액": party * 10000,
+            "결제 방법": "카드"
+        })
+    return history
+
+
+def run(members=10000, movies=100, bookings=10000, history=3, fsync=0, seed=0):
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as data_dir:
+        titles = [f"영화{number:07d}" for number in range(movies)]
+        with open(os.path.join(data_dir, "movies.txt"), "w", encoding="utf-8") as file:
+            for number, title in enumerate(titles):
+                file.write(f"{title},{TIMES},{number % 10 + 1}관,{AGE_LIMITS[number % len(AGE_LIMITS)]}\n")
+        service = timed(f"영화 {movies}편 불러오기", lambda: open_service(data_dir, fsync=bool(fsync)))
+
+        # 과거 예매 내역이 있는 회원을 만든 뒤 한 번 전체 저장(스냅샷)
+        phones = [f"010-{number // 10000:04d}-{number % 10000:04d}" for number in range(members)]
+        password_hash = hash_password("pw")  # 회원마다 해시를 만들면 생성만 몇 시간이 걸리므로 하나를 같이 씀
+        contacts = timed(f"회원 {members}명 x 과거 예매 {history}건 생성",
+                         lambda: [Contact(phone, password_hash, make_history(rng, titles, history)) for phone in phones])
+        service.contact_store.replace_all(contacts)
+        timed("예매 색인 생성(처음 사용)", service.get_booking_index)
+        # 호출한 쪽은 예약 목록만 복사하고, JSON 변환과 파일 쓰기/fsync는 작업 스레드가 함
+        timed("전체 저장(스냅샷 요청)", lambda: service.journal.compact(service.contact_store))
+        timed("스냅샷 디스크 기록 대기", lambda: service.journal.durable().result())
+
+        active = rng.sample(phones, min(SESSIONS, members))
+        tokens = {}
+        stages = {"로그인(해시)": [], "로그인(토큰)": [], "영화 선택": [], "좌석": [], "결제": []}
+        sold_out = 0
+        conflicts = 0
+        started = time.perf_counter()
+        for _ in range(bookings):
+            phone = rng.choice(active)
+            title = rng.choice(titles)
+            party = rng.randint(1, 4)
+
+            tick = time.perf_counter()
+            if phone in tokens:
+                contact = service.resume(tokens[phone])
+                stages["로그인(토큰)"].append(time.perf_counter() - tick)
+            else:
+                contact = service.login(phone, "pw")
+                tokens[phone] = service.issue_token(contact)
+                stages["로그인(해시)"].append(time.perf_counter() - tick)
+
+            tick = time.perf_counter()
+            movie = service.booking_system.search_movie_by_name(title)[0]
+            dates = service.booking_dates()
+            stages["영화 선택"].append(time.perf_counter() - tick)
+            # 전체 관람가는 어린이 한 명을 섞어 연령 확인의 다른 경로도 지나가게 함
+            age_groups = {"성인": party} if movie.age_limit != "ALL" else {"성인": party - 1, "어린이": 1}
+            date = rng.choice(dates)
+            show_time = rng.choice(movie.times)
+
+            tick = time.perf_counter()
+            seats = service.find_best_seats(movie, date, show_time, party)
+            reservation = None if seats is None else service.hold(contact, movie, date, show_time, seats, age_groups)
+            stages["좌석"].append(time.perf_counter() - tick)
+            if seats is None:
+                sold_out += 1
+                continue
+            if reservation is None:
+                conflicts += 1
+                continue
+
+            tick = time.perf_counter()
+            if not service.pay(contact, reservation["예약번호"], "카드"):
+                raise AssertionError(f"결제 실패: {reservation['예약번호']}")
+            stages["결제"].append(time.perf_counter() - tick)
+        elapsed = time.perf_counter() - started
+        service.close()
+
+        print(f"예매 {bookings}건: {elapsed:.2f}s ({bookings / elapsed:,.0f}건/s), "
+              f"결제 {len(stages['결제'])}건, 매진 {sold_out}건, 홀드 실패 {conflicts}건")
+        for name, latencies in stages.items():
+            if not latencies:
+                continue
+            latencies.sort()
+            total = sum(latencies)
+            throughput = len(latencies) / total
+            print(f"  {name}: p50 {percentile(latencies, 0.5) * 1e6:,.0f}us, "
+                  f"p99 {percentile(latencies, 0.99) * 1e6:,.0f}us, 최대 {latencies[-1] * 1e3:,.1f}ms, "
+                  f"{throughput:,.0f}건/s")
+
+        # 재시작: 스냅샷 + 저널 꼬리를 재생해 같은 상태가 나와야 함
+        reloaded = timed("재시작(스냅샷 + 저널 재생)", lambda: open_service(data_dir, fsync=bool(fsync)))
+        booked, reloaded_booked = len(service.get_booking_index()), len(reloaded.get_booking_index())
+        if reloaded_booked != booked:
+            raise AssertionError(f"재시작 후 예매 수가 다릅니다: {reloaded_booked} != {booked}")
+        reloaded.close()
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    run(*args)
@@ -0,0 +1,111 @@
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from booking_server import BookingServer
+from booking_service import open_service
+
+# 키오스크 동시 접속 부하 생성기
+# 임시 폴더의 데이터로 예매 서버를 localhost에 띄우고, 키오스크 수백 대가 동시에 접속해
+# 회원가입 -> 영화 목록 -> 추천 좌석 홀드 -> 결제를 반복한다. 끝나면 좌석이 두 번 팔리지 않았는지 확인한다.
+# 사용법: python bench_kiosks.py [키오스크 수] [키오스크당 예매 수] [fsync 0/1]
+
+MOVIES = [
+    "과제싫어,10:00;13:00;16:00;19:00,1관,ALL",
+    "보라,11:00;14:00;17:00,2관,ALL",
+    "시험기간,12:00;18:00,3관,15세",
+]
+
+
+async def call(reader, writer, op, **args):
+    args["op"] = op
+    writer.write(json.dumps(args, ensure_ascii=False).encode("utf-8") + b"\n")
+    await writer.drain()
+    response = json.loads(await reader.readline())
+    if not response["ok"]:
+        raise ValueError(response["error"])
+    return response["result"]
+
+
+# 접속 후 회원가입 (비밀번호 해시가 느리므로 예매 시간 측정 전에 따로 함)
+async def connect(number, port):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    await call(reader, writer, "register", phone=f"010-{number // 10000:04d}-{number % 10000:04d}", password="pw")
+    return reader, writer
+
+
+async def kiosk(reader, writer, bookings, rng, stats):
+    movies = await call(reader, writer, "movies")
+    dates = await call(reader, writer, "dates")
+    for _ in range(bookings):
+        movie = rng.choice(movies)
+        date = rng.choice(dates[:2])  # 가까운 날짜에 몰리게 해서 충돌이 나도록
+        show_time = rng.choice(movie["times"])
+        party = rng.randint(1, 4)
+        started = time.perf_counter()
+        while True:
+            seats = await call(reader, writer, "recommend", movie_id=movie["movie_id"], date=date, time=show_time, party_size=party)
+            if seats is None:
+                stats["sold_out"] += 1
+                break
+            reservation = await call(reader, writer, "hold", movie_id=movie["movie_id"], date=date, time=show_time,
+                                     seats=seats, age_groups={"성인": party})
+            if reservation is None:
+                stats["conflicts"] += 1  # 추천과 홀드 사이에 다른 키오스크가 먼저 잡음
+                continue
+            if await call(reader, writer, "pay", reservation_id=reservation["예약번호"], method="카드"):
+                stats["paid"] += 1
+                stats["latencies"].append(time.perf_counter() - started)
+            break
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run_async(kiosks, bookings, fsync, seed):
+    with tempfile.TemporaryDirectory() as data_dir:
+        with open(os.path.join(data_dir, "movies.txt"), "w", encoding="utf-8") as file:
+            file.write("\n".join(MOVIES) + "\n")
+        service = open_service(data_dir, fsync=bool(fsync))
+        server = await BookingServer(service, port=0).start()
+        stats = {"paid": 0, "conflicts": 0, "sold_out": 0, "latencies": []}
+        rng = random.Random(seed)
+
+        started = time.perf_counter()
+        connections = await asyncio.gather(*(connect(number, server.port) for number in range(kiosks)))
+        print(f"키오스크 {kiosks}대 접속/가입: {time.perf_counter() - started:.2f}s")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(kiosk(reader, writer, bookings, random.Random(rng.random()), stats)
+                               for reader, writer in connections))
+        elapsed = time.perf_counter() - started
+        await server.close()
+
+        # 회차마다 결제된 좌석이 서로 겹치지 않고 좌석 맵과 일치해야 함
+        for (title, date, show_time), booked in service.get_booking_index().by_showtime.items():
+            seats = [seat for phone_number, reservation in booked.values() for seat in reservation["좌석"]]
+            if len(seats) != len(set(seats)):
+                raise AssertionError(f"{title} {date} {show_time}: 같은 좌석이 두 번 팔렸습니다")
+            movie = next(movie for movie in service.list_movies() if movie.title == title)
+            if sorted(service.seat_map(movie, date, show_time).taken_seats()) != sorted(seats):
+                raise AssertionError(f"{title} {date} {show_time}: 좌석 맵과 예매 내역이 다릅니다")
+        service.close()
+
+    latencies = sorted(stats["latencies"])
+    p50 = latencies[len(latencies) // 2] if latencies else 0.0
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] if latencies else 0.0
+    print(f"키오스크 {kiosks}대 x 예매 {bookings}건: {elapsed:.2f}s, 결제 {stats['paid']}건 "
+          f"({stats['paid'] / elapsed:.0f}건/s), 충돌 후 재시도 {stats['conflicts']}건, 매진 {stats['sold_out']}건")
+    print(f"예매 1건 지연 p50 {p50 * 1000:.1f}ms, p99 {p99 * 1000:.1f}ms, 중복 판매 없음")
+
+
+def run(kiosks=200, bookings=5, fsync=0, seed=0):
+    asyncio.run(run_async(kiosks, bookings, fsync, seed))
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    run(*args)
@@ -0,0 +1,63 @@
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from reservation_engine import ReservationEngine
+from seat_map import HallLayout, SeatMap
+
+# 예약 엔진 스트레스 벤치마크
+# 여러 스레드가 같은 회차들에 동시에 좌석 묶음을 잡고, 끝난 뒤 이중 예약이 없는지 검사한다.
+# 사용법: python bench_reservation.py [요청 수] [스레드 수]
+
+
+def run(requests=20000, workers=32, showtimes=8, rows=20, cols=30, seed=0):
+    layout = HallLayout(rows, cols)
+    movies = [SimpleNamespace(title=f"영화{i}") for i in range(showtimes)]
+    seat_maps = {movie.title: SeatMap(layout) for movie in movies}
+    engine = ReservationEngine(lambda movie, date, t: seat_maps[movie.title])
+
+    rng = random.Random(seed)
+    jobs = []
+    for _ in range(requests):
+        movie = rng.choice(movies)
+        start = rng.randrange(layout.seat_count)
+        party = rng.randint(1, 4)
+        seats = [layout.seat_name((start + k) % layout.seat_count) for k in range(party)]
+        jobs.append((movie, seats))
+
+    def attempt(job):
+        movie, seats = job
+        return engine.reserve(movie, "2024-06-10", "10:00", seats), job
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(attempt, jobs))
+    elapsed = time.perf_counter() - started
+
+    # 검증: 성공한 예약의 좌석이 서로 겹치지 않고, 좌석 맵의 점유 수와 정확히 일치해야 한다
+    owners = {}
+    succeeded = 0
+    for hold_id, (movie, seats) in results:
+        if hold_id is None:
+            continue
+        succeeded += 1
+        for seat in seats:
+            key = (movie.title, seat)
+            if key in owners:
+                raise AssertionError(f"이중 예약: {key} ({owners[key]}, {hold_id})")
+            owners[key] = hold_id
+    taken = sum(seat_map.popcount() for seat_map in seat_maps.values())
+    if taken != len(owners):
+        raise AssertionError(f"좌석 수 불일치: 맵 {taken}석, 예약 {len(owners)}석")
+
+    print(f"요청 {requests}건 / 스레드 {workers}개 / 회차 {showtimes}개 ({rows}x{cols})")
+    print(f"성공 {succeeded}건, 충돌 {requests - succeeded}건, 점유 좌석 {taken}석")
+    print(f"소요 {elapsed:.3f}초, 처리량 {requests / elapsed:,.0f}건/초")
+    return elapsed
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    run(*args)
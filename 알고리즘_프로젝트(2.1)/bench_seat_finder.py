@@ -0,0 +1,77 @@
+import random
+import sys
+import time
+
+from seat_map import HallLayout, SeatMap, find_best_seats
+
+# 연속 좌석 추천 벤치마크
+# 큰 상영관(기본 40x60)에 무작위로 좌석을 채운 뒤 find_best_seats와
+# 모든 시작 위치를 검사하는 단순 방식의 결과/속도를 비교한다.
+# 사용법: python bench_seat_finder.py [행] [열] [질의 수]
+
+
+def brute_force(seat_map, party_size):
+    layout = seat_map.layout
+    center_row = (layout.rows - 1) / 2
+    center_col = (layout.cols - 1) / 2
+    best = None
+    for row in range(layout.rows):
+        for first in range(layout.cols - party_size + 1):
+            if all(seat_map.is_free(row * layout.cols + col) for col in range(first, first + party_size)):
+                score = (row - center_row) ** 2 + (first + (party_size - 1) / 2 - center_col) ** 2
+                if best is None or score < best:
+                    best = score
+    return best
+
+
+def score_of(seat_map, seats):
+    layout = seat_map.layout
+    indexes = [layout.seat_index(seat) for seat in seats]
+    row = indexes[0] // layout.cols
+    first = indexes[0] % layout.cols
+    return (row - (layout.rows - 1) / 2) ** 2 + (first + (len(seats) - 1) / 2 - (layout.cols - 1) / 2) ** 2
+
+
+def run(rows=40, cols=60, queries=2000, seed=0):
+    rng = random.Random(seed)
+    layout = HallLayout(rows, cols)
+    fast_total = 0.0
+    slow_total = 0.0
+    slow_checked = 0
+    for fill in (0.3, 0.6, 0.9):
+        seat_map = SeatMap(layout)
+        for index in rng.sample(range(layout.seat_count), int(layout.seat_count * fill)):
+            seat_map.reserve(index)
+
+        started = time.perf_counter()
+        for q in range(queries):
+            party = rng.randint(1, 8)
+            seats = find_best_seats(seat_map, party)
+            # 예매가 들어오는 상황처럼 가끔 좌석을 잡고 풀어서 행 캐시가 갱신되게 함
+            if seats and q % 10 == 0:
+                seat_map.reserve(seats[0])
+                seat_map.release(seats[0])
+        fast = time.perf_counter() - started
+        fast_total += fast
+
+        # 단순 방식은 느리므로 일부 질의만 비교
+        started = time.perf_counter()
+        for party in range(1, 9):
+            expected = brute_force(seat_map, party)
+            seats = find_best_seats(seat_map, party)
+            got = None if seats is None else score_of(seat_map, seats)
+            if got != expected:
+                raise AssertionError(f"{party}명: 추천 {got}, 정답 {expected}")
+            slow_checked += 1
+        slow_total += time.perf_counter() - started
+
+        print(f"점유율 {fill:.0%}: 질의 {queries}건 {fast * 1000:.1f}ms "
+              f"(1건당 {fast / queries * 1e6:.1f}us)")
+
+    print(f"{rows}x{cols} 상영관, 전체 {fast_total * 1000:.1f}ms")
+    print(f"단순 방식 비교 {slow_checked}건 일치, {slow_total / slow_checked * 1e3:.1f}ms/건")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    run(*args)
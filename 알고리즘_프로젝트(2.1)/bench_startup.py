@@ -0,0 +1,80 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+from bench_booking_flow import AGE_LIMITS, TIMES, make_history
+from booking_service import open_service
+from booking_system import Contact
+from password_hash import hash_password
+
+# 시작 시간 측정
+# 임시 폴더에 영화 movies편, 회원 members명(회원당 과거 예매 history건)을 만들고 open_service에 걸리는 시간을 잰다.
+#   콜드: 캐시 파일 없이 movies.txt와 스냅샷 JSON을 읽음
+#   웜: 지난번 종료 때 저장한 marshal 캐시를 읽음
+#   영화 파일만 바뀜: movies.txt 수정 시각이 달라져 영화는 다시 읽고, 회원은 캐시를 씀
+# 제목 검색 색인은 처음 검색할 때 만들어지므로 첫 검색 시간도 따로 잰다.
+# 사용법: python bench_startup.py [영화 수] [회원 수] [회원당 과거 예매 수]
+
+
+def timed(label, function):
+    started = time.perf_counter()
+    result = function()
+    print(f"{label}: {(time.perf_counter() - started) * 1e3:,.0f}ms")
+    return result
+
+
+def state(service):
+    movies = [(movie.record_id, movie.title, movie.times) for movie in service.booking_system.movies]
+    return movies, len(service.contact_store), len(service.get_booking_index()), service.journal.next_seq
+
+
+def remove_caches(data_dir):
+    for name in ("movies.txt.cache", "reservations.snapshot.cache"):
+        path = os.path.join(data_dir, name)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def run(movies=100000, members=100000, history=3, seed=0):
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as data_dir:
+        titles = [f"영화{number:07d}" for number in range(movies)]
+        with open(os.path.join(data_dir, "movies.txt"), "w", encoding="utf-8") as file:
+            for number, title in enumerate(titles):
+                file.write(f"{title},{TIMES},{number % 10 + 1}관,{AGE_LIMITS[number % len(AGE_LIMITS)]}\n")
+
+        # 준비: 칸 형식으로 바꾸고 회원 스냅샷을 만든 뒤, 스냅샷 뒤에 저널 꼬리를 조금 남김
+        service = timed("준비(movies.txt 칸 형식 변환)", lambda: open_service(data_dir, fsync=False))
+        password_hash = hash_password("pw")
+        service.contact_store.replace_all([Contact(f"010-{number // 10000:04d}-{number % 10000:04d}", password_hash,
+                                                   make_history(rng, titles, history)) for number in range(members)])
+        service.journal.compact(service.contact_store)
+        for number in range(100):
+            service.register(f"011-0000-{number:04d}", password_hash)
+        timed("종료(쓰기 마무리 + 캐시 저장)", service.close)
+        expected = state(service)
+
+        remove_caches(data_dir)
+        cold = timed("콜드 시작(텍스트/JSON 읽기)", lambda: open_service(data_dir, fsync=False))
+        cold.close()
+        warm = timed("웜 시작(캐시)", lambda: open_service(data_dir, fsync=False))
+        timed("첫 제목 검색(색인 생성)", lambda: warm.booking_system.search_movie_by_name(titles[-1][-3:]))
+        timed("두 번째 제목 검색", lambda: warm.booking_system.search_movie_by_name(titles[0][-3:]))
+        timed("첫 예매 현황(예매 색인 생성)", warm.get_booking_index)
+        warm.close()
+
+        os.utime(os.path.join(data_dir, "movies.txt"))
+        stale = timed("영화 파일만 바뀐 뒤 시작", lambda: open_service(data_dir, fsync=False))
+        stale.close()
+
+        for name, loaded in (("콜드", cold), ("웜", warm), ("영화 파일 변경", stale)):
+            if state(loaded) != expected:
+                raise AssertionError(f"{name} 시작 결과가 다릅니다")
+        print(f"영화 {movies}편, 회원 {members}명 x 예매 {history}건: 세 경우 모두 같은 상태로 불러옴")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    run(*args)
@@ -0,0 +1,89 @@
+import sys
+
+from booking_service import open_service
+
+# 명령줄 예매 프로그램: 화면 없이 BookingService로 GUI와 같은 예매 흐름을 진행
+# 사용법: python booking_cli.py [데이터 폴더]  (폴더 안의 movies.txt, seats.bin, reservations.journal 사용)
+
+
+def choose(prompt, options):
+    for number, option in enumerate(options, 1):
+        print(f"{number}. {option}")
+    answer = input(prompt).strip()
+    if answer.isdigit() and 1 <= int(answer) <= len(options):
+        return int(answer) - 1
+    print("잘못된 번호입니다.")
+    return None
+
+
+# 0 이상의 정수를 받을 때까지 다시 물음 (엔터는 0)
+def ask_count(prompt):
+    while True:
+        answer = input(prompt).strip()
+        if not answer:
+            return 0
+        if answer.isdigit():
+            return int(answer)
+        print("숫자로 입력하세요.")
+
+
+def book(service, contact):
+    movies = service.list_movies()
+    index = choose("영화 번호: ", [f"{movie.title} ({movie.age_limit})" for movie in movies])
+    if index is None:
+        return
+    movie = movies[index]
+    age_groups = {group: ask_count(f"{group} 인원: ") for group in ('성인', '청소년', '어린이')}
+    if not service.check_age(movie, age_groups):
+        print(f"해당 영화는 {movie.age_limit} 관람가입니다. 연령대가 맞지 않습니다.")
+        return
+    dates = service.booking_dates()
+    date_index = choose("날짜 번호: ", dates)
+    time_index = choose("시간 번호: ", movie.times)
+    if date_index is None or time_index is None:
+        return
+    date, time = dates[date_index], movie.times[time_index]
+
+    party_size = sum(age_groups.values())
+    suggested = service.find_best_seats(movie, date, time, party_size) or []
+    answer = input(f"좌석 (쉼표로 구분, 엔터는 추천 좌석 {', '.join(suggested)}): ").strip()
+    seats = [seat.strip() for seat in answer.split(',')] if answer else suggested
+    reservation = service.hold(contact, movie, date, time, seats, age_groups)
+    if reservation is None:
+        print("좌석을 잡지 못했습니다. 이미 예약된 좌석이 있거나 인원 수와 맞지 않습니다.")
+        return
+    print(f"총액: {reservation['총액']}원")
+    method = input("결제 방법 (카드/현금, 엔터는 취소): ").strip()
+    if method in ("카드", "현금") and service.pay(contact, reservation["예약번호"], method):
+        print(f"결제가 완료되었습니다! ({method})")
+    else:
+        service.cancel(contact, reservation["예약번호"])
+        print("예약이 취소되었습니다.")
+
+
+def main(data_dir="."):
+    service = open_service(data_dir)
+    phone_number = input("전화번호: ").strip()
+    password = input("비밀번호: ").strip()
+    contact = service.login(phone_number, password)
+    if contact is None:
+        if input("가입되지 않은 번호입니다. 가입할까요? (y/n): ").strip() != "y":
+            return
+        contact = service.register(phone_number, password)
+        if contact is None:
+            print("비밀번호가 올바르지 않습니다.")
+            return
+    while True:
+        index = choose("메뉴: ", ["영화 예매", "예매 내역 조회", "종료"])
+        if index == 0:
+            book(service, contact)
+        elif index == 1:
+            for reservation in contact.reservation_index:
+                print(f"{reservation['영화']} {reservation['날짜']} {reservation['시간']} "
+                      f"{', '.join(reservation['좌석'])} {reservation.get('결제 방법', '결제 전')}")
+        elif index == 2:
+            break
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
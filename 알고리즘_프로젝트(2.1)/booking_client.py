@@ -0,0 +1,173 @@
+import json
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from booking_system import Contact, Movie
+from seat_map import HallLayout, SeatMap
+
+# BookingClient 클래스: 예매 서버(BookingServer)에 요청 한 줄을 보내고 응답 한 줄을 받는 동기 클라이언트
+class BookingClient:
+    def __init__(self, host="127.0.0.1", port=8765, timeout=10):
+        self.socket = socket.create_connection((host, port), timeout=timeout)
+        self.file = self.socket.makefile("rwb")
+        self.lock = threading.Lock()  # 요청 한 줄과 응답 한 줄이 섞이지 않도록
+
+    def call(self, op, **args):
+        args["op"] = op
+        with self.lock:
+            self.file.write(json.dumps(args, ensure_ascii=False).encode("utf-8") + b"\n")
+            self.file.flush()
+            line = self.file.readline()
+        if not line:
+            raise ConnectionError("예매 서버와 연결이 끊어졌습니다")
+        response = json.loads(line)
+        if not response["ok"]:
+            raise ValueError(response["error"])
+        return response["result"]
+
+    def close(self):
+        self.file.close()
+        self.socket.close()
+
+
+# RemoteBookingService 클래스: BookingService와 같은 메서드를 서버 요청으로 처리 (GUI 키오스크 모드)
+# 영화/좌석/예약은 서버에 있고, 여기서는 화면에 필요한 만큼만 Movie, SeatMap, Contact로 만들어 돌려준다.
+# 관리자 기능(booking_system, contact_store)은 서버 쪽에서만 쓸 수 있다.
+# 연결이 끊기면 다시 연결하고, 로그인해 둔 회원은 토큰(resume)으로 비밀번호 해시 없이 세션을 되살린다.
+class RemoteBookingService:
+    booking_system = None
+    contact_store = None
+    RETRY_OPS = {"movies", "dates", "check_age", "seats", "recommend", "reservations"}  # 다시 보내도 되는 조회 요청
+
+    def __init__(self, host="127.0.0.1", port=8765):
+        self.host = host
+        self.port = port
+        self.address = f"{host}:{port}"
+        self.client = BookingClient(host, port)  # 다시 연결하다 실패하면 None (다음 요청 때 다시 연결)
+        self.layouts = {}  # (행, 열) -> HallLayout
+        self.token = None  # 로그인 때 받은 세션 토큰 (다시 연결할 때 resume으로 사용)
+        self.lock = threading.Lock()  # 화면 스레드와 executor가 동시에 다시 연결하지 않도록
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    # 서버 요청. 연결이 끊겼으면 다시 연결한 뒤 조회 요청만 다시 보냄
+    # 홀드/결제/취소는 서버가 이미 처리했는지 알 수 없으므로 다시 보내지 않고 오류를 냄 (다음 요청은 새 연결로 감)
+    def call(self, op, **args):
+        client = self.client
+        if client is None:
+            client = self.reconnect(None)  # 지난번 다시 연결에 실패함. 서버가 아직 꺼져 있으면 OSError
+        try:
+            return client.call(op, **args)
+        except OSError:
+            client = self.reconnect(client)
+            if op not in self.RETRY_OPS:
+                raise ConnectionError("예매 서버에 다시 연결했습니다. 다시 시도하세요")
+            return client.call(op, **args)
+
+    # 끊긴 연결(failed_client)을 새 연결로 바꾸고, 로그인해 있었으면 토큰으로 같은 회원 세션을 되살림. 새 연결을 돌려줌
+    # 새로 연결하지 못하면 client를 None으로 두고 OSError를 냄 (닫힌 연결을 계속 쓰지 않도록)
+    # 서버가 다시 시작돼 토큰이 없어졌으면 token을 지움 (회원 요청은 "로그인이 필요합니다"로 실패)
+    def reconnect(self, failed_client):
+        with self.lock:
+            if self.client is not failed_client and self.client is not None:
+                return self.client  # 다른 스레드가 이미 다시 연결함
+            try:
+                client = BookingClient(self.host, self.port)
+            except OSError:
+                self.client = None
+                raise
+            finally:
+                if failed_client is not None:
+                    try:
+                        failed_client.close()
+                    except OSError:
+                        pass
+            self.client = client
+            if self.token is not None and self.resume(self.token) is None:
+                self.token = None
+            return client
+
+    def load_contacts(self, legacy_filename=None):
+        pass  # 회원 정보는 서버가 불러옴
+
+    def expire_holds(self):
+        return []  # 만료 처리는 서버가 함
+
+    def close(self):
+        if self.client is not None:
+            self.client.close()
+
+    # 서버 응답(비밀번호 해시 포함)을 기다리는 동안 화면이 멈추지 않도록 스레드에서 실행
+    def submit(self, method, *args):
+        return self.executor.submit(method, *args)
+
+    def register(self, phone_number, password):
+        return self._contact(self.call("register", phone=phone_number, password=password))
+
+    def login(self, phone_number, password):
+        return self._contact(self.call("login", phone=phone_number, password=password))
+
+    def resume(self, token):
+        return self._contact(self.client.call("resume", token=token))  # reconnect 안에서 부르므로 self.call을 거치지 않음
+
+    # 비밀번호는 서버에만 있으므로 화면용 Contact에는 넣지 않음
+    def _contact(self, info):
+        if info is None:
+            return None
+        self.token = info["token"]
+        return Contact(info["phone"], "", info["reservations"])
+
+    def list_movies(self):
+        movies = []
+        for info in self.call("movies"):
+            key = (info["rows"], info["cols"])
+            if key not in self.layouts:
+                self.layouts[key] = HallLayout(*key)
+            movie = Movie(info["title"], info["times"], info["theater"], info["age_limit"], self.layouts[key])
+            movie.movie_id = info["movie_id"]
+            movies.append(movie)
+        return movies
+
+    def booking_dates(self):
+        return self.call("dates")
+
+    def check_age(self, movie, age_groups):
+        return self.call("check_age", movie_id=movie.movie_id, age_groups=age_groups)
+
+    # 서버의 현재 좌석 상태를 복사한 SeatMap (없는 회차면 None)
+    def seat_map(self, movie, date, time):
+        taken = self.call("seats", movie_id=movie.movie_id, date=date, time=time)
+        if taken is None:
+            return None
+        seat_map = SeatMap(movie.layout)
+        for seat in taken:
+            seat_map.reserve(seat)
+        return seat_map
+
+    def find_best_seats(self, movie, date, time, party_size):
+        return self.call("recommend", movie_id=movie.movie_id, date=date, time=time, party_size=party_size)
+
+    def hold(self, contact, movie, date, time, seats, age_groups):
+        reservation = self.call("hold", movie_id=movie.movie_id, date=date, time=time,
+                                       seats=list(seats), age_groups=age_groups)
+        if reservation is not None:
+            contact.add_reservation(reservation)
+        return reservation
+
+    def pay(self, contact, reservation_id, method):
+        if not self.call("pay", reservation_id=reservation_id, method=method):
+            # 서버에서 이미 만료된 예약이면 여기서도 지움
+            for reservation in [r for r in contact.reservations if r["예약번호"] == reservation_id and not r.get("결제 방법")]:
+                contact.remove_reservation(reservation)
+            return False
+        for reservation in contact.reservations:
+            if reservation["예약번호"] == reservation_id:
+                reservation["결제 방법"] = method
+        return True
+
+    def cancel(self, contact, reservation_id):
+        if not self.call("cancel", reservation_id=reservation_id):
+            return False
+        for reservation in [r for r in contact.reservations if r["예약번호"] == reservation_id]:
+            contact.remove_reservation(reservation)
+        return True
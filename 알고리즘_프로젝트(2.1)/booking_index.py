@@ -0,0 +1,93 @@
+# BookingIndex 클래스: 전체 회원의 예매를 회차별/영화별로 모아 둔 보조 색인
+# 시작할 때 회원 목록으로 한 번 만들고(rebuild), 이후에는 저널에 기록되는 이벤트마다 apply로 갱신한다.
+# "이 회차를 누가 예매했나", "이 영화 매출이 얼마인가"를 회원 전체를 돌지 않고 답한다.
+class BookingIndex:
+    def __init__(self):
+        self.by_showtime = {}  # (영화, 날짜, 시간) -> {예약번호: (전화번호, 예약)}
+        self.by_id = {}  # 예약번호 -> (전화번호, 예약)
+        self.by_phone = {}  # 전화번호 -> 예약번호 집합
+        self.seats_booked = {}  # (영화, 날짜, 시간) -> 예매된 좌석 수
+        self.paid = set()  # 매출에 들어간 예약번호
+        self.revenue = {}  # 영화 -> 결제 완료된 총액 합계
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def rebuild(self, contacts):
+        for group in (self.by_showtime, self.by_id, self.by_phone, self.seats_booked, self.paid, self.revenue):
+            group.clear()
+        for contact in contacts:
+            for reservation in contact.reservations:
+                self.add(contact.phone_number, reservation)
+
+    # 저널 이벤트 하나를 반영 (ReservationJournal.listeners에 등록해서 사용)
+    def apply(self, event):
+        kind = event["type"]
+        if kind == "reserve":
+            self.add(event["phone"], event["reservation"])
+        elif kind == "pay":
+            self.pay(event["reservation_id"])
+        elif kind == "cancel":
+            self.remove(event["reservation_id"])
+        elif kind == "delete_contact":
+            for reservation_id in list(self.by_phone.get(event["phone"], ())):
+                self.remove(reservation_id)
+
+    def add(self, phone_number, reservation):
+        reservation_id = reservation["예약번호"]
+        if reservation_id in self.by_id:
+            return
+        key = (reservation["영화"], reservation["날짜"], reservation["시간"])
+        self.by_showtime.setdefault(key, {})[reservation_id] = (phone_number, reservation)
+        self.by_id[reservation_id] = (phone_number, reservation)
+        self.by_phone.setdefault(phone_number, set()).add(reservation_id)
+        self.seats_booked[key] = self.seats_booked.get(key, 0) + len(reservation["좌석"])
+        if reservation.get("결제 방법"):
+            self.pay(reservation_id)
+
+    # 결제 완료된 예매를 매출에 반영 (같은 예매는 한 번만)
+    def pay(self, reservation_id):
+        entry = self.by_id.get(reservation_id)
+        if entry is None or reservation_id in self.paid:
+            return
+        self.paid.add(reservation_id)
+        self._add_revenue(entry[1]["영화"], entry[1]["총액"])
+
+    def remove(self, reservation_id):
+        entry = self.by_id.pop(reservation_id, None)
+        if entry is None:
+            return None
+        phone_number, reservation = entry
+        key = (reservation["영화"], reservation["날짜"], reservation["시간"])
+        bookings = self.by_showtime[key]
+        del bookings[reservation_id]
+        if not bookings:
+            del self.by_showtime[key]
+        self.seats_booked[key] -= len(reservation["좌석"])
+        if not self.seats_booked[key]:
+            del self.seats_booked[key]
+        phone_ids = self.by_phone[phone_number]
+        phone_ids.discard(reservation_id)
+        if not phone_ids:
+            del self.by_phone[phone_number]
+        if reservation_id in self.paid:
+            self.paid.discard(reservation_id)
+            self._add_revenue(reservation["영화"], -reservation["총액"])
+        return reservation
+
+    def _add_revenue(self, movie, amount):
+        total = self.revenue.get(movie, 0) + amount
+        if total:
+            self.revenue[movie] = total
+        else:
+            self.revenue.pop(movie, None)
+
+    # 회차의 예매 목록: [(전화번호, 예약)]
+    def bookings(self, movie, date, time):
+        return list(self.by_showtime.get((movie, date, time), {}).values())
+
+    def booked_seats(self, movie, date, time):
+        return self.seats_booked.get((movie, date, time), 0)
+
+    def movie_revenue(self, movie):
+        return self.revenue.get(movie, 0)
@@ -0,0 +1,134 @@
+import asyncio
+import json
+import sys
+
+from booking_service import open_service
+
+# BookingServer 클래스: 여러 키오스크가 한 곳의 데이터를 같이 쓰도록 BookingService를 TCP로 제공하는 asyncio 서버
+# 한 줄에 JSON 하나: 요청 {"op": "hold", ...} -> 응답 {"ok": true, "result": ...} 또는 {"ok": false, "error": "..."}
+# 연결 하나가 키오스크 하나이고, 로그인한 회원은 연결에 묶인다.
+# 요청 처리는 스레드 풀에서 실행하므로 파일 쓰기(fsync)가 다른 연결을 막지 않고,
+# 좌석 변경은 ReservationEngine이 회차별 잠금으로 한 번에 하나씩 처리한다.
+class BookingServer:
+    def __init__(self, service, host="127.0.0.1", port=8765, expire_interval=1.0):
+        self.service = service
+        self.host = host
+        self.port = port
+        self.expire_interval = expire_interval
+        self.server = None
+        self.expire_task = None  # expire_holds를 도는 작업 (참조를 들고 있어야 중간에 수거되지 않고, close에서 멈출 수 있음)
+        self.connections = 0
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]  # port=0이면 운영체제가 정한 포트
+        self.expire_task = asyncio.get_running_loop().create_task(self.expire_holds())
+        return self
+
+    async def serve_forever(self):
+        await self.start()
+        print(f"예매 서버 실행 중: {self.host}:{self.port}")
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        if self.expire_task is not None:
+            self.expire_task.cancel()
+            await asyncio.gather(self.expire_task, return_exceptions=True)  # 취소가 끝날 때까지 기다림
+            self.expire_task = None
+        self.server.close()
+        await self.server.wait_closed()
+
+    # 결제하지 않은 홀드를 주기적으로 풀어 줌
+    async def expire_holds(self):
+        while True:
+            await asyncio.sleep(self.expire_interval)
+            await asyncio.to_thread(self.service.expire_holds)
+
+    async def handle(self, reader, writer):
+        session = {"contact": None}
+        self.connections += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    result = await asyncio.to_thread(self.dispatch, session, request)
+                    response = {"ok": True, "result": result}
+                except Exception as error:  # 어떤 요청이 실패해도 연결은 끊지 않고 실패 응답을 보냄
+                    response = {"ok": False, "error": str(error)}
+                writer.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    # 요청 하나를 BookingService 호출로 바꿈. 잘못된 요청은 ValueError
+    def dispatch(self, session, request):
+        op = request["op"]
+        service = self.service
+        if op == "login":
+            session["contact"] = service.login(request["phone"], request["password"])
+            return self._contact_info(session["contact"])
+        if op == "register":
+            session["contact"] = service.register(request["phone"], request["password"])
+            return self._contact_info(session["contact"])
+        if op == "resume":  # 다시 연결한 키오스크: 로그인 때 받은 토큰으로 비밀번호 해시 없이 들어옴
+            session["contact"] = service.resume(request["token"])
+            return self._contact_info(session["contact"], request["token"])
+        if op == "movies":
+            return [self._movie_info(movie) for movie in service.list_movies()]
+        if op == "dates":
+            return service.booking_dates()
+
+        if op in ("check_age", "seats", "recommend", "hold"):
+            movie = service.movie(request["movie_id"])
+            if movie is None:
+                raise ValueError(f"없는 영화입니다: {request['movie_id']}")
+            if op == "check_age":
+                return service.check_age(movie, request["age_groups"])
+            if op == "seats":
+                seat_map = service.seat_map(movie, request["date"], request["time"])
+                return None if seat_map is None else seat_map.taken_seats()
+            if op == "recommend":
+                return service.find_best_seats(movie, request["date"], request["time"], request["party_size"])
+
+        # 여기부터는 로그인한 회원의 예매
+        contact = session["contact"]
+        if contact is None:
+            raise ValueError("로그인이 필요합니다")
+        if op == "hold":
+            return service.hold(contact, movie, request["date"], request["time"], request["seats"], request["age_groups"])
+        if op == "reservations":
+            with service.lock:
+                return list(contact.reservation_index)
+        if op == "pay":
+            return service.pay(contact, request["reservation_id"], request["method"])
+        if op == "cancel":
+            return service.cancel(contact, request["reservation_id"])
+        raise ValueError(f"알 수 없는 요청입니다: {op}")
+
+    # 로그인/가입이면 새 토큰을 주고, resume이면 받은 토큰을 그대로 돌려줌 (다시 연결할 때마다 토큰이 쌓이지 않도록)
+    def _contact_info(self, contact, token=None):
+        if contact is None:
+            return None
+        return {"phone": contact.phone_number, "reservations": list(contact.reservation_index),
+                "token": token or self.service.issue_token(contact)}
+
+    def _movie_info(self, movie):
+        return {"movie_id": movie.movie_id, "title": movie.title, "times": movie.times, "theater": movie.theater,
+                "age_limit": movie.age_limit, "rows": movie.layout.rows, "cols": movie.layout.cols}
+
+
+# 사용법: python booking_server.py [데이터 폴더] [포트]
+if __name__ == "__main__":
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else "."
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 8765
+    asyncio.run(BookingServer(open_service(data_dir), port=port).serve_forever())
@@ -0,0 +1,311 @@
+import atexit
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from analytics import ReservationTable
+from booking_index import BookingIndex
+from booking_system import BookingSystem, Contact
+from contact_store import ContactStore
+from persistence_worker import WriteBehindWorker
+from password_hash import SessionCache, hash_password, needs_rehash, verify_password
+from reservation_journal import ReservationJournal, load_legacy_contacts
+from seat_map import SeatOccupancyFile
+from snapshot_cache import bulk_load
+
+# BookingService 클래스: 화면(Tkinter)과 상관없는 예매 흐름
+# 로그인 -> 영화 목록 -> 연령 확인 -> 좌석 홀드 -> 가격 -> 결제/취소를 메서드 하나씩으로 제공한다.
+# GUI, 명령줄, 서버가 모두 이 클래스를 거치므로 화면 없이도 같은 흐름을 시험하고 부하를 걸 수 있다.
+# 좌석은 ReservationEngine이 회차별로 잠그고, 회원/예매 내역/저널 변경은 self.lock으로 한 번에 하나씩 처리한다.
+# 실패는 예외 대신 None/False로 돌려준다.
+# 비밀번호는 salt를 넣은 PBKDF2 해시로만 저장하고, 해시 계산은 self.lock 밖에서 한다.
+# worker(WriteBehindWorker)를 주면 저널/좌석/영화 파일 쓰기를 그 스레드로 넘기고, 결제만 디스크에 남을 때까지 기다린다.
+class BookingService:
+    def __init__(self, booking_system, contact_store, journal, worker=None):
+        self.booking_system = booking_system
+        self.contact_store = contact_store
+        self.journal = journal
+        self.journal.snapshot_source = lambda: self.contact_store
+        self.booking_index = None  # 회차별 예매/영화별 매출 색인, 처음 쓸 때 만듦 (get_booking_index)
+        self.reservation_table = None  # 매출 통계용 열 단위 표, 처음 통계를 볼 때 만듦
+        self.pending_holds = {}  # 결제 전 좌석 홀드: hold_id -> (회원, 예약)
+        self.hold_of = {}  # 예약번호 -> hold_id
+        self.lock = threading.RLock()
+        self.sessions = SessionCache()  # 세션 토큰 -> 전화번호 (비밀번호를 확인한 회원)
+        self.executor = ThreadPoolExecutor(max_workers=2)  # 로그인/가입처럼 해시가 느린 요청용
+        self.worker = worker
+        self.loaded = False  # load_contacts가 끝났는지 (불러오기 전에 닫히면 빈 회원 목록을 캐시에 남기지 않도록)
+        self.closed = False
+        if worker is not None:
+            journal.set_worker(worker)
+            booking_system.movie_file.set_worker(worker)
+            if booking_system.seat_store is not None:
+                booking_system.seat_store.set_worker(worker)
+
+    # 스냅샷 + 저널을 재생해 회원 정보를 불러옴. 저널이 없으면 예전 reservations.txt를 한 번 옮겨 옴
+    def load_contacts(self, legacy_filename=None):
+        with bulk_load():
+            if self.journal.exists():
+                contacts = self.journal.replay(Contact)
+            elif legacy_filename is not None and os.path.exists(legacy_filename):
+                contacts = load_legacy_contacts(legacy_filename, Contact)
+                self.journal.compact(contacts)
+            else:
+                contacts = []
+            self.contact_store.replace_all(contacts)
+            self.loaded = True
+        self.cancel_unpaid()
+        seat_store = self.booking_system.seat_store
+        if seat_store is not None and seat_store.created:
+            self.booking_system.rebuild_seats(self.contact_store)
+
+    # 지난 실행에서 결제하지 못하고 끝난 예약을 취소하고 좌석을 돌려놓음. 취소된 예약 목록을 돌려줌
+    # 홀드 만료 시각은 메모리(ReservationEngine)에만 있어서, 다시 시작하면 이런 좌석을 풀어 줄 곳이 없다.
+    # 결제 전 예약은 저널이 따로 모아 두므로(journal.unpaid) 회원 전체를 돌지 않는다. 시작할 때(홀드가 없을 때)만 호출
+    def cancel_unpaid(self):
+        unpaid = []
+        for reservation_id, phone_number in list(self.journal.unpaid.items()):
+            contact = self.contact_store.get(phone_number)
+            if contact is None:
+                continue
+            for reservation in contact.reservations:
+                if reservation.get("예약번호") == reservation_id:
+                    unpaid.append((contact, reservation))
+                    break
+        if not unpaid:
+            return []
+        movies = {movie.title: movie for movie in self.booking_system.movies}
+        with self.lock:
+            for contact, reservation in unpaid:
+                self._release_reservation_seats(movies, reservation)
+                contact.remove_reservation(reservation)
+                self.journal.append({"type": "cancel", "phone": contact.phone_number, "reservation_id": reservation["예약번호"]})
+        return [reservation for contact, reservation in unpaid]
+
+    # 회차별 예매/영화별 매출 색인. 처음 부를 때 회원 목록으로 한 번 만들고, 이후에는 저널 이벤트마다 갱신
+    # (시작할 때 만들지 않는 이유: 회원이 많으면 시작 시간의 대부분이 이 색인 만들기라서)
+    def get_booking_index(self):
+        with self.lock:
+            if self.booking_index is None:
+                self.booking_index = BookingIndex()
+                self.booking_index.rebuild(self.contact_store)
+                self.journal.listeners.append(self.booking_index.apply)
+            return self.booking_index
+
+    # 매출 통계용 표. 처음 부를 때 회원 목록으로 한 번 만들고, 이후에는 저널 이벤트마다 갱신
+    # 표의 열은 저널에 기록할 때(self.lock 안) 바뀌므로 집계도 self.lock을 잡고 해야 한다.
+    def statistics_table(self):
+        with self.lock:
+            if self.reservation_table is None:
+                self.reservation_table = ReservationTable.from_contacts(self.contact_store)
+                self.journal.listeners.append(self.reservation_table.apply)
+            return self.reservation_table
+
+    # 예약의 좌석을 회차 좌석 맵에서 비움 (지난 날짜나 없어진 영화/시간이면 할 일 없음). self.lock 안에서 호출
+    def _release_reservation_seats(self, movies, reservation):
+        movie = movies.get(reservation["영화"])
+        seat_map = None if movie is None else self.booking_system.seat_map_for(movie, reservation["날짜"], reservation["시간"])
+        if seat_map is not None:
+            seats = [seat for seat in reservation["좌석"] if seat in movie.layout.seat_indexes]
+            self.booking_system.reservation_engine.release_seats(seat_map, seats)
+
+    # 밀린 파일 쓰기를 모두 마치고 fsync한 뒤 파일을 닫음 (프로그램 종료 때)
+    # 다음 실행이 텍스트/JSON을 다시 읽지 않도록 영화 목록과 회원 목록 캐시도 이때 저장
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        if self.worker is not None:
+            self.worker.close()
+        with self.lock, bulk_load():
+            if self.loaded:
+                self.journal.save_cache(self.contact_store)
+            self.booking_system.save_cache()
+        self.journal.close()
+        self.booking_system.movie_file.close()
+        if self.booking_system.seat_store is not None:
+            self.booking_system.seat_store.close()
+
+    # 느린 작업(비밀번호 해시)을 스레드 풀에서 실행하고 Future를 돌려줌. 화면은 done()을 확인하며 기다린다
+    def submit(self, method, *args):
+        return self.executor.submit(method, *args)
+
+    # 회원
+    def register(self, phone_number, password):
+        if phone_number in self.contact_store:
+            return None
+        password_hash = hash_password(password)
+        with self.lock:
+            contact = Contact(phone_number, password_hash)
+            if not self.contact_store.add(contact):
+                return None
+            self.journal.append({"type": "register", "phone": phone_number, "password": password_hash})
+            return contact
+
+    # 비밀번호를 확인한 회원, 틀리면 None. 평문으로 저장돼 있던 비밀번호는 이때 해시로 바꿔 저장
+    def login(self, phone_number, password):
+        contact = self.contact_store.get(phone_number)
+        if contact is None or not verify_password(contact.password, password):
+            return None
+        if needs_rehash(contact.password):
+            password_hash = hash_password(password)
+            with self.lock:
+                contact.password = password_hash
+                self.journal.append({"type": "update_password", "phone": phone_number, "password": password_hash})
+        return contact
+
+    # 로그인한 회원의 세션 토큰. 같은 회원이 다시 들어올 때 resume으로 해시 없이 확인
+    def issue_token(self, contact):
+        return self.sessions.issue(contact.phone_number)
+
+    def resume(self, token):
+        phone_number = self.sessions.get(token)
+        return None if phone_number is None else self.contact_store.get(phone_number)
+
+    # 회원을 지우고, 그 회원의 결제 전 홀드와 예약 좌석을 모두 풀어 다른 사람이 예매할 수 있게 함
+    def delete_contact(self, phone_number):
+        with self.lock:
+            contact = self.contact_store.remove(phone_number)
+            if contact is None:
+                return False
+            engine = self.booking_system.reservation_engine
+            for hold_id in [hold_id for hold_id, (owner, _) in self.pending_holds.items() if owner is contact]:
+                engine.release(hold_id)
+                reservation = self.pending_holds.pop(hold_id)[1]
+                del self.hold_of[reservation["예약번호"]]
+            movies = {movie.title: movie for movie in self.booking_system.movies}
+            for reservation in contact.reservations:
+                if reservation.get("결제 방법"):
+                    self._release_reservation_seats(movies, reservation)
+            self.sessions.revoke(phone_number)
+            self.journal.append({"type": "delete_contact", "phone": phone_number})
+            return True
+
+    def update_password(self, phone_number, new_password):
+        if phone_number not in self.contact_store:
+            return False
+        password_hash = hash_password(new_password)
+        with self.lock:
+            contact = self.contact_store.get(phone_number)
+            if contact is None:
+                return False
+            contact.password = password_hash
+            self.sessions.revoke(phone_number)
+            self.journal.append({"type": "update_password", "phone": phone_number, "password": password_hash})
+            return True
+
+    # 영화/회차
+    def list_movies(self):
+        return list(self.booking_system.movies)
+
+    def movie(self, movie_id):
+        return self.booking_system.movies_by_id.get(movie_id)
+
+    def booking_dates(self):
+        return self.booking_system.booking_dates()
+
+    def seat_map(self, movie, date, time):
+        return self.booking_system.seat_map_for(movie, date, time)
+
+    def find_best_seats(self, movie, date, time, party_size):
+        return self.booking_system.find_best_seats(movie, date, time, party_size)
+
+    # 연령 제한에 맞는 인원 구성인지 (age_groups: {'성인': n, '청소년': n, '어린이': n})
+    def check_age(self, movie, age_groups):
+        adults = age_groups.get('성인', 0)
+        teens = age_groups.get('청소년', 0)
+        children = age_groups.get('어린이', 0)
+        if adults + teens + children <= 0:
+            return False
+        if movie.age_limit == "ALL" or movie.age_limit == "Unknown Age":
+            return True
+        if movie.age_limit == "19세":
+            return teens == 0 and children == 0
+        if movie.age_limit == "15세":
+            return children == 0
+        return False
+
+    def price(self, age_groups):
+        prices = self.booking_system.ticket_prices
+        return sum(count * prices[group] for group, count in age_groups.items())
+
+    # 좌석을 잡고 결제 전 예약을 만듦. 인원/연령이 맞지 않거나 이미 점유된 좌석이 있으면 None
+    def hold(self, contact, movie, date, time, seats, age_groups):
+        if len(seats) != sum(age_groups.values()) or not self.check_age(movie, age_groups):
+            return None
+        hold_id = self.booking_system.reservation_engine.reserve(movie, date, time, seats)
+        if hold_id is None:
+            return None
+        reservation = {
+            "예약번호": uuid.uuid4().hex,
+            "영화": movie.title,
+            "날짜": date,
+            "시간": time,
+            "좌석": list(seats),
+            "연령대": dict(age_groups),
+            "총액": self.price(age_groups)
+        }
+        with self.lock:
+            contact.add_reservation(reservation)
+            self.journal.append({"type": "reserve", "phone": contact.phone_number, "reservation": reservation})
+            self.pending_holds[hold_id] = (contact, reservation)
+            self.hold_of[reservation["예약번호"]] = hold_id
+        return reservation
+
+    # 홀드를 확정 예약으로 전환. 이미 만료/취소된 예약이면 False
+    # 결제 기록이 디스크에 남을 때까지 기다렸다가 돌아옴 (기다리는 동안 lock은 놓으므로 다른 요청의 fsync와 함께 묶임)
+    # 저장이 실패했으면 True 대신 그 예외를 냄 (디스크에 남았다고 답하지 않도록)
+    def pay(self, contact, reservation_id, method):
+        with self.lock:
+            hold_id = self.hold_of.get(reservation_id)
+            if hold_id is None or self.pending_holds[hold_id][0] is not contact:
+                return False
+            if not self.booking_system.reservation_engine.confirm(hold_id):
+                return False
+            del self.hold_of[reservation_id]
+            reservation = self.pending_holds.pop(hold_id)[1]
+            reservation["결제 방법"] = method
+            self.journal.append({"type": "pay", "phone": contact.phone_number,
+                                 "reservation_id": reservation_id, "method": method})
+            durable = self.journal.durable()
+        durable.result()
+        return True
+
+    # 결제 전 예약을 취소하고 좌석을 돌려놓음
+    def cancel(self, contact, reservation_id):
+        with self.lock:
+            hold_id = self.hold_of.get(reservation_id)
+            if hold_id is None or self.pending_holds[hold_id][0] is not contact:
+                return False
+            self.booking_system.reservation_engine.release(hold_id)
+            self._drop_pending(hold_id)
+            return True
+
+    # 결제하지 않은 홀드를 만료 시각에 풀고 예약도 취소. 취소된 예약 목록을 돌려줌
+    def expire_holds(self):
+        expired = []
+        for hold_id in self.booking_system.reservation_engine.expire_holds():
+            with self.lock:
+                if hold_id in self.pending_holds:
+                    expired.append(self._drop_pending(hold_id))
+        return expired
+
+    def _drop_pending(self, hold_id):
+        contact, reservation = self.pending_holds.pop(hold_id)
+        del self.hold_of[reservation["예약번호"]]
+        contact.remove_reservation(reservation)
+        self.journal.append({"type": "cancel", "phone": contact.phone_number, "reservation_id": reservation["예약번호"]})
+        return reservation
+
+
+# 데이터 폴더의 파일들(movies.txt, seats.bin, 저널/스냅샷)로 BookingService를 만듦
+def open_service(data_dir, fsync=True):
+    seat_store = SeatOccupancyFile(os.path.join(data_dir, "seats.bin"), fsync=fsync)
+    booking_system = BookingSystem(os.path.join(data_dir, "movies.txt"), seat_store)
+    booking_system.movie_file.fsync = fsync
+    journal = ReservationJournal(os.path.join(data_dir, "reservations.journal"),
+                                 os.path.join(data_dir, "reservations.snapshot"), fsync=fsync)
+    service = BookingService(booking_system, ContactStore(), journal, WriteBehindWorker())
+    atexit.register(service.close)
+    service.load_contacts(os.path.join(data_dir, "reservations.txt"))
+    return service
@@ -0,0 +1,222 @@
+import datetime
+import itertools
+import threading
+from seat_map import DEFAULT_LAYOUT, SeatMap, find_best_seats, showtime_key
+from reservation_engine import ReservationEngine
+from title_index import TitleIndex
+from movie_catalog import MovieCatalog
+from movie_store import MovieFile, parse_movie_records
+from showtime_index import ShowtimeIndex
+from snapshot_cache import bulk_load
+from reservation_index import ReservationIndex
+
+# Contact 클래스: 연락처 정보를 저장
+class Contact:
+    def __init__(self, phone_number, password, reservations=None):
+        self.phone_number = phone_number
+        self.password = password  # 비밀번호 해시 (password_hash.hash_password), 예전 파일이면 평문
+        self.reservations = reservations if reservations is not None else []
+        self.reservation_index = ReservationIndex(self.reservations)  # (영화, 날짜, 시간) 순 색인
+
+    def add_reservation(self, reservation):
+        self.reservations.append(reservation)
+        self.reservation_index.add(reservation)
+
+    def remove_reservation(self, reservation):
+        for i in range(len(self.reservations) - 1, -1, -1):
+            if self.reservations[i] is reservation:
+                del self.reservations[i]
+                self.reservation_index.remove(reservation)
+                return True
+        return False
+
+    def print_info(self):
+        return f"전화번호: {self.phone_number}, 예매 {len(self.reservations)}건\n"
+
+# Movie 클래스: 영화 정보를 저장
+class Movie:
+    def __init__(self, title, times, theater, age_limit, layout=DEFAULT_LAYOUT):
+        self.title = title
+        self.times = times
+        self.theater = theater
+        self.age_limit = age_limit
+        self.layout = layout
+        self.movie_id = None  # 회차 색인에서 쓰는 영화 ID (BookingSystem이 정함)
+        self.record_id = None  # movies.txt 안의 레코드 ID (MovieFile)
+
+    def to_string(self):
+        return f"{self.title},{';'.join(self.times)},{self.theater},{self.age_limit}"
+
+# BookingSystem 클래스: 영화 예매 시스템의 핵심 로직
+class BookingSystem:
+    def __init__(self, file_path, seat_store=None):
+        self.movies = MovieCatalog()  # 항상 제목 순으로 정렬된 상태 유지
+        self.file_path = file_path
+        self.movie_file = MovieFile(file_path)
+        self.seat_store = seat_store
+        self.today = datetime.datetime.today().strftime('%Y-%m-%d')  # 이 날짜 이전 회차는 색인에서 뺌
+        self.booking_days = 7  # 오늘부터 며칠 뒤까지 예매할 수 있는지
+        if seat_store is not None:
+            seat_store.compact(self.today)  # 지난 날짜 좌석 영역을 파일에서 뺌 (아직 연결된 좌석 맵이 없을 때)
+        self.admin_password = "123"
+        self.ticket_prices = {'성인': 10000, '청소년': 8000, '어린이': 5000}  # 가격 정보 추가
+        self.hall_layouts = {}  # 상영관별 좌석 배치, 없으면 6x6
+        self.showtimes = ShowtimeIndex()  # (영화 ID, 날짜, 시간) -> 좌석 맵, 조회될 때 만들어짐
+        self._showtime_lock = threading.Lock()
+        self._movie_ids = itertools.count(1)
+        self.movies_by_id = {}  # 영화 ID -> 영화
+        self.reservation_engine = ReservationEngine(self.seat_map_for)
+        self.title_index = None  # 제목 검색 색인, 처음 검색할 때 만듦
+        with bulk_load():
+            self.load_movies()
+            for movie in self.movies:
+                self.index_showtimes(movie)
+
+    # 파일을 한 줄씩 읽어 바로 영화로 만듦 (상영 시간은 여기서 한 번만 분해)
+    # movies.txt가 지난번과 그대로면 캐시에 저장해 둔 레코드를 쓰고, 아니면 읽은 뒤 캐시를 새로 저장
+    def load_movies(self):
+        records = self.movie_file.load_cached()
+        if records is None:
+            records = list(parse_movie_records(self.movie_file.load()))
+            self.movie_file.save_cache(records)
+        movies = []
+        for record_id, title, times, theater, age_limit in records:
+            movie = Movie(title, times, theater, age_limit, self.layout_for(theater))
+            movie.record_id = record_id
+            movies.append(movie)
+        self.movies = MovieCatalog(movies)
+
+    # 지금 영화 목록을 캐시에 저장 (종료할 때, 밀린 파일 쓰기가 끝난 뒤에 호출)
+    def save_cache(self):
+        self.movie_file.save_cache([(movie.record_id, movie.title, movie.times, movie.theater, movie.age_limit)
+                                    for movie in self.movies])
+
+    def layout_for(self, theater):
+        return self.hall_layouts.get(theater, DEFAULT_LAYOUT)
+
+    # 영화를 회차 색인에 등록. 좌석 맵은 날짜별로 처음 조회될 때 만든다(seat_map_for)
+    # 이미 만들어진 회차의 좌석 상태는 그대로 두고, 없어진 상영 시간은 색인에서 뺀다.
+    def index_showtimes(self, movie):
+        if movie.movie_id is None:
+            movie.movie_id = next(self._movie_ids)
+            self.movies_by_id[movie.movie_id] = movie
+        times = set(movie.times)
+        for date, time, seat_map in self.showtimes.showings(movie.movie_id):
+            if time not in times:
+                self.showtimes.remove(movie.movie_id, date, time)
+                self.reservation_engine.forget(seat_map)
+        self.attach_seats(movie)
+
+    # 영화의 좌석 맵을 좌석 파일에 연결 (저장된 점유 상태를 불러오고 이후 변경을 기록)
+    def attach_seats(self, movie):
+        if self.seat_store is not None:
+            for date, time, seat_map in self.showtimes.showings(movie.movie_id):
+                self.seat_store.attach(showtime_key(movie.title, date, time), seat_map)
+
+    # 회차의 좌석 맵. 처음 조회된 날짜면 이때 만들고(저장된 상태가 있으면 불러옴), 지난 날짜/없는 시간이면 None
+    def seat_map_for(self, movie, date, time):
+        seat_map = self.showtimes.get(movie.movie_id, date, time)
+        if seat_map is not None or date < self.today or time not in movie.times:
+            return seat_map
+        with self._showtime_lock:
+            seat_map = self.showtimes.get(movie.movie_id, date, time)
+            if seat_map is None:
+                seat_map = SeatMap(movie.layout)
+                if self.seat_store is not None:
+                    self.seat_store.attach(showtime_key(movie.title, date, time), seat_map)
+                self.showtimes.add(movie.movie_id, date, time, seat_map)
+        return seat_map
+
+    # 예매할 수 있는 날짜 목록. 날짜가 바뀌었으면 지난 날짜의 좌석 맵을 먼저 비운다
+    def booking_dates(self):
+        today = datetime.datetime.today()
+        self.evict_past_showtimes(today.strftime('%Y-%m-%d'))
+        return [(today + datetime.timedelta(days=day)).strftime('%Y-%m-%d') for day in range(self.booking_days)]
+
+    def evict_past_showtimes(self, today):
+        if today == self.today:
+            return
+        self.today = today
+        with self._showtime_lock:
+            evicted = self.showtimes.evict_before(today)
+        for seat_map in evicted:
+            self.reservation_engine.forget(seat_map)
+        if self.seat_store is not None:
+            self.seat_store.forget_before(today)
+
+    # 인원수만큼 같은 행에 붙어 있고 상영관 중앙에 가장 가까운 좌석 (없으면 None)
+    def find_best_seats(self, movie, date, time, party_size):
+        seat_map = self.seat_map_for(movie, date, time)
+        if seat_map is None:
+            return None
+        return find_best_seats(seat_map, party_size)
+
+    # 좌석 파일이 처음 만들어졌을 때 회원 예약 내역으로 오늘 이후 좌석 상태를 다시 채움
+    def rebuild_seats(self, contacts):
+        movies = {movie.title: movie for movie in self.movies}
+        for contact in contacts:
+            for reservation in contact.reservations:
+                movie = movies.get(reservation["영화"])
+                if movie is None:
+                    continue
+                seat_map = self.seat_map_for(movie, reservation["날짜"], reservation["시간"])
+                if seat_map is not None:
+                    for seat in reservation["좌석"]:
+                        if seat in movie.layout.seat_indexes:
+                            seat_map.reserve(seat)
+
+    def display_movies(self):
+        movies_list = ""
+        for idx, movie in enumerate(self.movies):
+            movies_list += f"{idx + 1}. {movie.title} ({movie.age_limit})\n"
+        return movies_list
+
+    # 제목 일부로 영화 검색 (n-gram 색인 사용, 자모 단위로 입력 중인 글자도 일치)
+    # 영화가 많으면 색인을 만드는 데 시간이 걸리므로 시작할 때가 아니라 처음 검색할 때 만든다
+    def search_movie_by_name(self, name):
+        if self.title_index is None:
+            self.title_index = TitleIndex(self.movies)
+        return self.title_index.search(name)
+
+    def add_movie(self, movie):
+        self.movies.add(movie)
+        self.index_showtimes(movie)
+        if self.title_index is not None:
+            self.title_index.add(movie)
+        movie.record_id = self.movie_file.insert(movie.to_string())
+
+    def edit_movie(self, idx, new_title, new_times, new_theater, new_age_limit):
+        if 0 <= idx < len(self.movies):
+            movie = self.movies[idx]
+            if self.seat_store is not None and new_title != movie.title:
+                self.seat_store.drop_title(movie.title, new_title)  # 좌석 영역을 새 제목으로 옮기고 옛 제목 영역은 비움
+            self.movies.rekey(movie, new_title)
+            movie.times = new_times
+            movie.theater = new_theater
+            movie.age_limit = new_age_limit
+            movie.layout = self.layout_for(new_theater)
+            # 남아 있는 상영 시간의 좌석 상태는 유지
+            self.index_showtimes(movie)
+            if self.title_index is not None:
+                self.title_index.update(movie)
+            # 이 영화의 칸만 고쳐 씀
+            movie.record_id = self.movie_file.update(movie.record_id, movie.to_string())
+            return True
+        return False
+
+    def delete_movie(self, idx):
+        if 0 <= idx < len(self.movies):
+            movie = self.movies[idx]
+            if self.title_index is not None:
+                self.title_index.remove(movie)
+            for date, time, seat_map in self.showtimes.showings(movie.movie_id):
+                seat_map.listener = None  # 비운 영역에 더 쓰지 않도록
+                self.reservation_engine.forget(seat_map)
+            self.showtimes.remove_movie(movie.movie_id)
+            if self.seat_store is not None:
+                self.seat_store.drop_title(movie.title)  # 같은 제목의 새 영화가 옛 좌석 상태를 물려받지 않도록
+            del self.movies_by_id[movie.movie_id]
+            self.movies.remove(movie)
+            self.movie_file.delete(movie.record_id)
+            return True
+        return False
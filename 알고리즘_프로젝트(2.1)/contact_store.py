@@ -0,0 +1,61 @@
+import bisect
+
+# ContactStore 클래스: 전화번호를 키로 회원(Contact)을 보관하는 저장소
+# 조회/추가/삭제는 dict로 O(1), 전화번호 정렬 목록은 이진 탐색으로 그 자리에만 넣고 빼서 항상 정렬된 상태를 유지한다.
+# 관리자 목록 화면(VirtualList)은 store[i]로 보이는 줄의 회원만 꺼내 간다.
+class ContactStore:
+    def __init__(self, contacts=None):
+        self.contacts = {}
+        self.phones = []  # 정렬된 전화번호
+        if contacts:
+            self.replace_all(contacts)
+
+    def __len__(self):
+        return len(self.contacts)
+
+    def __contains__(self, phone_number):
+        return phone_number in self.contacts
+
+    # 전화번호 순으로 순회
+    def __iter__(self):
+        return iter(self.sorted_contacts())
+
+    # 전화번호 순서로 index번째 회원
+    def __getitem__(self, index):
+        return self.contacts[self.phones[index]]
+
+    def get(self, phone_number):
+        return self.contacts.get(phone_number)
+
+    # 이미 있는 전화번호면 False
+    def add(self, contact):
+        if contact.phone_number in self.contacts:
+            return False
+        self.contacts[contact.phone_number] = contact
+        bisect.insort(self.phones, contact.phone_number)
+        return True
+
+    # 삭제한 Contact를 돌려줌, 없으면 None
+    def remove(self, phone_number):
+        contact = self.contacts.pop(phone_number, None)
+        if contact is not None:
+            del self.phones[bisect.bisect_left(self.phones, phone_number)]
+        return contact
+
+    def replace_all(self, contacts):
+        self.contacts = {contact.phone_number: contact for contact in contacts}
+        self.phones = sorted(self.contacts)
+
+    def clear(self):
+        self.contacts.clear()
+        self.phones.clear()
+
+    def sorted_contacts(self):
+        return [self.contacts[phone_number] for phone_number in self.phones]
+
+    # 전화번호 일부로 검색 (정렬된 순서 유지)
+    def search(self, text):
+        found = self.contacts.get(text)
+        if found is not None:
+            return [found]
+        return [self.contacts[phone_number] for phone_number in self.phones if text in phone_number]
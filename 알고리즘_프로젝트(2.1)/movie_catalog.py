@@ -0,0 +1,56 @@
+import bisect
+import itertools
+
+# MovieCatalog 클래스: 제목 순으로 항상 정렬된 영화 목록
+# 추가/삭제/제목 변경은 이진 탐색으로 위치를 찾아 그 자리에만 넣고 빼므로 전체를 다시 정렬하지 않는다.
+# 목록 화면은 순서대로 순회하기만 하면 된다.
+class MovieCatalog:
+    def __init__(self, movies=()):
+        self.keys = []  # (제목, 순번) 정렬 목록
+        self.items = []  # keys와 같은 순서의 영화
+        self.key_of = {}  # 영화 -> 현재 정렬 키
+        self._serials = itertools.count()  # 제목이 같은 영화는 추가된 순서대로
+        for movie in sorted(movies, key=lambda movie: movie.title):
+            key = (movie.title, next(self._serials))
+            self.keys.append(key)
+            self.items.append(movie)
+            self.key_of[movie] = key
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def __contains__(self, movie):
+        return movie in self.key_of
+
+    def add(self, movie):
+        key = (movie.title, next(self._serials))
+        position = bisect.bisect_left(self.keys, key)
+        self.keys.insert(position, key)
+        self.items.insert(position, movie)
+        self.key_of[movie] = key
+        return position
+
+    def remove(self, movie):
+        position = self.index(movie)
+        del self.keys[position]
+        del self.items[position]
+        del self.key_of[movie]
+
+    # 영화의 현재 위치 (이진 탐색)
+    def index(self, movie):
+        position = bisect.bisect_left(self.keys, self.key_of[movie])
+        if position == len(self.keys) or self.items[position] is not movie:
+            raise ValueError(f"{movie.title!r} 영화가 목록에 없습니다")
+        return position
+
+    # 제목을 바꾸고 정렬 위치만 옮김
+    def rekey(self, movie, new_title):
+        self.remove(movie)
+        movie.title = new_title
+        return self.add(movie)
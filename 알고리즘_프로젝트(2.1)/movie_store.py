@@ -0,0 +1,194 @@
+import os
+import re
+import struct
+import sys
+import zlib
+from snapshot_cache import SnapshotCache
+
+# MovieFile 클래스: movies.txt를 고정 폭 칸(slot)으로 나눠 영화 한 편을 제자리에서 고쳐 쓰는 저장소
+# 각 줄은 slot_size의 배수 길이가 되도록 공백으로 채우고, 칸 번호(줄이 시작하는 칸)가 영화의 레코드 ID가 된다.
+# 수정/삭제 때는 그 영화의 칸만 다시 쓰므로 영화 수와 관계없이 저장 비용이 일정하다.
+# 지운 칸은 공백으로 채워 두고 같은 크기의 새 영화가 들어올 때 재사용한다.
+# 덮어쓰기 전에 바꿀 내용을 .wal 파일에 먼저 기록하므로, 쓰다가 꺼져도 다음 실행 때 마저 적용된다.
+# set_worker로 WriteBehindWorker를 주면 레코드 ID는 바로 정하고, WAL 기록과 덮어쓰기는 작업 스레드가 한다.
+# 읽어서 만든 레코드와 칸 정보는 movies.txt.cache(SnapshotCache)에 저장해 두고, 파일이 그대로면 다음 실행 때 읽지 않는다.
+class MovieFile:
+    WAL_HEADER = struct.Struct("<QII")  # 위치, 길이, crc32
+    CACHE_VERSION = 1
+
+    def __init__(self, file_path, slot_size=128, fsync=True):
+        self.file_path = file_path
+        self.wal_path = file_path + ".wal"
+        self.slot_size = slot_size
+        self.fsync = fsync
+        self.spans = {}  # 레코드 ID -> 차지하는 칸 수
+        self.free_spans = {}  # 칸 수 -> 비어 있는 레코드 ID 목록
+        self.end_slot = 0
+        self.file = None
+        self.worker = None  # 쓰기 지연용 WriteBehindWorker
+        self.cache = SnapshotCache(file_path + ".cache", file_path, (self.CACHE_VERSION, slot_size))
+
+    def set_worker(self, worker):
+        self.worker = worker
+
+    # 파일을 한 줄씩 읽으며 (레코드 ID, 줄 내용)을 차례로 돌려주는 제너레이터
+    # 예전 형식 파일이면 먼저 한 번 칸 형식으로 바꿔 쓴다. 끝까지 읽어야 쓰기 준비가 끝난다.
+    def load(self):
+        if not os.path.exists(self.file_path):
+            open(self.file_path, "wb").close()
+        self._recover()
+        with open(self.file_path, "rb") as file:
+            slotted = all(len(line) % self.slot_size == 0 and line.endswith(b"\n") for line in file)
+        if not slotted:
+            self._migrate()
+
+        slot = 0
+        with open(self.file_path, "rb") as file:
+            for line in file:
+                span = len(line) // self.slot_size
+                text = line.decode("utf-8").strip()
+                if text:
+                    self.spans[slot] = span
+                    yield slot, text
+                else:
+                    self.free_spans.setdefault(span, []).append(slot)
+                slot += span
+        self.end_slot = slot
+        self.file = open(self.file_path, "r+b")
+
+    # 캐시에 저장해 둔 레코드 목록으로 쓰기 준비를 함. 캐시가 없거나 파일이 바뀌었으면 None (load()로 읽어야 함)
+    def load_cached(self):
+        if not os.path.exists(self.file_path):
+            return None
+        self._recover()  # 덮어쓰던 도중 끝났으면 파일이 바뀌므로 캐시도 맞지 않게 된다
+        cached = self.cache.load()
+        if cached is None:
+            return None
+        records, self.spans, self.free_spans, self.end_slot = cached
+        self.file = open(self.file_path, "r+b")
+        return records
+
+    # 지금 파일 내용을 나타내는 레코드 목록(영화 정보 등)을 칸 정보와 함께 캐시에 저장
+    def save_cache(self, records):
+        self.cache.save((records, self.spans, self.free_spans, self.end_slot))
+
+    # 새 레코드를 쓰고 레코드 ID를 돌려줌
+    def insert(self, text):
+        data = self._pad(text)
+        span = len(data) // self.slot_size
+        free = self.free_spans.get(span)
+        if free:
+            record_id = free.pop()
+        else:
+            record_id = self.end_slot
+            self.end_slot += span
+        self._write(record_id * self.slot_size, data)
+        self.spans[record_id] = span
+        return record_id
+
+    # 레코드를 고쳐 씀. 칸 수가 달라지면 다른 곳으로 옮기고 새 레코드 ID를 돌려줌
+    def update(self, record_id, text):
+        data = self._pad(text)
+        if len(data) // self.slot_size == self.spans[record_id]:
+            self._write(record_id * self.slot_size, data)
+            return record_id
+        self.delete(record_id)
+        return self.insert(text)
+
+    def delete(self, record_id):
+        span = self.spans.pop(record_id)
+        self._write(record_id * self.slot_size, self._blank(span))
+        self.free_spans.setdefault(span, []).append(record_id)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def _pad(self, text):
+        encoded = text.encode("utf-8")
+        span = len(encoded) // self.slot_size + 1  # 줄바꿈 1바이트 자리 포함
+        return encoded + b" " * (span * self.slot_size - len(encoded) - 1) + b"\n"
+
+    def _blank(self, span):
+        return b" " * (span * self.slot_size - 1) + b"\n"
+
+    # 작업 스레드가 있으면 넘기기만 함. 같은 칸을 아직 안 썼으면 마지막 내용 하나만 쓴다
+    def _write(self, offset, data):
+        self.cache.invalidate()
+        if self.worker is not None:
+            self.worker.submit(self._write_now, offset, data, key=(self.file_path, offset, len(data)))
+        else:
+            self._write_now(offset, data)
+
+    # 먼저 WAL에 기록 -> 제자리 덮어쓰기 -> WAL 비우기
+    def _write_now(self, offset, data):
+        with open(self.wal_path, "wb") as wal:
+            wal.write(self.WAL_HEADER.pack(offset, len(data), zlib.crc32(data)) + data)
+            self._sync(wal)
+        self.file.seek(offset)
+        self.file.write(data)
+        self._sync(self.file)
+        os.truncate(self.wal_path, 0)
+
+    def _sync(self, file):
+        file.flush()
+        if self.fsync:
+            os.fsync(file.fileno())
+
+    # 지난번 실행이 덮어쓰는 도중 끝났으면 WAL의 내용을 마저 적용
+    def _recover(self):
+        if not os.path.exists(self.wal_path):
+            return
+        with open(self.wal_path, "rb") as wal:
+            entry = wal.read()
+        if len(entry) >= self.WAL_HEADER.size:
+            offset, length, checksum = self.WAL_HEADER.unpack_from(entry)
+            data = entry[self.WAL_HEADER.size:self.WAL_HEADER.size + length]
+            if len(data) == length and zlib.crc32(data) == checksum:
+                with open(self.file_path, "r+b") as file:
+                    file.seek(offset)
+                    file.write(data)
+                    self._sync(file)
+        os.truncate(self.wal_path, 0)
+
+    # 예전 형식(한 줄에 영화 하나)을 칸 형식으로 바꿔 임시 파일에 쓴 뒤 교체
+    def _migrate(self):
+        temp_path = self.file_path + ".tmp"
+        with open(self.file_path, "rb") as source, open(temp_path, "wb") as target:
+            for line in source:
+                if line.strip():
+                    target.write(self._pad(line.decode("utf-8").strip()))
+            self._sync(target)
+        os.replace(temp_path, self.file_path)
+
+
+TIME_PATTERN = re.compile(r"([01]?\d|2[0-3]):[0-5]\d$")
+
+
+# 상영 시간 문자열("10:00;11:00;" 또는 "10:00,11:00")을 시간 목록으로 한 번만 분해
+# 같은 시간 문자열은 sys.intern으로 공유. 형식이 틀린 시간이 있으면 None
+def parse_showtimes(text):
+    times = []
+    for part in re.split(r"[;,]", text):
+        part = part.strip()
+        if not part:
+            continue
+        if not TIME_PATTERN.match(part):
+            return None
+        part = sys.intern(part.zfill(5))
+        if part not in times:
+            times.append(part)
+    return times if times else None
+
+
+# (레코드 ID, 줄) 스트림을 (레코드 ID, 제목, 상영 시간 목록, 상영관, 연령 제한) 스트림으로 바꾸는 제너레이터
+# 형식이 틀린 줄은 알려 주고 건너뛴다. 줄을 한꺼번에 메모리에 올리지 않는다.
+def parse_movie_records(records):
+    for record_id, line in records:
+        parts = [part.strip() for part in line.split(',')]
+        times = parse_showtimes(parts[1]) if len(parts) == 4 and parts[0] else None
+        if times is None:
+            print(f"Invalid line format: {line}")
+            continue
+        yield record_id, parts[0], times, sys.intern(parts[2]), sys.intern(parts[3])
@@ -0,0 +1,75 @@
+import collections
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+
+# 비밀번호 저장 형식: "pbkdf2_sha256$반복 횟수$salt(16진수)$해시(16진수)"
+# 반복 횟수를 일부러 크게 잡아 한 번 확인하는 데 수십 ms가 걸린다. 화면에서는 스레드 풀에서 돌린다.
+# 예전 파일의 평문 비밀번호도 확인은 되고, 로그인에 성공하면 해시로 바꿔 저장한다(needs_rehash).
+ALGORITHM = "pbkdf2_sha256"
+ITERATIONS = 200000
+
+
+def hash_password(password, iterations=ITERATIONS):
+    salt = os.urandom(16)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+    return f"{ALGORITHM}${iterations}${salt.hex()}${digest.hex()}"
+
+
+def is_hashed(stored):
+    return stored.startswith(ALGORITHM + "$")
+
+
+def verify_password(stored, password):
+    if not is_hashed(stored):
+        return hmac.compare_digest(stored.encode("utf-8"), password.encode("utf-8"))
+    try:
+        _, iterations, salt, digest = stored.split("$")
+        expected = bytes.fromhex(digest)
+        actual = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), bytes.fromhex(salt), int(iterations))
+    except ValueError:
+        return False
+    return hmac.compare_digest(expected, actual)
+
+
+# 평문이거나 지금보다 약한 설정으로 만든 해시면 True
+def needs_rehash(stored):
+    if not is_hashed(stored):
+        return True
+    return int(stored.split("$")[1]) < ITERATIONS
+
+
+# SessionCache 클래스: 비밀번호를 확인한 회원에게 준 세션 토큰을 최근 사용 순으로 보관 (LRU)
+# 토큰으로 다시 들어오면 느린 해시를 건너뛴다. capacity를 넘으면 가장 오래 안 쓴 토큰부터 버린다.
+class SessionCache:
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.tokens = collections.OrderedDict()  # 토큰 -> 전화번호
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def issue(self, phone_number):
+        token = secrets.token_hex(16)
+        with self.lock:
+            self.tokens[token] = phone_number
+            if len(self.tokens) > self.capacity:
+                self.tokens.popitem(last=False)
+        return token
+
+    # 토큰의 전화번호, 없거나 밀려난 토큰이면 None
+    def get(self, token):
+        with self.lock:
+            phone_number = self.tokens.get(token)
+            if phone_number is not None:
+                self.tokens.move_to_end(token)
+            return phone_number
+
+    # 비밀번호 변경/탈퇴 시 그 회원의 토큰을 모두 버림
+    def revoke(self, phone_number):
+        with self.lock:
+            for token in [token for token, phone in self.tokens.items() if phone == phone_number]:
+                del self.tokens[token]
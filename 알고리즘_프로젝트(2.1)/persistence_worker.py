@@ -0,0 +1,114 @@
+import collections
+import threading
+import time
+from concurrent.futures import Future
+
+# WriteBehindWorker 클래스: 파일 쓰기를 화면/요청 스레드 대신 처리하는 백그라운드 스레드 하나 (쓰기 지연)
+# submit한 쓰기는 넣은 순서대로 실행하고, 같은 key로 아직 실행 전인 쓰기가 있으면 마지막 것 하나만 남긴다.
+# fsync는 쓰기마다 하지 않고 interval초마다, sync()를 요청받았을 때, close할 때 모아서 한다.
+# 대기열이 max_pending개를 넘으면 submit이 자리가 날 때까지 기다린다.
+# 쓰기나 fsync가 한 번이라도 실패하면 그 오류를 남겨 두고, 이후의 sync()는 모두 그 오류로 실패한다
+# (어떤 쓰기가 빠졌는지 모르므로 "디스크에 남았다"고 답할 수 없다).
+class WriteBehindWorker:
+    def __init__(self, interval=1.0, max_pending=4096):
+        self.interval = interval
+        self.max_pending = max_pending
+        self.queue = collections.deque()  # [key, 쓰기 함수, 인자, Future]
+        self.pending = {}  # key -> 아직 실행 전인 대기열 항목
+        self.syncs = []  # fsync 함수들 (파일마다 하나, register_sync로 등록)
+        self.dirty = False  # 마지막 fsync 뒤에 쓴 것이 있는지 (작업 스레드에서만 사용)
+        self.last_sync = time.monotonic()
+        self.closed = False
+        self.error = None  # 처음 실패한 쓰기/fsync의 오류 (작업 스레드에서만 기록)
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self.run, name="write-behind", daemon=True)
+        self.thread.start()
+
+    def register_sync(self, function):
+        self.syncs.append(function)
+
+    # function(*args)를 대기열에 넣고, 실행이 끝나면 완료되는 Future를 돌려줌
+    def submit(self, function, *args, key=None):
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("저장 작업 스레드가 이미 종료되었습니다")
+            entry = self.pending.get(key) if key is not None else None
+            if entry is not None:
+                entry[1] = function  # 실행 전이면 마지막 쓰기로 바꿔치기
+                entry[2] = args
+                return entry[3]
+            while len(self.queue) >= self.max_pending:
+                self.condition.wait()
+            entry = [key, function, args, Future()]
+            self.queue.append(entry)
+            if key is not None:
+                self.pending[key] = entry
+            self.condition.notify_all()
+            return entry[3]
+
+    # 지금까지 넣은 쓰기가 모두 끝나고 fsync까지 마치면 완료되는 Future (결제처럼 꼭 남아야 하는 단계용)
+    def sync(self):
+        return self.submit(self._sync_all)
+
+    # 남은 쓰기를 모두 마치고 fsync한 뒤 스레드를 끝냄
+    def close(self):
+        with self.condition:
+            if self.closed:
+                return
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join()
+
+    def run(self):
+        while True:
+            with self.condition:
+                if not self.queue and not self.closed:
+                    self.condition.wait(self.interval)
+                if self.queue:
+                    entry = self.queue.popleft()
+                    if entry[0] is not None:
+                        del self.pending[entry[0]]
+                    self.condition.notify_all()
+                elif self.closed:
+                    break
+                else:
+                    entry = None
+
+            if entry is not None:
+                self._run(*entry[1:])
+            if self.dirty and time.monotonic() - self.last_sync >= self.interval:
+                self._sync_quietly()
+        self._sync_quietly()
+
+    def _run(self, function, args, future):
+        if not future.set_running_or_notify_cancel():
+            return
+        self.dirty = True
+        try:
+            result = function(*args)
+        except Exception as error:
+            if self.error is None:
+                self.error = error
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    # 등록된 파일을 모두 fsync. 이전에 실패한 쓰기가 있었거나 fsync가 실패하면 그 오류를 냄
+    def _sync_all(self):
+        try:
+            for function in self.syncs:
+                function()
+        except Exception as error:
+            if self.error is None:
+                self.error = error
+        self.dirty = False
+        self.last_sync = time.monotonic()
+        if self.error is not None:
+            raise self.error.with_traceback(None)
+
+    # 타이머/종료 때의 fsync. 오류는 self.error에 남아 다음 sync()가 실패하므로 여기서는 스레드를 멈추지 않음
+    def _sync_quietly(self):
+        try:
+            self._sync_all()
+        except Exception:
+            pass
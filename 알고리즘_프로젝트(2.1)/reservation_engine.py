@@ -0,0 +1,97 @@
+import heapq
+import itertools
+import threading
+import time as clock
+
+# ReservationEngine 클래스: 여러 좌석을 한 번에 잡는(전부 아니면 전무) 예약 엔진
+# 회차(좌석 맵)마다 잠금을 하나 두고, 그 잠금을 잡은 채로 "모두 비어 있는지 확인 -> 모두 점유"를 처리한다.
+# 확인과 점유 사이에 다른 스레드가 끼어들 수 없으므로, 같은 좌석을 두 번 팔지 않는다.
+# 다른 회차끼리는 서로 기다리지 않으므로 스레드 풀에서 동시에 호출해도 된다.
+# 잡은 좌석(홀드)은 hold_ttl초 안에 confirm 하지 않으면 expire_holds에서 풀린다.
+class ReservationEngine:
+    def __init__(self, seat_map_for, hold_ttl=300, now=clock.monotonic):
+        self.seat_map_for = seat_map_for  # (movie, date, time) -> SeatMap
+        self.hold_ttl = hold_ttl
+        self.now = now
+        self.holds = {}  # hold_id -> (SeatMap, 좌석 목록)
+        self._deadlines = []  # (만료 시각, hold_id) 최소 힙
+        self._deadline_lock = threading.Lock()
+        self._locks = {}
+        self._registry_lock = threading.Lock()
+        self._hold_ids = itertools.count(1)
+
+    # 잠금은 좌석 맵 단위 (같은 좌석 맵을 여러 시간이 공유해도 안전)
+    def _lock_for(self, seat_map):
+        lock = self._locks.get(seat_map)
+        if lock is None:
+            with self._registry_lock:
+                lock = self._locks.setdefault(seat_map, threading.Lock())
+        return lock
+
+    # 좌석을 모두 잡으면 hold_id, 하나라도 이미 점유되어 있으면 아무것도 바꾸지 않고 None
+    def reserve(self, movie, date, time, seats):
+        seat_map = self.seat_map_for(movie, date, time)
+        if seat_map is None or not seats or len(set(seats)) != len(seats):
+            return None
+        if any(seat not in seat_map.layout.seat_indexes for seat in seats):
+            return None
+        with self._lock_for(seat_map):
+            for seat in seats:
+                if not seat_map.is_free(seat):
+                    return None
+            for seat in seats:
+                seat_map.reserve(seat)
+            hold_id = next(self._hold_ids)
+            deadline = self.now() + self.hold_ttl
+            self.holds[hold_id] = (seat_map, list(seats))
+        with self._deadline_lock:
+            heapq.heappush(self._deadlines, (deadline, hold_id))
+        return hold_id
+
+    # 결제 완료: 홀드를 확정 예약으로 바꿈 (좌석은 계속 점유, 만료 대상에서 빠짐)
+    # 이미 만료/취소된 홀드면 False
+    def confirm(self, hold_id):
+        return self.holds.pop(hold_id, None) is not None
+
+    # 잡아 둔 좌석을 되돌림
+    def release(self, hold_id):
+        hold = self.holds.pop(hold_id, None)
+        if hold is None:
+            return False
+        self.release_seats(hold[0], hold[1])
+        return True
+
+    # 좌석 맵의 잠금을 잡고 좌석을 비움 (홀드가 아닌 확정 예약을 취소할 때도 사용)
+    def release_seats(self, seat_map, seats):
+        with self._lock_for(seat_map):
+            for seat in seats:
+                seat_map.release(seat)
+
+    # 만료 시각이 지난 홀드를 풀고 hold_id 목록을 돌려줌
+    # 힙에서 꺼내는 항목마다 O(log n). 이미 확정/취소된 홀드는 꺼낼 때 건너뛴다.
+    def expire_holds(self):
+        now = self.now()
+        expired = []
+        while True:
+            with self._deadline_lock:
+                if not self._deadlines or self._deadlines[0][0] > now:
+                    break
+                deadline, hold_id = heapq.heappop(self._deadlines)
+            hold = self.holds.pop(hold_id, None)
+            if hold is None:
+                continue  # 이미 확정/취소된 홀드
+            self.release_seats(hold[0], hold[1])
+            expired.append(hold_id)
+        return expired
+
+    # 다음 홀드가 만료될 때까지 남은 초 (홀드가 없으면 None)
+    def seconds_until_next_expiry(self):
+        with self._deadline_lock:
+            if not self._deadlines:
+                return None
+            return max(0.0, self._deadlines[0][0] - self.now())
+
+    # 더 쓰지 않는 좌석 맵(지난 날짜)의 잠금을 정리
+    def forget(self, seat_map):
+        with self._registry_lock:
+            self._locks.pop(seat_map, None)
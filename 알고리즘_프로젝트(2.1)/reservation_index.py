@@ -0,0 +1,72 @@
+import bisect
+import itertools
+
+# ReservationIndex 클래스: 회원 한 명의 예매 내역을 (영화, 날짜, 시간) 순으로 정렬해 둔 색인
+# 처음 조회할 때 한 번만 정렬하고, 이후 추가/취소는 이진 탐색으로 그 자리에만 넣고 뺀다.
+# (시작할 때 회원 수만큼 정렬하지 않도록, 조회 전의 추가/취소는 정렬 전 목록에만 반영해 둔다)
+# 같은 영화·날짜·시간의 예매가 여러 건이어도 순번으로 구분되므로 모두 따로 보인다.
+# 영화 하나(또는 그 영화의 날짜 구간)는 이진 탐색 두 번으로 구간을 찾아 O(log n + k)에 꺼낸다.
+class ReservationIndex:
+    LAST = "\uffff"  # 어떤 날짜/시간 문자열보다 큰 값 (구간 끝 표시)
+
+    def __init__(self, reservations=()):
+        self._serials = itertools.count()
+        self.unsorted = list(reservations)  # 아직 정렬하지 않은 예매, 정렬한 뒤에는 None
+        self.keys = []  # (영화, 날짜, 시간, 순번) 정렬 목록
+        self.items = []  # keys와 같은 순서의 예매
+        self.key_of = {}  # 예매 -> 정렬 키
+
+    def _sort(self):
+        entries = sorted(((self._key(reservation), reservation) for reservation in self.unsorted), key=lambda entry: entry[0])
+        self.keys = [key for key, reservation in entries]
+        self.items = [reservation for key, reservation in entries]
+        self.key_of = {id(reservation): key for key, reservation in entries}
+        self.unsorted = None
+
+    def __len__(self):
+        if self.unsorted is not None:
+            return len(self.unsorted)
+        return len(self.items)
+
+    def __iter__(self):
+        if self.unsorted is not None:
+            self._sort()
+        return iter(self.items)
+
+    def _key(self, reservation):
+        return (reservation["영화"], reservation["날짜"], reservation["시간"], next(self._serials))
+
+    def add(self, reservation):
+        if self.unsorted is not None:
+            self.unsorted.append(reservation)
+            return
+        key = self._key(reservation)
+        position = bisect.bisect_left(self.keys, key)
+        self.keys.insert(position, key)
+        self.items.insert(position, reservation)
+        self.key_of[id(reservation)] = key
+
+    def remove(self, reservation):
+        if self.unsorted is not None:
+            for i, item in enumerate(self.unsorted):
+                if item is reservation:
+                    del self.unsorted[i]
+                    return True
+            return False
+        key = self.key_of.pop(id(reservation), None)
+        if key is None:
+            return False
+        position = bisect.bisect_left(self.keys, key)
+        del self.keys[position]
+        del self.items[position]
+        return True
+
+    # 영화의 예매 (date_from ~ date_to 날짜만, 양 끝 포함). 영화를 주지 않으면 전체
+    def range(self, movie=None, date_from=None, date_to=None):
+        if self.unsorted is not None:
+            self._sort()
+        if movie is None:
+            return list(self.items)
+        start = bisect.bisect_left(self.keys, (movie,) if date_from is None else (movie, date_from))
+        end = bisect.bisect_left(self.keys, (movie, self.LAST) if date_to is None else (movie, date_to, self.LAST))
+        return self.items[start:end]
@@ -0,0 +1,347 @@
+import ast
+import json
+import os
+import subprocess
+import sys
+import threading
+import zlib
+from concurrent.futures import Future
+from snapshot_cache import SnapshotCache
+
+# ReservationJournal 클래스: 회원/예약 이벤트를 한 줄씩 덧붙여 저장하는 저널
+# 한 줄 형식: "crc32(8자리 16진수)|json"
+# 저장 비용은 이벤트 한 줄(O(1))이고, compact_every 건마다 전체 상태를 스냅샷으로 압축한다.
+# set_worker로 WriteBehindWorker를 주면 파일 쓰기와 fsync는 그 스레드가 하고, append는 줄을 만들어 넘기기만 한다.
+# 이때 주기적인 압축은 호출한 쪽에서 회원 목록을 글자로 만들지 않는다. 작업 스레드가 저널 파일을 journal.old로 바꿔 두고,
+# 별도 프로세스가 "이전 스냅샷 + journal.old"를 재생해 새 스냅샷을 만든다 (그동안 새 이벤트는 새 저널 파일에 쌓임).
+# 스레드가 아니라 프로세스인 이유: 수십만 건의 json 읽기/쓰기는 한 번 호출에 GIL을 오래 잡아 화면과 결제가 멈춘다.
+# 결제 전 예약(unpaid)은 이벤트마다 따로 갱신해 스냅샷/캐시에 같이 저장한다. 다시 시작할 때 취소할 예약을 회원 전체를 돌지 않고 찾기 위해서다.
+# 불러온 회원 목록은 (seq, 회원 목록) 그대로 marshal 캐시에 저장해 두고, 스냅샷 파일이 그대로면 JSON 대신 캐시를 읽은 뒤
+# 저널에서 캐시 seq보다 뒤의 이벤트만 재생한다.
+class ReservationJournal:
+    CACHE_VERSION = 2
+
+    def __init__(self, journal_path, snapshot_path, compact_every=1000, fsync=True):
+        self.journal_path = journal_path
+        self.snapshot_path = snapshot_path
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self.snapshot_source = None  # 압축할 때 전체 회원 목록을 돌려주는 함수
+        self.listeners = []  # 기록한 이벤트를 받아 갱신하는 보조 색인 (BookingIndex.apply 등)
+        self.next_seq = 1
+        self.records_since_snapshot = 0
+        self.snapshot_seq = 0  # 스냅샷 파일에 들어 있는 마지막 seq
+        self.unpaid = {}  # 결제 전 예약: 예약번호 -> 전화번호
+        self.file = None
+        self.cache = SnapshotCache(snapshot_path + ".cache", snapshot_path, self.CACHE_VERSION)
+        self.worker = None  # 쓰기 지연용 WriteBehindWorker (없으면 append에서 바로 쓰고 fsync)
+        self.rotated_path = journal_path + ".old"  # 압축 중인 이전 저널 (스냅샷에 반영되면 지움)
+        self.compactor = None  # journal.old로 새 스냅샷을 만드는 프로세스를 기다리는 스레드
+
+    def set_worker(self, worker):
+        self.worker = worker
+        worker.register_sync(self._sync)
+
+    def exists(self):
+        return os.path.exists(self.journal_path) or os.path.exists(self.snapshot_path)
+
+    # 스냅샷(또는 캐시) + 저널 꼬리를 재생해 회원 목록을 복원
+    def replay(self, contact_factory):
+        contacts = {}
+        cached = self.cache.load()
+        if cached is not None:
+            snapshot_seq, base_seq, rows, unpaid = cached
+        elif os.path.exists(self.snapshot_path):
+            snapshot_seq, rows, unpaid = load_snapshot(self.snapshot_path)
+            base_seq = snapshot_seq
+        else:
+            snapshot_seq = base_seq = 0
+            rows = []
+            unpaid = {}
+        self.unpaid = unpaid
+        for phone_number, password, reservations in rows:
+            contacts[phone_number] = contact_factory(phone_number, password, reservations)
+
+        last_seq = base_seq
+        tail_records = 0
+        # 압축하다 끝난 journal.old가 있으면 그것부터 (seq 순서)
+        for path in (self.rotated_path, self.journal_path):
+            for event in read_events(path):
+                if event["seq"] <= snapshot_seq:
+                    continue
+                tail_records += 1  # 스냅샷 뒤의 이벤트 수 (다음 압축 시점 계산용)
+                if event["seq"] <= base_seq:
+                    continue  # 캐시에 이미 반영된 이벤트
+                apply_event(contacts, event, contact_factory)
+                track_unpaid(self.unpaid, event)
+                last_seq = event["seq"]
+
+        self.next_seq = last_seq + 1
+        self.records_since_snapshot = tail_records
+        self.snapshot_seq = snapshot_seq
+        if cached is None or last_seq != base_seq:
+            self.save_cache(contacts.values())
+        return list(contacts.values())
+
+    # 지금 회원 목록을 캐시에 저장 (불러온 직후, 또는 종료할 때 밀린 쓰기가 끝난 뒤에 호출)
+    def save_cache(self, contacts):
+        self.wait_compaction()  # 만들고 있는 스냅샷이 끝난 뒤의 파일 상태로 캐시를 맞춤
+        rows = [[c.phone_number, c.password, c.reservations] for c in contacts]
+        self.cache.save((self.snapshot_seq, self.next_seq - 1, rows, dict(self.unpaid)))
+
+    def append(self, event):
+        event["seq"] = self.next_seq
+        payload = json.dumps(event, ensure_ascii=False, separators=(',', ':')).encode("utf-8")
+        line = f"{zlib.crc32(payload):08x}|".encode("ascii") + payload + b"\n"
+        if self.worker is None:
+            self._write_line(line)
+            self._sync()
+        else:
+            self.worker.submit(self._write_line, line)
+        self.next_seq += 1
+        self.records_since_snapshot += 1
+        track_unpaid(self.unpaid, event)
+        for listener in self.listeners:
+            listener(event)
+        if self.records_since_snapshot >= self.compact_every:
+            if self.worker is not None:
+                self.worker.submit(self._rotate)
+                self.records_since_snapshot = 0
+            elif self.snapshot_source is not None:
+                self.compact(self.snapshot_source())
+        return event["seq"]
+
+    # 지금까지 append한 이벤트가 디스크에 남으면 완료되는 Future (결제처럼 잃으면 안 되는 단계에서 기다림)
+    def durable(self):
+        if self.worker is not None:
+            return self.worker.sync()
+        future = Future()
+        future.set_result(None)  # 작업 스레드가 없으면 append에서 이미 fsync함
+        return future
+
+    # 주어진 회원 목록 전체를 스냅샷으로 쓰고 저널을 비움 (저널에 없는 상태를 옮겨 올 때: 예전 파일 변환 등)
+    # 호출한 쪽은 예약 목록(list)만 복사하고, JSON 변환과 쓰기는 작업 스레드가 한다.
+    # 예약 dict는 복사하지 않음: 나중에 바뀌는 것은 결제 방법 키 하나뿐이고, 그 결제는 이 seq 뒤의 저널 줄로 남아 재생 때 다시 반영된다.
+    # 아직 못 쓴 스냅샷이 있으면 새 것으로 바꿔치기 (그 사이 저널에 들어간 줄은 새 스냅샷의 seq 이하라 재생 때 건너뛴다)
+    def compact(self, contacts):
+        seq = self.next_seq - 1
+        rows = [[c.phone_number, c.password, list(c.reservations)] for c in contacts]
+        self.unpaid = unpaid_of(rows)
+        if self.worker is None:
+            self._write_snapshot(seq, rows, dict(self.unpaid))
+        else:
+            self.worker.submit(self._write_snapshot, seq, rows, dict(self.unpaid), key=self.snapshot_path)
+        self.snapshot_seq = seq
+        self.records_since_snapshot = 0
+
+    def _write_snapshot(self, seq, rows, unpaid):
+        self.wait_compaction()  # 더 오래된 상태로 만든 스냅샷이 이 스냅샷을 덮지 않도록
+        self._replace_snapshot(json.dumps({"seq": seq, "contacts": rows, "unpaid": unpaid}, ensure_ascii=False))
+        if os.path.exists(self.rotated_path):
+            os.remove(self.rotated_path)  # 들어 있는 이벤트는 모두 seq 이하
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        with open(self.journal_path, "wb"):
+            pass
+
+    def _replace_snapshot(self, text):
+        temp_path = self.snapshot_path + ".tmp"
+        write_file(temp_path, text)
+        self.cache.invalidate()
+        os.replace(temp_path, self.snapshot_path)
+
+    # (작업 스레드) 지금 저널 파일을 journal.old로 바꾸고 스냅샷을 만드는 스레드를 시작
+    # 이전 압축이 아직 돌고 있으면 이번은 건너뜀. 끝나지 못한 journal.old가 남아 있으면 그것부터 압축
+    def _rotate(self):
+        if self.compactor is not None and self.compactor.is_alive():
+            return
+        if not os.path.exists(self.rotated_path):
+            if self.file is not None:
+                self._sync()  # 옮기기 전에 지금까지 쓴 줄을 디스크에 남김
+                self.file.close()
+                self.file = None
+            if not os.path.exists(self.journal_path) or os.path.getsize(self.journal_path) == 0:
+                return
+            os.replace(self.journal_path, self.rotated_path)
+        self.compactor = threading.Thread(target=self._compact_rotated, name="journal-compact", daemon=True)
+        self.compactor.start()
+
+    # (압축 스레드) 이 파일을 별도 프로세스로 실행해 임시 파일에 새 스냅샷을 만들게 하고, 끝나면 스냅샷을 교체하고 journal.old를 지움
+    # 실패하면 journal.old가 그대로 남으므로 재생 때 읽히고, 다음 압축 때 다시 시도한다.
+    def _compact_rotated(self):
+        temp_path = self.snapshot_path + ".tmp"
+        result = subprocess.run([sys.executable, os.path.abspath(__file__), self.snapshot_path, self.rotated_path, temp_path],
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"스냅샷 압축 실패: {result.stderr.strip()}")
+            return
+        self.cache.invalidate()
+        os.replace(temp_path, self.snapshot_path)
+        os.remove(self.rotated_path)
+        self.snapshot_seq = int(result.stdout)
+
+    def wait_compaction(self):
+        if self.compactor is not None:
+            self.compactor.join()
+
+    def _write_line(self, line):
+        if self.file is None:
+            self.file = open(self.journal_path, "ab")
+        self.file.write(line)
+        self.file.flush()
+
+    def _sync(self):
+        if self.file is not None and self.fsync:
+            os.fsync(self.file.fileno())
+
+    # 작업 스레드를 쓰면 worker.close()로 밀린 쓰기를 끝낸 뒤에 호출
+    def close(self):
+        self.wait_compaction()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+# SnapshotRow 클래스: 압축 프로세스가 스냅샷을 만들 때 쓰는 가벼운 회원 (apply_event에 필요한 것만 있음)
+class SnapshotRow:
+    def __init__(self, phone_number, password, reservations):
+        self.phone_number = phone_number
+        self.password = password
+        self.reservations = reservations
+
+    def add_reservation(self, reservation):
+        self.reservations.append(reservation)
+
+    def remove_reservation(self, reservation):
+        self.reservations.remove(reservation)
+
+
+# 저널 줄 하나를 이벤트로 바꿈. 끊기거나 체크섬이 안 맞으면 None
+def decode_line(raw_line):
+    if not raw_line.endswith(b"\n"):
+        return None
+    checksum, sep, payload = raw_line[:-1].partition(b"|")
+    if not sep:
+        return None
+    try:
+        if int(checksum, 16) != zlib.crc32(payload):
+            return None
+        return json.loads(payload.decode("utf-8"))
+    except ValueError:
+        return None
+
+
+# 저널 파일의 이벤트를 차례로 돌려줌. 마지막 줄이 쓰다가 끊겼으면 그 앞까지만 유효하므로 파일을 거기서 자름
+def read_events(path):
+    if not os.path.exists(path):
+        return
+    valid_size = 0
+    with open(path, "rb") as file:
+        for raw_line in file:
+            event = decode_line(raw_line)
+            if event is None:
+                print(f"저널 손상 감지, {valid_size} 바이트 이후를 버립니다: {path}")
+                break
+            valid_size += len(raw_line)
+            yield event
+    if valid_size != os.path.getsize(path):
+        with open(path, "r+b") as file:
+            file.truncate(valid_size)
+
+
+def write_file(path, text):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(text)
+        file.flush()
+        os.fsync(file.fileno())
+
+
+# 스냅샷 + 이전 저널을 재생한 결과를 output_path에 쓰고, 반영한 마지막 seq를 돌려줌 (압축 프로세스에서 실행)
+def build_snapshot(snapshot_path, journal_path, output_path):
+    seq, rows, unpaid = 0, [], {}
+    if os.path.exists(snapshot_path):
+        seq, rows, unpaid = load_snapshot(snapshot_path)
+    contacts = {phone_number: SnapshotRow(phone_number, password, reservations) for phone_number, password, reservations in rows}
+    for event in read_events(journal_path):
+        if event["seq"] > seq:
+            apply_event(contacts, event, SnapshotRow)
+            track_unpaid(unpaid, event)
+            seq = event["seq"]
+    rows = [[c.phone_number, c.password, c.reservations] for c in contacts.values()]
+    write_file(output_path, json.dumps({"seq": seq, "contacts": rows, "unpaid": unpaid}, ensure_ascii=False))
+    return seq
+
+
+# 스냅샷 파일 읽기: (seq, 회원 행 목록, 결제 전 예약). 결제 전 예약이 없는 예전 스냅샷이면 이번 한 번만 회원 전체에서 찾음
+def load_snapshot(snapshot_path):
+    with open(snapshot_path, "r", encoding="utf-8") as file:
+        snapshot = json.load(file)
+    unpaid = snapshot.get("unpaid")
+    if unpaid is None:
+        unpaid = unpaid_of(snapshot["contacts"])
+    return snapshot["seq"], snapshot["contacts"], unpaid
+
+
+# 회원 행 목록에서 결제 전 예약 찾기: 예약번호 -> 전화번호
+def unpaid_of(rows):
+    return {reservation["예약번호"]: phone_number for phone_number, password, reservations in rows
+            for reservation in reservations if not reservation.get("결제 방법")}
+
+
+# 저널 이벤트 하나를 결제 전 예약 목록에 반영
+def track_unpaid(unpaid, event):
+    kind = event["type"]
+    if kind == "reserve":
+        if not event["reservation"].get("결제 방법"):
+            unpaid[event["reservation"]["예약번호"]] = event["phone"]
+    elif kind in ("pay", "cancel"):
+        unpaid.pop(event["reservation_id"], None)
+    elif kind == "delete_contact":
+        for reservation_id in [r for r, phone_number in unpaid.items() if phone_number == event["phone"]]:
+            del unpaid[reservation_id]
+
+
+# 저널 이벤트 하나를 회원 목록(전화번호 -> Contact)에 반영
+def apply_event(contacts, event, contact_factory):
+    kind = event["type"]
+    phone_number = event["phone"]
+    if kind == "register":
+        contacts[phone_number] = contact_factory(phone_number, event["password"], [])
+        return
+    contact = contacts.get(phone_number)
+    if contact is None:
+        return
+    if kind == "delete_contact":
+        del contacts[phone_number]
+    elif kind == "update_password":
+        contact.password = event["password"]
+    elif kind == "reserve":
+        contact.add_reservation(event["reservation"])
+    elif kind == "pay":
+        for reservation in contact.reservations:
+            if reservation.get("예약번호") == event["reservation_id"]:
+                reservation["결제 방법"] = event["method"]
+                break
+    elif kind == "cancel":
+        for reservation in [r for r in contact.reservations if r.get("예약번호") == event["reservation_id"]]:
+            contact.remove_reservation(reservation)
+
+
+# 예전 형식(전화번호|비밀번호|repr(예약 목록)) 파일 읽기. eval 대신 literal_eval 사용
+def load_legacy_contacts(filename, contact_factory):
+    contacts = []
+    with open(filename, "r", encoding="utf-8") as file:
+        for line in file:
+            parts = line.strip().split('|')
+            if len(parts) == 3:
+                reservations = ast.literal_eval(parts[2])
+                for number, reservation in enumerate(reservations):
+                    reservation.setdefault("예약번호", f"{parts[0]}-{number}")
+                contacts.append(contact_factory(parts[0], parts[1], reservations))
+    return contacts
+
+
+# 압축 프로세스: python reservation_journal.py 스냅샷경로 이전저널경로 출력경로
+if __name__ == "__main__":
+    print(build_snapshot(sys.argv[1], sys.argv[2], sys.argv[3]))
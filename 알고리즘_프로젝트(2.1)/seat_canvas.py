@@ -0,0 +1,68 @@
+import tkinter as tk
+
+# SeatCanvas 클래스: 상영관 좌석 전체를 Canvas 하나에 사각형으로 그리는 좌석표
+# 좌석마다 위젯을 만들지 않고, 클릭 위치는 (x, y)를 칸 크기로 나눠 좌석 번호로 바꾼다.
+# show()는 지난번 점유/선택 비트와 XOR 해서 달라진 칸의 색만 바꾸므로 2,000석 상영관도 바로 갱신된다.
+class SeatCanvas(tk.Canvas):
+    FREE = "white"
+    TAKEN = "gray40"
+    SELECTED = "orange"
+    MARGIN = 28  # 왼쪽 행 이름, 위쪽 스크린/열 번호 자리
+
+    def __init__(self, master, layout, on_click, max_width=900, max_height=600):
+        self.layout = layout
+        self.on_click = on_click
+        self.cell = max(10, min(28, (max_width - self.MARGIN) // layout.cols, (max_height - self.MARGIN * 2) // layout.rows))
+        self.top = self.MARGIN * 2
+        width = self.MARGIN + layout.cols * self.cell
+        height = self.top + layout.rows * self.cell
+        super().__init__(master, width=width, height=height, background="gray90", highlightthickness=0)
+
+        self.create_text(width // 2, self.MARGIN // 2, text="스크린")
+        self.create_line(self.MARGIN, self.MARGIN, width, self.MARGIN, width=3)
+        label_every = 1 if self.cell >= 20 else 5
+        for col in range(0, layout.cols, label_every):
+            self.create_text(self.MARGIN + col * self.cell + self.cell // 2, self.top - self.MARGIN // 2, text=str(col + 1))
+        for row in range(layout.rows):
+            self.create_text(self.MARGIN // 2, self.top + row * self.cell + self.cell // 2, text=layout.row_labels[row])
+
+        self.items = []  # 좌석 번호 -> 사각형 item
+        for i in range(layout.seat_count):
+            row, col = layout.position(i)
+            x = self.MARGIN + col * self.cell
+            y = self.top + row * self.cell
+            self.items.append(self.create_rectangle(x + 2, y + 2, x + self.cell - 2, y + self.cell - 2, fill=self.FREE, outline="gray60"))
+        self.taken_bits = 0  # 지금 그려진 점유 좌석 (좌석 번호 = 비트 번호)
+        self.selected_bits = 0  # 지금 그려진 선택 좌석
+        self.bind("<Button-1>", self.on_press)
+
+    # 클릭한 칸의 좌석 이름으로 on_click 호출. 점유된 좌석과 칸 밖은 무시
+    def on_press(self, event):
+        col = (event.x - self.MARGIN) // self.cell
+        row = (event.y - self.top) // self.cell
+        if not (0 <= row < self.layout.rows and 0 <= col < self.layout.cols):
+            return
+        index = row * self.layout.cols + col
+        if not self.taken_bits >> index & 1:
+            self.on_click(self.layout.seat_names[index])
+
+    # 좌석 맵과 선택 좌석을 반영. 색이 바뀌어야 하는 칸만 다시 칠함
+    def show(self, seat_map, selected_seats):
+        taken_bits = int.from_bytes(seat_map.bits, "little")
+        selected_bits = 0
+        for seat in selected_seats:
+            selected_bits |= 1 << self.layout.seat_index(seat)
+        dirty = (taken_bits ^ self.taken_bits) | (selected_bits ^ self.selected_bits)
+        while dirty:
+            lowest = dirty & -dirty
+            index = lowest.bit_length() - 1
+            dirty ^= lowest
+            if taken_bits & lowest:
+                color = self.TAKEN
+            elif selected_bits & lowest:
+                color = self.SELECTED
+            else:
+                color = self.FREE
+            self.itemconfigure(self.items[index], fill=color)
+        self.taken_bits = taken_bits
+        self.selected_bits = selected_bits
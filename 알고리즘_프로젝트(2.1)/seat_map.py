@@ -0,0 +1,329 @@
+import os
+import struct
+import threading
+from array import array
+
+# HallLayout 클래스: 상영관의 좌석 배치 (행 수 x 열 수)
+# 좌석 이름은 행 문자 + 열 번호 (A1, A2, ..., Z6, AA1, ...)
+class HallLayout:
+    def __init__(self, rows=6, cols=6):
+        self.rows = rows
+        self.cols = cols
+        self.seat_count = rows * cols
+        self.row_labels = [row_label(r) for r in range(rows)]
+        self.seat_names = [f"{label}{c + 1}" for label in self.row_labels for c in range(cols)]
+        self.seat_indexes = {name: i for i, name in enumerate(self.seat_names)}
+        # 중앙 행부터 바깥 행 순서 (좌석 추천에서 사용)
+        self.rows_by_center = sorted(range(rows), key=lambda r: abs(r - (rows - 1) / 2))
+
+    def seat_name(self, index):
+        return self.seat_names[index]
+
+    # 좌석 이름 또는 번호를 번호로 변환
+    def seat_index(self, seat):
+        if isinstance(seat, int):
+            return seat
+        return self.seat_indexes[seat]
+
+    def position(self, index):
+        return divmod(index, self.cols)
+
+
+def row_label(row):
+    label = ""
+    row += 1
+    while row > 0:
+        row, rest = divmod(row - 1, 26)
+        label = chr(ord('A') + rest) + label
+    return label
+
+
+DEFAULT_LAYOUT = HallLayout(6, 6)
+
+
+# SeatMap 클래스: 상영 회차 하나의 좌석 점유 상태를 비트 하나씩 저장
+# 예약/해제/빈 좌석 확인은 O(1), 남은 좌석 수는 카운터로 O(1)
+# 행마다 빈 좌석 수와 연속 빈 좌석 구간(free run)을 따로 관리해 연속 좌석 찾기에 사용
+class SeatMap:
+    def __init__(self, layout=DEFAULT_LAYOUT):
+        self.layout = layout
+        self.bits = bytearray((layout.seat_count + 7) // 8)
+        self.taken = 0
+        self.row_free = array('I', [layout.cols]) * layout.rows  # 행별 빈 좌석 수
+        self._row_runs = {}  # 행 -> [(시작 열, 길이), ...], 그 행이 바뀌면 지움
+        self.listener = None  # 좌석이 바뀔 때 바뀐 바이트 번호로 호출 (SeatOccupancyFile)
+
+    def is_free(self, seat):
+        index = self.layout.seat_index(seat)
+        return not self.bits[index >> 3] & (1 << (index & 7))
+
+    # 빈 좌석이면 점유하고 True, 이미 점유된 좌석이면 False
+    def reserve(self, seat):
+        index = self.layout.seat_index(seat)
+        mask = 1 << (index & 7)
+        if self.bits[index >> 3] & mask:
+            return False
+        self.bits[index >> 3] |= mask
+        self.taken += 1
+        self._row_changed(index, -1)
+        if self.listener is not None:
+            self.listener(self, index >> 3)
+        return True
+
+    def release(self, seat):
+        index = self.layout.seat_index(seat)
+        mask = 1 << (index & 7)
+        if not self.bits[index >> 3] & mask:
+            return False
+        self.bits[index >> 3] &= ~mask
+        self.taken -= 1
+        self._row_changed(index, 1)
+        if self.listener is not None:
+            self.listener(self, index >> 3)
+        return True
+
+    def _row_changed(self, index, delta):
+        row = index // self.layout.cols
+        self.row_free[row] += delta
+        self._row_runs.pop(row, None)
+
+    # 비트맵을 통째로 바꾼 뒤(파일에서 불러오기 등) 카운터와 행 정보를 다시 계산
+    def refresh_counts(self):
+        self.taken = self.popcount()
+        cols = self.layout.cols
+        for row in range(self.layout.rows):
+            self.row_free[row] = sum(1 for c in range(row * cols, row * cols + cols) if self.is_free(c))
+        self._row_runs.clear()
+
+    # 한 행의 연속 빈 좌석 구간 목록 (바뀌지 않은 행은 캐시 사용)
+    def free_runs(self, row):
+        runs = self._row_runs.get(row)
+        if runs is None:
+            runs = []
+            cols = self.layout.cols
+            start = None
+            for col in range(cols):
+                if self.is_free(row * cols + col):
+                    if start is None:
+                        start = col
+                elif start is not None:
+                    runs.append((start, col - start))
+                    start = None
+            if start is not None:
+                runs.append((start, cols - start))
+            self._row_runs[row] = runs
+        return runs
+
+    def remaining(self):
+        return self.layout.seat_count - self.taken
+
+    # 비트를 직접 세어 점유 좌석 수 계산 (카운터 검증/복원용)
+    def popcount(self):
+        return int.from_bytes(self.bits, "little").bit_count()
+
+    def taken_seats(self):
+        return [self.layout.seat_name(i) for i in range(self.layout.seat_count) if not self.is_free(i)]
+
+
+# 같은 행에서 연속된 party_size석 중 상영관 중앙에 가장 가까운 묶음을 찾음 (없으면 None)
+# 중앙 행부터 살피며 빈 좌석 수가 모자란 행은 바로 건너뛰고, 나머지 행은 free run마다
+# 중앙에 가장 가까운 시작 위치만 계산한다. 더 나은 답이 나올 수 없는 행에 이르면 멈춘다.
+def find_best_seats(seat_map, party_size):
+    layout = seat_map.layout
+    if party_size <= 0 or party_size > layout.cols:
+        return None
+    center_row = (layout.rows - 1) / 2
+    center_col = (layout.cols - 1) / 2
+    best = None
+    for row in layout.rows_by_center:
+        row_distance = (row - center_row) ** 2
+        if best is not None and row_distance >= best[0]:
+            break  # 이후 행은 더 멀어서 열을 가운데에 맞춰도 지금까지의 최선보다 나을 수 없음
+        if seat_map.row_free[row] < party_size:
+            continue
+        for start, length in seat_map.free_runs(row):
+            if length < party_size:
+                continue
+            # 묶음 가운데가 중앙 열에 오도록 시작 열을 정하고 구간 안으로 맞춤
+            first = round(center_col - (party_size - 1) / 2)
+            first = min(max(first, start), start + length - party_size)
+            score = row_distance + (first + (party_size - 1) / 2 - center_col) ** 2
+            if best is None or score < best[0]:
+                best = (score, row, first)
+    if best is None:
+        return None
+    _, row, first = best
+    return [layout.seat_name(row * layout.cols + col) for col in range(first, first + party_size)]
+
+
+# SeatOccupancyFile 클래스: 회차별 좌석 비트맵을 바이너리 파일 하나에 저장
+# 파일 = 헤더 + 회차 영역들, 영역 = [키 길이(2)][좌석 수(4)][키(utf-8)][비트맵]
+# 예약/해제 때는 바뀐 1바이트만 제자리에 덮어쓴다.
+# set_worker로 WriteBehindWorker를 주면 그 1바이트 쓰기를 작업 스레드로 넘기고 fsync는 작업 스레드가 모아서 한다.
+# 영역은 뒤에 붙이기만 하므로, 지난 날짜의 영역과 배치가 바뀌어 버려진 영역은 시작할 때 compact로 파일에서 뺀다.
+# 실행 중에 비운 영역을 다른 회차에 다시 쓰지는 않는다 (작업 스레드에 남은 옛 회차의 1바이트 쓰기가 새 회차 자리에 덮일 수 있음).
+class SeatOccupancyFile:
+    MAGIC = b"SEATMAP1"
+    REGION_HEADER = struct.Struct("<HI")
+
+    def __init__(self, file_path, fsync=True):
+        self.file_path = file_path
+        self.fsync = fsync
+        self.regions = {}  # 키 -> (비트맵 시작 위치, 좌석 수), 비트맵은 attach 때 읽는다
+        self.lock = threading.Lock()  # 여러 스레드에서 예약해도 seek/write가 섞이지 않도록
+        self.worker = None  # 쓰기 지연용 WriteBehindWorker
+        self.created = not os.path.exists(file_path)
+        if self.created:
+            with open(file_path, "wb") as file:
+                file.write(self.MAGIC)
+        else:
+            self._load()
+        self.file = open(file_path, "r+b")
+
+    def set_worker(self, worker):
+        self.worker = worker
+        worker.register_sync(self._sync)
+
+    def _load(self):
+        with open(self.file_path, "rb") as file:
+            if file.read(len(self.MAGIC)) != self.MAGIC:
+                raise ValueError(f"좌석 파일 형식이 올바르지 않습니다: {self.file_path}")
+            offset = len(self.MAGIC)
+            while True:
+                header = file.read(self.REGION_HEADER.size)
+                if len(header) < self.REGION_HEADER.size:
+                    break
+                key_length, seat_count = self.REGION_HEADER.unpack(header)
+                key = file.read(key_length).decode("utf-8")
+                bits = file.read((seat_count + 7) // 8)
+                if len(bits) < (seat_count + 7) // 8:
+                    break  # 쓰다가 끊긴 마지막 영역
+                offset += self.REGION_HEADER.size + key_length
+                # 같은 키가 여러 번 있으면 마지막 영역이 유효 (배치가 바뀐 경우)
+                self.regions[key] = (offset, seat_count)
+                offset += len(bits)
+        if offset != os.path.getsize(self.file_path):
+            with open(self.file_path, "r+b") as file:
+                file.truncate(offset)
+
+    # 좌석 맵을 파일의 영역에 연결. 저장된 상태가 있으면 불러오고, 없으면 새 영역을 만든다
+    # (아직 안 쓴 쓰기가 남아 있을 수 있는 영역은 이미 연결된 좌석 맵의 것뿐이라, 새로 읽는 영역은 파일 내용이 최신이다)
+    # 이미 다른 곳에 연결돼 있던 좌석 맵(제목 변경 등)은 지금 상태를 그 영역에 쓴다.
+    def attach(self, key, seat_map):
+        region = self.regions.get(key)
+        if region is not None and region[1] == seat_map.layout.seat_count:
+            if seat_map.listener is None:
+                seat_map.bits[:] = self._read(region[0], len(seat_map.bits))
+                seat_map.refresh_counts()
+            else:
+                self._write(region[0], seat_map.bits)
+        else:
+            region = self._append_region(key, seat_map.layout.seat_count, seat_map.bits)
+        offset = region[0]
+        seat_map.listener = lambda changed, byte_index: self._write(offset + byte_index, changed.bits[byte_index:byte_index + 1])
+
+    # 지난 날짜의 영역과 같은 키의 옛 영역을 빼고 파일을 다시 씀
+    # 영역 위치가 바뀌므로 좌석 맵을 attach하기 전(BookingSystem을 만들 때)에만 부른다.
+    def compact(self, today):
+        live = {key: region for key, region in self.regions.items() if _is_current(key, today)}
+        size = len(self.MAGIC) + sum(self.REGION_HEADER.size + len(key.encode("utf-8")) + (seat_count + 7) // 8
+                                     for key, (offset, seat_count) in live.items())
+        temp_path = self.file_path + ".tmp"
+        with self.lock:
+            self.file.flush()
+            if size == os.path.getsize(self.file_path):
+                return
+            regions = {}
+            with open(temp_path, "wb") as file:
+                file.write(self.MAGIC)
+                for key, (offset, seat_count) in live.items():
+                    self.file.seek(offset)
+                    bits = self.file.read((seat_count + 7) // 8)
+                    encoded = key.encode("utf-8")
+                    file.write(self.REGION_HEADER.pack(len(encoded), seat_count) + encoded)
+                    regions[key] = (file.tell(), seat_count)
+                    file.write(bits)
+                file.flush()
+                if self.fsync:
+                    os.fsync(file.fileno())
+            self.file.close()  # 열린 파일은 교체할 수 없는 운영체제(Windows)도 있음
+            os.replace(temp_path, self.file_path)
+            self.file = open(self.file_path, "r+b")
+            self.regions = regions
+
+    # 실행 중 날짜가 바뀌면 지난 날짜 영역을 목록에서만 뺌 (파일 공간은 다음 시작 때 compact가 정리)
+    def forget_before(self, today):
+        for key in [key for key in list(self.regions) if not _is_current(key, today)]:
+            self.regions.pop(key, None)
+
+    # 영화 삭제/제목 변경: 제목이 title인 회차 영역을 모두 목록에서 빼고 파일의 비트맵을 0으로 덮음
+    # 파일에는 빈 영역으로 남으므로, 나중에 같은 제목의 영화가 생겨도 옛 좌석 상태를 물려받지 않는다.
+    # new_title을 주면 각 영역의 상태를 새 제목의 키로 옮긴다. 연결된 좌석 맵은 이후 attach가 최신 상태로 다시 쓴다.
+    def drop_title(self, title, new_title=None):
+        for key in [key for key in list(self.regions) if key.rsplit("|", 2)[0] == title]:
+            offset, seat_count = self.regions.pop(key)
+            length = (seat_count + 7) // 8
+            if new_title is not None:
+                new_key = showtime_key(new_title, *key.rsplit("|", 2)[1:])
+                bits = self._read(offset, length)
+                region = self.regions.get(new_key)
+                if region is not None and region[1] == seat_count:
+                    self._write(region[0], bits)
+                else:
+                    self._append_region(new_key, seat_count, bits)
+            self._write(offset, bytes(length))
+
+    def _append_region(self, key, seat_count, bits):
+        encoded = key.encode("utf-8")
+        with self.lock:
+            self.file.seek(0, os.SEEK_END)
+            start = self.file.tell()
+            self.file.write(self.REGION_HEADER.pack(len(encoded), seat_count) + encoded + bytes(bits))
+            self._flush()
+        region = (start + self.REGION_HEADER.size + len(encoded), seat_count)
+        self.regions[key] = region
+        return region
+
+    def _read(self, offset, length):
+        with self.lock:
+            self.file.seek(offset)
+            return self.file.read(length)
+
+    # 작업 스레드가 있으면 넘기기만 함. 같은 자리를 아직 안 썼으면 마지막 값 하나만 쓴다
+    def _write(self, offset, data):
+        if self.worker is not None:
+            self.worker.submit(self._write_now, offset, bytes(data), key=(self.file_path, offset, len(data)))
+        else:
+            self._write_now(offset, data)
+
+    def _write_now(self, offset, data):
+        with self.lock:
+            self.file.seek(offset)
+            self.file.write(data)
+            if self.worker is None:
+                self._flush()
+            else:
+                self.file.flush()
+
+    def _flush(self):
+        self.file.flush()
+        if self.fsync:
+            os.fsync(self.file.fileno())
+
+    def _sync(self):
+        if self.fsync:
+            with self.lock:
+                os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+
+def showtime_key(title, date, time):
+    return f"{title}|{date}|{time}"
+
+
+# showtime_key로 만든 키가 today 이후 회차인지 (날짜를 알 수 없는 키는 남겨 둠)
+def _is_current(key, today):
+    parts = key.rsplit("|", 2)
+    return len(parts) != 3 or parts[1] >= today
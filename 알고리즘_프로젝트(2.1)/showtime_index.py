@@ -0,0 +1,53 @@
+# ShowtimeIndex 클래스: (영화 ID, 날짜, 시간) -> 좌석 맵 색인
+# 화면에서는 키 하나로 바로 좌석 맵을 꺼낸다(O(1)). 좌석 맵은 그 날짜가 처음 조회될 때 만들어 넣는다.
+# 영화별/날짜별 키 목록도 같이 두어 영화를 고치거나 지울 때, 지난 날짜를 비울 때 해당 회차만 정리한다.
+class ShowtimeIndex:
+    def __init__(self):
+        self.seat_maps = {}  # (영화 ID, 날짜, 시간) -> SeatMap
+        self.by_movie = {}  # 영화 ID -> 그 영화의 (날짜, 시간) 집합
+        self.by_date = {}  # 날짜 -> 그 날짜의 (영화 ID, 시간) 집합
+
+    def __len__(self):
+        return len(self.seat_maps)
+
+    def get(self, movie_id, date, time):
+        return self.seat_maps.get((movie_id, date, time))
+
+    def add(self, movie_id, date, time, seat_map):
+        self.seat_maps[(movie_id, date, time)] = seat_map
+        self.by_movie.setdefault(movie_id, set()).add((date, time))
+        self.by_date.setdefault(date, set()).add((movie_id, time))
+
+    def remove(self, movie_id, date, time):
+        seat_map = self.seat_maps.pop((movie_id, date, time), None)
+        _discard(self.by_movie, movie_id, (date, time))
+        _discard(self.by_date, date, (movie_id, time))
+        return seat_map
+
+    # 영화의 회차 목록: (날짜, 시간, 좌석 맵)
+    def showings(self, movie_id):
+        return [(date, time, self.seat_maps[(movie_id, date, time)])
+                for date, time in sorted(self.by_movie.get(movie_id, ()))]
+
+    def remove_movie(self, movie_id):
+        for date, time in self.by_movie.pop(movie_id, ()):
+            del self.seat_maps[(movie_id, date, time)]
+            _discard(self.by_date, date, (movie_id, time))
+
+    # date보다 이전 날짜의 회차를 모두 빼고 빠진 좌석 맵 목록을 돌려줌
+    # 날짜는 'YYYY-MM-DD' 문자열이라 문자열 비교가 곧 날짜 비교
+    def evict_before(self, date):
+        evicted = []
+        for past in [day for day in self.by_date if day < date]:
+            for movie_id, time in self.by_date.pop(past):
+                evicted.append(self.seat_maps.pop((movie_id, past, time)))
+                _discard(self.by_movie, movie_id, (past, time))
+        return evicted
+
+
+def _discard(groups, key, member):
+    group = groups.get(key)
+    if group is not None:
+        group.discard(member)
+        if not group:
+            del groups[key]
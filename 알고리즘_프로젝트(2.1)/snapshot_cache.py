@@ -0,0 +1,71 @@
+import contextlib
+import gc
+import marshal
+import os
+
+# SnapshotCache 클래스: 텍스트 파일을 읽어 만든 결과를 marshal 바이너리로 저장해 두는 캐시 파일
+# 원본 파일의 (크기, 수정 시각)과 형식 버전을 같이 저장하고, 원본이 바뀌었거나 버전이 다르면 없는 것으로 본다.
+# 캐시는 언제 지워져도 되는 파일이라 fsync하지 않고, 읽다가 깨져 있으면 역시 없는 것으로 본다.
+# payload는 marshal이 저장할 수 있는 기본 자료형(숫자, 문자열, list, tuple, dict)만 쓴다.
+class SnapshotCache:
+    MAGIC = b"SNAPC001"
+
+    def __init__(self, cache_path, source_path, version):
+        self.cache_path = cache_path
+        self.source_path = source_path
+        self.version = version
+
+    # 원본 파일의 (크기, 수정 시각), 없으면 None
+    def stamp(self):
+        try:
+            stat = os.stat(self.source_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_size, stat.st_mtime_ns)
+
+    # 저장해 둔 payload, 캐시가 없거나 원본과 맞지 않으면 None
+    def load(self):
+        try:
+            with open(self.cache_path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return None
+        if not data.startswith(self.MAGIC):
+            return None
+        try:
+            version, stamp, payload = marshal.loads(memoryview(data)[len(self.MAGIC):])
+        except (EOFError, ValueError, TypeError):
+            return None
+        if version != self.version or stamp != self.stamp():
+            return None
+        return payload
+
+    # 원본 파일의 지금 상태를 나타내는 payload를 저장 (임시 파일에 쓴 뒤 교체)
+    def save(self, payload):
+        temp_path = self.cache_path + ".tmp"
+        with open(temp_path, "wb") as file:
+            file.write(self.MAGIC)
+            marshal.dump((self.version, self.stamp(), payload), file)
+        os.replace(temp_path, self.cache_path)
+
+    # 원본을 고쳐 쓰기 전에 호출. 같은 크기로 같은 시각 안에 바뀌어도 옛 캐시를 쓰지 않도록 지움
+    def invalidate(self):
+        try:
+            os.remove(self.cache_path)
+        except FileNotFoundError:
+            pass
+
+
+# 영화/회원처럼 많은 객체를 한꺼번에 만드는 동안 순환 GC를 멈춤
+# (만들어지는 객체 수에 따라 GC가 계속 돌며 이미 만든 객체를 다시 훑는 시간이 불러오기보다 길다)
+# 끝나면 gc.freeze로 불러온 객체를 영구 세대로 옮겨, 프로그램이 끝날 때까지 살아 있을 객체를 이후 수집에서 건너뛴다.
+@contextlib.contextmanager
+def bulk_load():
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.freeze()
+            gc.enable()
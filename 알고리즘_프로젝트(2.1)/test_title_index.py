@@ -0,0 +1,26 @@
+from booking_system import Movie
+from title_index import TitleIndex
+
+
+def make_index(*titles):
+    return TitleIndex([Movie(title, ["10:00"], "1관", "ALL") for title in titles])
+
+
+def titles(movies):
+    return [movie.title for movie in movies]
+
+
+def test_complete_syllable_does_not_match_across_syllables():
+    index = make_index("저음", "정글", "가고")
+    assert titles(index.search("정")) == ["정글"]
+    assert titles(index.search("각")) == []
+    assert titles(index.prefix("정")) == ["정글"]
+
+
+def test_last_syllable_matches_while_typing():
+    index = make_index("과제싫어", "저음", "정글")
+    assert titles(index.search("과ㅈ")) == ["과제싫어"]
+    assert titles(index.search("저")) == ["저음", "정글"]  # "정"을 입력하는 도중
+    assert titles(index.search("제싫")) == ["과제싫어"]
+    assert titles(index.prefix("과제시")) == ["과제싫어"]
+    assert titles(index.search("음")) == ["저음"]
@@ -0,0 +1,144 @@
+import bisect
+
+# 한글 음절을 자모로 분해하기 위한 표 (호환 자모)
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = ["ㅏ", "ㅐ", "ㅑ", "ㅒ", "ㅓ", "ㅔ", "ㅕ", "ㅖ", "ㅗ", "ㅗㅏ", "ㅗㅐ", "ㅗㅣ", "ㅛ", "ㅜ",
+             "ㅜㅓ", "ㅜㅔ", "ㅜㅣ", "ㅠ", "ㅡ", "ㅡㅣ", "ㅣ"]
+JONGSEONG = ["", "ㄱ", "ㄲ", "ㄱㅅ", "ㄴ", "ㄴㅈ", "ㄴㅎ", "ㄷ", "ㄹ", "ㄹㄱ", "ㄹㅁ", "ㄹㅂ", "ㄹㅅ", "ㄹㅌ",
+             "ㄹㅍ", "ㄹㅎ", "ㅁ", "ㅂ", "ㅂㅅ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+# 겹모음/겹받침을 단독으로 입력했을 때도 같은 자모열로 맞춤
+COMPOUND_JAMO = {"ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+                 "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+                 "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ"}
+
+
+# 검색용 문자열: 소문자로 바꾸고 한글 음절은 자모 단위로 풀어 씀
+# 예) "과제" -> "ㄱㅗㅏㅈㅔ", 그래서 입력 중인 "과ㅈ"도 "과제"와 일치한다
+def to_jamo(text):
+    result = []
+    for char in text.lower():
+        code = ord(char) - 0xAC00
+        if 0 <= code < 11172:
+            result.append(CHOSEONG[code // 588])
+            result.append(JUNGSEONG[(code % 588) // 28])
+            result.append(JONGSEONG[code % 28])
+        else:
+            result.append(COMPOUND_JAMO.get(char, char))
+    return "".join(result)
+
+
+# TitleIndex 클래스: 영화 제목 n-gram(1~3글자, 자모 단위) 역색인 + 정렬된 제목 목록
+# 부분 문자열 검색은 질의의 3-gram 목록 교집합으로 후보를 줄이고,
+# 접두어 검색은 정렬된 제목 목록에서 이진 탐색으로 구간만 읽는다.
+# 자모열만 보면 "정"이 "저음"의 "저"+"ㅇ"에도 맞으므로, 후보는 음절 단위로 다시 확인한다(matches_at).
+# 영화 추가/수정/삭제 때 그 영화의 n-gram만 갱신한다.
+class TitleIndex:
+    MAX_GRAM = 3
+
+    def __init__(self, movies=None):
+        self.postings = {}  # n-gram -> 그 n-gram을 포함한 영화 집합
+        self.keys = {}  # 영화 -> 색인에 들어간 검색용 제목
+        self.sorted_keys = []  # (검색용 제목, 순번) 정렬 목록
+        self.sorted_movies = []  # sorted_keys와 같은 순서의 영화
+        self._serial = 0
+        self.serials = {}  # 영화 -> 순번 (같은 제목끼리 순서 구분)
+        for movie in movies or []:
+            self.add(movie)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, movie):
+        key = to_jamo(movie.title)
+        self.keys[movie] = key
+        for gram in grams(key, self.MAX_GRAM):
+            self.postings.setdefault(gram, set()).add(movie)
+        self._serial += 1
+        self.serials[movie] = self._serial
+        position = bisect.bisect_left(self.sorted_keys, (key, self._serial))
+        self.sorted_keys.insert(position, (key, self._serial))
+        self.sorted_movies.insert(position, movie)
+
+    def remove(self, movie):
+        key = self.keys.pop(movie, None)
+        if key is None:
+            return
+        for gram in grams(key, self.MAX_GRAM):
+            posting = self.postings.get(gram)
+            if posting is not None:
+                posting.discard(movie)
+                if not posting:
+                    del self.postings[gram]
+        position = bisect.bisect_left(self.sorted_keys, (key, self.serials.pop(movie)))
+        del self.sorted_keys[position]
+        del self.sorted_movies[position]
+
+    # 제목이 바뀐 영화를 다시 색인
+    def update(self, movie):
+        if self.keys.get(movie) != to_jamo(movie.title):
+            self.remove(movie)
+            self.add(movie)
+
+    # 제목에 text가 들어 있는 영화 (제목 순)
+    # n-gram 색인으로 자모열이 들어 있는 후보만 고른 뒤, 음절 단위로 다시 확인한다 (matches_at)
+    def search(self, text):
+        text = text.strip()
+        query = to_jamo(text)
+        if not query:
+            return list(self.sorted_movies)
+        if len(query) <= self.MAX_GRAM:
+            candidates = self.postings.get(query, set())
+        else:
+            postings = [self.postings.get(query[i:i + self.MAX_GRAM]) for i in range(len(query) - self.MAX_GRAM + 1)]
+            if any(posting is None for posting in postings):
+                return []
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                candidates &= posting
+                if not candidates:
+                    return []
+        units = jamo_units(text)
+        return sorted((movie for movie in candidates if contains(movie.title, units)), key=lambda movie: movie.title)
+
+    # 제목이 text로 시작하는 영화 (제목 순)
+    def prefix(self, text):
+        text = text.strip()
+        query = to_jamo(text)
+        start = bisect.bisect_left(self.sorted_keys, (query,))
+        end = start
+        while end < len(self.sorted_keys) and self.sorted_keys[end][0].startswith(query):
+            end += 1
+        units = jamo_units(text)
+        return [movie for movie in self.sorted_movies[start:end] if not units or matches_at(jamo_units(movie.title), units, 0)]
+
+
+# 글자 하나씩 자모로 푼 목록 ("과제" -> ["ㄱㅗㅏ", "ㅈㅔ"])
+def jamo_units(text):
+    return [to_jamo(char) for char in text]
+
+
+# 제목 글자들의 position부터 질의와 일치하는지
+# 마지막 글자 앞까지는 음절이 그대로 같아야 하고, 입력 중일 수 있는 마지막 글자만 그 자리 음절의 앞부분(자모)과 맞으면 된다.
+# 예) "과ㅈ"는 "과제"와 일치, "정"은 "저음"(ㅈㅓ|ㅇㅡㅁ)과 일치하지 않음
+def matches_at(units, query, position):
+    last = len(query) - 1
+    if position + last >= len(units):
+        return False
+    for i in range(last):
+        if units[position + i] != query[i]:
+            return False
+    return units[position + last].startswith(query[last])
+
+
+def contains(title, query):
+    units = jamo_units(title)
+    return any(matches_at(units, query, position) for position in range(len(units) - len(query) + 1))
+
+
+def grams(key, max_gram):
+    found = set()
+    for n in range(1, max_gram + 1):
+        for i in range(len(key) - n + 1):
+            found.add(key[i:i + n])
+    return found
@@ -0,0 +1,103 @@
+import tkinter as tk
+from tkinter import ttk
+
+# VirtualList 클래스: 행이 아주 많은 목록에서 화면에 보이는 줄만 Listbox에 그리는 위젯
+# rows는 len()과 rows[i]만 되면 된다(MovieCatalog, ContactStore, list). 보이는 줄의 행만 꺼내 format_row로 글자를 만든다.
+# 스크롤하거나 목록이 바뀌면 지금 그려진 글자와 비교해 달라진 줄만 고쳐 쓴다.
+# curselection()은 tk.Listbox처럼 선택된 행 번호를 돌려주되, 보이는 칸이 아니라 목록 전체 기준이다.
+class VirtualList(ttk.Frame):
+    def __init__(self, master, rows, format_row=str, height=10, width=40):
+        super().__init__(master)
+        self.rows = rows
+        self.format_row = format_row
+        self.height = height
+        self.top = 0  # 맨 위에 보이는 행 번호
+        self.selected = None  # 선택된 행 번호 (목록 전체 기준)
+        self.lines = []  # 지금 Listbox에 그려진 글자
+
+        self.listbox = tk.Listbox(self, height=height, width=width, exportselection=False)
+        self.listbox.grid(row=0, column=0, sticky='nsew')
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.grid(row=0, column=1, sticky='ns')
+
+        self.listbox.bind("<<ListboxSelect>>", self.on_select)
+        self.listbox.bind("<MouseWheel>", self.on_wheel)  # Windows/macOS
+        self.listbox.bind("<Button-4>", self.on_wheel)  # X11 위로
+        self.listbox.bind("<Button-5>", self.on_wheel)  # X11 아래로
+        self.listbox.bind("<Up>", lambda event: self.move_selection(-1))
+        self.listbox.bind("<Down>", lambda event: self.move_selection(1))
+        self.refresh()
+
+    # 목록을 바꿈(검색 결과 등). 선택은 풀고, 같은 목록이면 보던 위치를 유지
+    def set_rows(self, rows):
+        if rows is not self.rows:
+            self.top = 0
+        self.rows = rows
+        self.selected = None
+        self.refresh()
+
+    def scroll_to(self, top):
+        self.top = top
+        self.refresh()
+
+    # 보이는 줄만 다시 만들어 이전과 다른 줄만 Listbox에 반영
+    def refresh(self):
+        count = len(self.rows)
+        self.top = max(0, min(self.top, count - self.height))
+        end = min(count, self.top + self.height)
+        lines = [self.format_row(self.rows[index]) for index in range(self.top, end)]
+        for position, line in enumerate(lines):
+            if position < len(self.lines):
+                if self.lines[position] == line:
+                    continue
+                self.listbox.delete(position)
+            self.listbox.insert(position, line)
+        if len(self.lines) > len(lines):
+            self.listbox.delete(len(lines), tk.END)
+        self.lines = lines
+
+        self.listbox.selection_clear(0, tk.END)
+        if self.selected is not None and self.top <= self.selected < end:
+            self.listbox.selection_set(self.selected - self.top)
+        if count:
+            self.scrollbar.set(self.top / count, end / count)
+        else:
+            self.scrollbar.set(0, 1)
+
+    # 스크롤바가 보내는 명령: ("moveto", 비율) 또는 ("scroll", 칸 수, "units"/"pages")
+    def yview(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * len(self.rows)))
+        elif action == "scroll":
+            step = self.height if unit == "pages" else 1
+            self.scroll_to(self.top + int(amount) * step)
+
+    def on_wheel(self, event):
+        up = event.num == 4 or event.delta > 0
+        self.scroll_to(self.top - 3 if up else self.top + 3)
+        return "break"
+
+    def on_select(self, event):
+        selection = self.listbox.curselection()
+        if selection:
+            self.selected = self.top + selection[0]
+
+    # 방향키로 선택을 옮기고, 보이는 칸을 벗어나면 그만큼 스크롤
+    def move_selection(self, step):
+        if len(self.rows) == 0:
+            return "break"
+        if self.selected is None:
+            self.selected = self.top
+        else:
+            self.selected = max(0, min(len(self.rows) - 1, self.selected + step))
+        if self.selected < self.top:
+            self.top = self.selected
+        elif self.selected >= self.top + self.height:
+            self.top = self.selected - self.height + 1
+        self.refresh()
+        return "break"
+
+    def curselection(self):
+        if self.selected is None or self.selected >= len(self.rows):
+            return ()
+        return (self.selected,)
@@ -3,6 +3,12 @@ import tkinter as tk
 from tkinter import messagebox, simpledialog, ttk
 import datetime
 import re
+from contact_store import ContactStore
+from title_index import TitleIndex
+from movie_catalog import MovieCatalog
+from movie_store import MovieFile, parse_movie_records
+from password_hash import hash_password, needs_rehash, verify_password
+from reservation_index import ReservationIndex
 
 # Contact 클래스: 연락처 정보를 저장
 class Contact:
@@ -10,9 +16,22 @@ class Contact:
         self.phone_number = phone_number
         self.password = password
         self.reservations = reservations if reservations is not None else []
+        self.reservation_index = ReservationIndex(self.reservations)  # (영화, 날짜, 시간) 순 색인
+
+    def add_reservation(self, reservation):
+        self.reservations.append(reservation)
+        self.reservation_index.add(reservation)
+
+    def remove_reservation(self, reservation):
+        for i in range(len(self.reservations) - 1, -1, -1):
+            if self.reservations[i] is reservation:
+                del self.reservations[i]
+                self.reservation_index.remove(reservation)
+                return True
+        return False
 
     def print_info(self):
-        return f"전화번호: {self.phone_number}, 비밀번호: {self.password}\n"
+        return f"전화번호: {self.phone_number}, 예매 {len(self.reservations)}건\n"
 
 # Movie 클래스: 영화 정보를 저장
 class Movie:
@@ -29,6 +48,7 @@ class Movie:
             'E1', 'E2', 'E3', 'E4', 'E5', 'E6',
             'F1', 'F2', 'F3', 'F4', 'F5', 'F6'
         ] for time in self.times}
+        self.record_id = None  # movies.txt 안의 레코드 ID (MovieFile)
 
     def to_string(self):
         return f"{self.title},{';'.join(self.times)},{self.theater},{self.age_limit}"
@@ -36,38 +56,22 @@ class Movie:
 # BookingSystem 클래스: 영화 예매 시스템의 핵심 로직
 class BookingSystem:
     def __init__(self, file_path):
-        self.movies = []
+        self.movies = MovieCatalog()  # 항상 제목 순으로 정렬된 상태 유지
         self.file_path = file_path
+        self.movie_file = MovieFile(file_path)  # 최종(3).py와 같은 칸 형식 파일
         self.admin_password = "123"
         self.ticket_prices = {'성인': 18000, '청소년': 15000, '어린이': 10000}  # 가격 정보 추가
         self.load_movies()
-        self.sort_movies()
+        self.title_index = TitleIndex(self.movies)
 
+    # movies.txt를 MovieFile로 읽음 (빈 칸 줄은 MovieFile이 건너뛰고, 형식이 틀린 줄은 parse_movie_records가 건너뜀)
     def load_movies(self):
-        if os.path.exists(self.file_path):
-            with open(self.file_path, "r", encoding="utf-8") as file:
-                for line in file:
-                    parts = line.strip().split(',')
-                    title = parts[0]
-                    times = parts[1].split(',')
-                    theater = parts[2]
-                    age_limit = parts[3]
-                    self.movies.append(Movie(title, times, theater, age_limit))
-
-    def save_movies(self):
-        with open(self.file_path, "w", encoding="utf-8") as file:
-            for movie in self.movies:
-                file.write(f"{movie.to_string()}\n")
-
-    def sort_movies(self):
-        # 삽입 정렬 알고리즘으로 영화 목록 정렬
-        for i in range(1, len(self.movies)):
-            key_movie = self.movies[i]
-            j = i - 1
-            while j >= 0 and key_movie.title < self.movies[j].title:
-                self.movies[j + 1] = self.movies[j]
-                j -= 1
-            self.movies[j + 1] = key_movie
+        movies = []
+        for record_id, title, times, theater, age_limit in parse_movie_records(self.movie_file.load()):
+            movie = Movie(title, times, theater, age_limit)
+            movie.record_id = record_id
+            movies.append(movie)
+        self.movies = MovieCatalog(movies)
 
     def display_movies(self):
         movies_list = ""
@@ -75,38 +79,42 @@ class BookingSystem:
             movies_list += f"{idx + 1}. {movie.title} ({movie.age_limit})\n"
         return movies_list
 
-    def linear_search_movie_by_name(self, name):
-        # 선형 검색 알고리즘을 사용하여 영화 제목으로 영화 검색
-        found_movies = []
-        for movie in self.movies:
-            if name.lower() in movie.title.lower():
-                found_movies.append(movie)
-        return found_movies
+    def search_movie_by_name(self, name):
+        # 선형 검색 대신 제목 n-gram 색인으로 검색 (자모 단위로 입력 중인 글자도 일치)
+        return self.title_index.search(name)
+
+    def add_movie(self, movie):
+        self.movies.add(movie)  # 이진 탐색으로 제자리에 삽입
+        self.title_index.add(movie)
+        movie.record_id = self.movie_file.insert(movie.to_string())
 
     def edit_movie(self, idx, new_title, new_times, new_theater, new_age_limit):
         if 0 <= idx < len(self.movies):
-            self.movies[idx].title = new_title
-            self.movies[idx].times = new_times
-            self.movies[idx].theater = new_theater
-            self.movies[idx].age_limit = new_age_limit
-            self.sort_movies()
-            self.save_movies()
+            movie = self.movies[idx]
+            self.movies.rekey(movie, new_title)  # 제목이 바뀐 영화만 정렬 위치를 옮김
+            movie.times = new_times
+            movie.theater = new_theater
+            movie.age_limit = new_age_limit
+            self.title_index.update(movie)
+            movie.record_id = self.movie_file.update(movie.record_id, movie.to_string())  # 이 영화의 칸만 고쳐 씀
             return True
         return False
 
     def delete_movie(self, idx):
         if 0 <= idx < len(self.movies):
-            del self.movies[idx]
-            self.save_movies()
+            movie = self.movies[idx]
+            self.title_index.remove(movie)
+            self.movies.remove(movie)
+            self.movie_file.delete(movie.record_id)
             return True
         return False
 
 # Application 클래스: Tkinter를 사용한 애플리케이션의 GUI
 class Application(tk.Tk):
-    def __init__(self, booking_system, contact_list):
+    def __init__(self, booking_system, contact_store):
         super().__init__()
         self.booking_system = booking_system
-        self.contact_list = contact_list
+        self.contact_store = contact_store
         self.title("영화 예매 및 연락처 관리 시스템")
 
         self.main_frame = ttk.Frame(self)
@@ -158,7 +166,6 @@ class Application(tk.Tk):
         ttk.Button(self.main_frame, text="뒤로", command=self.admin_panel).grid(row=4, column=0, pady=5)
 
     def update_movie_list(self):
-        self.booking_system.sort_movies()
         self.movies_listbox.delete(0, tk.END)
         for movie in self.booking_system.movies:
             self.movies_listbox.insert(tk.END, movie.title)
@@ -179,9 +186,7 @@ class Application(tk.Tk):
         new_theater = simpledialog.askstring("영화 추가", "새 영화 상영관을 입력하세요:")
         new_age_limit = simpledialog.askstring("영화 추가", "새 영화 연령 제한을 입력하세요:")
         new_movie = Movie(new_title, new_times, new_theater, new_age_limit)
-        self.booking_system.movies.append(new_movie)
-        self.booking_system.sort_movies()
-        self.booking_system.save_movies()
+        self.booking_system.add_movie(new_movie)
         self.update_movie_list()
         messagebox.showinfo("성공", "영화가 성공적으로 추가되었습니다")
 
@@ -199,7 +204,7 @@ class Application(tk.Tk):
         search_button.pack(pady=5)
 
     def search_movies(self, name, search_window):
-        found_movies = self.booking_system.linear_search_movie_by_name(name)
+        found_movies = self.booking_system.search_movie_by_name(name)
         if found_movies:
             movies_list = "\n".join([f"{idx + 1}. {movie.title} ({movie.age_limit})" for idx, movie in enumerate(found_movies)])
             movies_label = tk.Label(search_window, text=movies_list)
@@ -291,7 +296,7 @@ class Application(tk.Tk):
     def on_add_contact(self):
         contact = self.set_contact()
         if contact:
-            self.contact_list.append(contact)
+            self.contact_store.add(contact)
             self.save_contacts_to_file()
             self.refresh_listbox(self.contact_listbox)
 
@@ -318,7 +323,7 @@ class Application(tk.Tk):
 
     def refresh_listbox(self, listbox):
         listbox.delete(0, tk.END)
-        for contact in self.contact_list:
+        for contact in self.contact_store.sorted_contacts():
             listbox.insert(tk.END, contact.print_info())
 
     def on_home(self):
@@ -377,12 +382,12 @@ class Application(tk.Tk):
             messagebox.showerror("오류", "비밀번호가 일치하지 않습니다. 다시 입력하세요.")
             return
         
-        if phone_number in [contact.phone_number for contact in self.contact_list]: #contact에 있는 번호 검사
+        if phone_number in self.contact_store: #contact에 있는 번호 검사
             messagebox.showerror("오류", "이미 가입된 전화번호입니다.")
             return
         
-        new_contact = Contact(phone_number, password)
-        self.contact_list.append(new_contact)
+        new_contact = Contact(phone_number, hash_password(password))  # 비밀번호는 해시로만 저장
+        self.contact_store.add(new_contact)
         self.save_contacts_to_file() # 영화 예약 정보 저장파일
         messagebox.showinfo("가입 완료", "회원가입이 완료되었습니다.")
         self.login_frame()
@@ -391,11 +396,14 @@ class Application(tk.Tk):
         phone_number = self.phone_entry.get()
         password = self.password_entry.get()
         
-        for contact in self.contact_list: 
-            if contact.phone_number == phone_number and contact.password == password: # 전화번호와 비밀번호가 일치하면 로그인
-                self.current_user = contact
-                self.user_main_menu()
-                return
+        contact = self.contact_store.get(phone_number)
+        if contact is not None and verify_password(contact.password, password): # 전화번호와 비밀번호가 일치하면 로그인
+            if needs_rehash(contact.password): # 예전 파일의 평문 비밀번호는 해시로 바꿔 저장
+                contact.password = hash_password(password)
+                self.save_contacts_to_file()
+            self.current_user = contact
+            self.user_main_menu()
+            return
         messagebox.showerror("오류", "전화번호 또는 비밀번호가 올바르지 않습니다.")
         
     def user_main_menu(self):
@@ -515,13 +523,16 @@ class Application(tk.Tk):
         ttk.Label(self.main_frame, text="스크린").grid(row=1, column=0, columnspan=6, pady=5)
 
         self.seat_buttons = []
+        self.seat_vars = {}  # 좌석 -> 체크 상태 IntVar (버튼마다 변수를 직접 두어 화면에 보이는 상태와 선택 목록을 맞춤)
         self.selected_seats = []
         try:
             selected_time_key = self.selected_time
             for i, seat in enumerate(self.selected_movie.seats[selected_time_key]):
                 row = i // 6
                 col = i % 6
-                seat_button = ttk.Checkbutton(self.main_frame, text=seat, command=lambda s=seat: self.toggle_seat(s))
+                self.seat_vars[seat] = tk.IntVar(value=0)
+                seat_button = ttk.Checkbutton(self.main_frame, text=seat, variable=self.seat_vars[seat],
+                                              command=lambda s=seat: self.toggle_seat(s))
                 seat_button.grid(row=row+2, column=col, padx=5, pady=5)
                 self.seat_buttons.append(seat_button)
         except KeyError as e:
@@ -538,7 +549,8 @@ class Application(tk.Tk):
             if len(self.selected_seats) < sum(self.age_groups.values()):
                 self.selected_seats.append(seat)
             else:
-               messagebox.showerror("오류", "선택한 좌석 수가 인원 수를 초과했습니다.")
+                self.seat_vars[seat].set(0)  # 선택되지 않은 좌석이 체크된 채로 남지 않도록
+                messagebox.showerror("오류", "선택한 좌석 수가 인원 수를 초과했습니다.")
     
     def save_seat(self):
         if len(self.selected_seats) == sum(self.age_groups.values()):
@@ -580,7 +592,7 @@ class Application(tk.Tk):
             "총액": total_cost
         }
 
-        self.current_user.reservations.append(reservation_info)
+        self.current_user.add_reservation(reservation_info)
         self.save_contacts_to_file()
 
         age_groups_str = ", ".join([f"{k} {v}명" for k, v in self.age_groups.items() if v > 0])
@@ -607,112 +619,96 @@ class Application(tk.Tk):
         self.user_main_menu()
     
     def cancel_reservation(self):
-        self.current_user.reservations.pop()
+        self.current_user.remove_reservation(self.current_user.reservations[-1])
         self.save_contacts_to_file()
         messagebox.showinfo("예약 취소", "예약이 취소되었습니다.")
         self.user_main_menu()
     
-    def binary_search(self, reservations, movie_title):
-        low = 0
-        high = len(reservations) - 1
-
-        while low <= high:
-            mid = (low + high) // 2
-            if reservations[mid]['영화'] == movie_title:
-                return mid
-            elif reservations[mid]['영화'] < movie_title:
-                low = mid + 1
-            else:
-                high = mid - 1
-
-        return -1
-
-    def view_reservations(self):
+    # 예매 내역을 (영화, 날짜, 시간) 순으로 한 쪽에 page_size개씩 보여 줌. movie를 주면 그 영화만
+    def view_reservations(self, page=0, movie=None):
         for widget in self.main_frame.winfo_children():
             widget.destroy()
         self.main_frame.grid(row=0, column=0, padx=10, pady=10)
 
-        if not self.current_user.reservations:
-            ttk.Label(self.main_frame, text="예매 내역이 없습니다.").grid(row=0, column=0, pady=10)
+        page_size = 5
+        reservations = self.current_user.reservation_index.range(movie)
+        row_index = 0
+        if not reservations:
+            message = "예매 내역이 없습니다." if movie is None else "해당 영화를 찾을 수 없습니다."
+            ttk.Label(self.main_frame, text=message).grid(row=0, column=0, columnspan=2, pady=10)
+            row_index = 1
+        else:
+            page_count = (len(reservations) + page_size - 1) // page_size
+            page = max(0, min(page, page_count - 1))
+            first = page * page_size
+            for i, reservation in enumerate(reservations[first:first + page_size]):
+                age_groups_str = ", ".join([f"{k} {v}명" for k, v in reservation['연령대'].items() if v > 0])
+                reservation_details = (
+                    f"{first + i + 1}. 영화: {reservation['영화']}\n"
+                    f"날짜: {reservation['날짜']}\n"
+                    f"시간: {reservation['시간']}\n"
+                    f"좌석: {', '.join(reservation['좌석'])}\n"
+                    f"연령대: {age_groups_str}\n"
+                    f"총액: {reservation['총액']}원\n"
+                    f"결제 방법: {reservation.get('결제 방법', 'N/A')}\n"
+                )
+                ttk.Label(self.main_frame, text=reservation_details).grid(row=row_index, column=0, columnspan=2, pady=10)
+                row_index += 1
+
+            ttk.Label(self.main_frame, text=f"{page + 1} / {page_count}").grid(row=row_index, column=0, columnspan=2, pady=5)
+            row_index += 1
+            if page > 0:
+                ttk.Button(self.main_frame, text="이전", command=lambda: self.view_reservations(page - 1, movie)).grid(row=row_index, column=0, pady=5)
+            if page < page_count - 1:
+                ttk.Button(self.main_frame, text="다음", command=lambda: self.view_reservations(page + 1, movie)).grid(row=row_index, column=1, pady=5)
+            row_index += 1
+
+        if movie is None:
+            ttk.Button(self.main_frame, text="영화로 찾기", command=self.search_reservations_by_movie).grid(row=row_index, column=0, columnspan=2, pady=5)
         else:
-            self.current_user.reservations.sort(key=lambda x: x['영화'])  # 영화 제목으로 정렬
-            row_index = 0
-            found_any_movie = False  # 영화를 찾았는지 여부를 추적
-
-            for reservation in self.current_user.reservations:
-                movie_title = reservation['영화']
-                movie_index = self.binary_search(self.current_user.reservations, movie_title)
-                if movie_index != -1:
-                    found_any_movie = True
-                    reservation = self.current_user.reservations[movie_index]
-                    age_groups_str = ", ".join([f"{k} {v}명" for k, v in reservation['연령대'].items() if v > 0])
-                    reservation_details = (
-                        f"영화: {reservation['영화']}\n"
-                        f"날짜: {reservation['날짜']}\n"
-                        f"시간: {reservation['시간']}\n"
-                        f"좌석: {', '.join(reservation['좌석'])}\n"
-                        f"연령대: {age_groups_str}\n"
-                        f"총액: {reservation['총액']}원\n"
-                        f"결제 방법: {reservation.get('결제 방법', 'N/A')}\n"
-                    )
-                    ttk.Label(self.main_frame, text=reservation_details).grid(row=row_index, column=0, pady=10)
-                    row_index += 1
-
-            if not found_any_movie:
-                ttk.Label(self.main_frame, text="해당 영화를 찾을 수 없습니다.").grid(row=row_index, column=0, pady=10)
-
-        ttk.Button(self.main_frame, text="뒤로", command=self.user_main_menu).grid(row=row_index+1, column=0, pady=10)
-
-
-    def linear_search_reservations_by_movie(self, reservations):
-        search_term = simpledialog.askstring("검색", "검색할 영화 제목을 입력하세요:")
-        if search_term is None:  # 사용자가 검색어 입력을 취소한 경우
-            return []
-        
-        found_reservations = []
-        for reservation in reservations:
-            if search_term.lower() in reservation['영화'].lower():
-                found_reservations.append(reservation)
-        return found_reservations
+            ttk.Button(self.main_frame, text="전체 보기", command=self.view_reservations).grid(row=row_index, column=0, columnspan=2, pady=5)
+        ttk.Button(self.main_frame, text="뒤로", command=self.user_main_menu).grid(row=row_index + 1, column=0, columnspan=2, pady=10)
+
+    def search_reservations_by_movie(self):
+        movie = simpledialog.askstring("검색", "검색할 영화 제목을 입력하세요:")
+        if movie:
+            self.view_reservations(0, movie.strip())
 
     def set_contact(self): # 전화번호, 비밀번호 저장(추가)
         phone_number = simpledialog.askstring("Input", "전화번호:")
         password = simpledialog.askstring("Input", "비밀번호:")
         if phone_number and password: #
-            for contact in self.contact_list:
-                if contact.phone_number == phone_number: # 기존 전화번호와 new전화번호 비교
-                    messagebox.showerror("Error", "이미 가입된 사용자입니다.")
-                    return None
-            return Contact(phone_number, password)
+            if phone_number in self.contact_store: # 기존 전화번호와 new전화번호 비교
+                messagebox.showerror("Error", "이미 가입된 사용자입니다.")
+                return None
+            return Contact(phone_number, hash_password(password))
         return None
 
     def delete_contact(self, phone_number):# 관리자(사용자의 전화번호 삭제)
-        for i, contact in enumerate(self.contact_list):
-            if contact.phone_number == phone_number:
-                del self.contact_list[i]
-                self.save_contacts_to_file()
-                messagebox.showinfo("Deleted", f"[삭제] 전화번호: {phone_number}")
-                return
+        if self.contact_store.remove(phone_number) is not None:
+            self.save_contacts_to_file()
+            messagebox.showinfo("Deleted", f"[삭제] 전화번호: {phone_number}")
+            return
         messagebox.showerror("Error", f"일치하는 연락처를 찾을 수 없습니다: {phone_number}")
 
     def search_contact(self, phone_number): #관리자(사용자의 전화번호 검색)
-        found_contacts = sorted([contact for contact in self.contact_list if phone_number in contact.phone_number], key=lambda x: x.phone_number)
+        found_contacts = self.contact_store.search(phone_number)
         self.contact_listbox.delete(0, tk.END)
         for contact in found_contacts:
             self.contact_listbox.insert(tk.END, contact.print_info())
 
     def update_contact(self, phone_number, new_password): # 관리자(사용자의 전화번호, 비밀번호 수정)
-        for contact in self.contact_list:
-            if contact.phone_number == phone_number:
-                contact.password = new_password
-                self.save_contacts_to_file()
-                messagebox.showinfo("Updated", f"[수정] 전화번호: {phone_number}, 새로운 비밀번호: {new_password}")
-                return
+        contact = self.contact_store.get(phone_number)
+        if contact is not None:
+            contact.password = hash_password(new_password)
+            self.save_contacts_to_file()
+            messagebox.showinfo("Updated", f"[수정] 전화번호: {phone_number}, 비밀번호가 변경되었습니다.")
+            return
         messagebox.showerror("Error", "일치하는 연락처를 찾을 수 없습니다.")
 
     def save_contacts_to_file(self, filename=r"C:\Users\LG\Desktop\reservations.txt"):# 회원 정보를 파일에 저장
         with open(filename, "w", encoding="utf-8") as file:
-            for contact in self.contact_list:
+            for contact in self.contact_store.sorted_contacts():
                 reservations = repr(contact.reservations)
                 file.write(f"{contact.phone_number}|{contact.password}|{reservations}\n")
 
@@ -720,22 +716,22 @@ class Application(tk.Tk):
         if os.path.exists(filename): # 파일이 존재하는지 확인
             with open(filename, "r", encoding="utf-8") as file: #존재하면 파일을 열어서 정보를 불러옴
                 lines = file.readlines()
-                self.contact_list.clear() #회원정보 변환후 contact_list에 추가
+                contacts = [] #회원정보 변환후 contact_store에 추가
                 for line in lines:
                     parts = line.strip().split('|')
                     if len(parts) == 3:
                         phone_number = parts[0]
                         password = parts[1]
                         reservations = eval(parts[2])
-                        self.contact_list.append(Contact(phone_number, password, reservations)) 
-                        # contact_list를 전화번호 순으로 정렬
-                self.contact_list.sort(key=lambda x: x.phone_number)
+                        contacts.append(Contact(phone_number, password, reservations))
+                # 전화번호 순 정렬은 contact_store가 필요할 때 한 번만 수행
+                self.contact_store.replace_all(contacts)
         else:
             messagebox.showerror("Error", "저장된 연락처 파일을 찾을 수 없습니다.")
 
 # 프로그램 실행
 file_path = r"C:\Users\LG\Desktop\movies.txt"
-contact_list = []
+contact_store = ContactStore()
 booking_system = BookingSystem(file_path)
-app = Application(booking_system, contact_list)
+app = Application(booking_system, contact_store)
 app.mainloop()
@@ -1,139 +1,130 @@
-import os
 import tkinter as tk
 from tkinter import messagebox, simpledialog, ttk
-import datetime
 import re
-
-# Contact 클래스: 연락처 정보를 저장
-class Contact:
-    def __init__(self, phone_number, password, reservations=None):
-        self.phone_number = phone_number
-        self.password = password
-        self.reservations = reservations if reservations is not None else []
-
-    def print_info(self):
-        return f"전화번호: {self.phone_number}, 비밀번호: {self.password}\n"
-
-# Movie 클래스: 영화 정보를 저장
-class Movie:
-    def __init__(self, title, times, theater, age_limit):
-        self.title = title
-        self.times = times
-        self.theater = theater
-        self.age_limit = age_limit
-        self.seats = {time: [
-            'A1', 'A2', 'A3', 'A4', 'A5', 'A6',
-            'B1', 'B2', 'B3', 'B4', 'B5', 'B6',
-            'C1', 'C2', 'C3', 'C4', 'C5', 'C6',
-            'D1', 'D2', 'D3', 'D4', 'D5', 'D6',
-            'E1', 'E2', 'E3', 'E4', 'E5', 'E6',
-            'F1', 'F2', 'F3', 'F4', 'F5', 'F6'
-        ] for time in times}
-
-    def to_string(self):
-        return f"{self.title},{','.join(self.times)},{self.theater},{self.age_limit}"
-
-# BookingSystem 클래스: 영화 예매 시스템의 핵심 로직
-class BookingSystem:
-    def __init__(self, file_path):
-        self.movies = []
-        self.file_path = file_path
-        self.admin_password = "123"
-        self.ticket_prices = {'성인': 10000, '청소년': 8000, '어린이': 5000}  # 가격 정보 추가
-        self.load_movies()
-        self.sort_movies()
-
-    def load_movies(self):
-        if os.path.exists(self.file_path):
-            with open(self.file_path, "r", encoding="utf-8") as file:
-                for line in file:
-                    parts = line.strip().split(',')
-                    title = parts[0]
-                    times = parts[1].split(',')
-                    theater = parts[2]
-                    age_limit = parts[3]
-                    self.movies.append(Movie(title, times, theater, age_limit))
-
-    def save_movies(self):
-        with open(self.file_path, "w", encoding="utf-8") as file:
-            for movie in self.movies:
-                file.write(f"{movie.to_string()}\n")
-
-    def sort_movies(self):
-        self.movies.sort(key=lambda movie: movie.title)
-
-    def display_movies(self):
-        movies_list = ""
-        for idx, movie in enumerate(self.movies):
-            movies_list += f"{idx + 1}. {movie.title} ({movie.age_limit})\n"
-        return movies_list
-
-    def binary_search_movie_by_name(self, name):
-        left, right = 0, len(self.movies) - 1
-        found_movies = []
-
-        while left <= right:
-            mid = (left + right) // 2
-            if name.lower() in self.movies[mid].title.lower():
-                found_movies.append(self.movies[mid])
-                l, r = mid - 1, mid + 1
-                while l >= left and name.lower() in self.movies[l].title.lower():
-                    found_movies.append(self.movies[l])
-                    l -= 1
-                while r <= right and name.lower() in self.movies[r].title.lower():
-                    found_movies.append(self.movies[r])
-                    r += 1
-                break
-            elif name.lower() < self.movies[mid].title.lower():
-                right = mid - 1
-            else:
-                left = mid + 1
-
-        return found_movies
-
-    def edit_movie(self, idx, new_title, new_times, new_theater, new_age_limit):
-        if 0 <= idx < len(self.movies):
-            self.movies[idx].title = new_title
-            self.movies[idx].times = new_times
-            self.movies[idx].theater = new_theater
-            self.movies[idx].age_limit = new_age_limit
-            self.sort_movies()
-            self.save_movies()
-            return True
-        return False
-
-    def delete_movie(self, idx):
-        if 0 <= idx < len(self.movies):
-            del self.movies[idx]
-            self.save_movies()
-            return True
-        return False
+import sys
+from reservation_journal import ReservationJournal
+from contact_store import ContactStore
+from seat_map import SeatOccupancyFile
+from movie_store import parse_showtimes
+from booking_system import BookingSystem, Contact, Movie
+from booking_service import BookingService
+from persistence_worker import WriteBehindWorker
+from booking_client import RemoteBookingService
+from virtual_list import VirtualList
+from seat_canvas import SeatCanvas
 
 # Application 클래스: Tkinter를 사용한 애플리케이션의 GUI
 class Application(tk.Tk):
-    def __init__(self, booking_system, contact_list):
+    def __init__(self, service):
         super().__init__()
-        self.booking_system = booking_system
-        self.contact_list = contact_list
+        self.service = service  # 예매 흐름은 모두 BookingService(또는 서버에 붙은 RemoteBookingService)를 거침
+        self.booking_system = service.booking_system  # 키오스크 모드에서는 None (관리자 기능 없음)
+        self.contact_store = service.contact_store
         self.title("영화 예매 및 연락처 관리 시스템")
+        self.pending = None  # 처리 중인 로그인/가입/결제 요청 (끝날 때까지 버튼을 다시 눌러도 무시)
+        self.seat_poll = None  # 키오스크 모드에서 진행 중인 좌석 조회 (pending과 따로 두어 버튼을 막지 않음)
+        self.load_contacts_from_file()
 
         self.main_frame = ttk.Frame(self)
         self.main_frame.grid(row=0, column=0, padx=10, pady=10)
+        self.screens = {}  # 화면 이름 -> 한 번 만들어 둔 Frame
+        self.current_screen = None
+        self.seat_map_view = None  # 좌석 화면에 그려진 회차의 좌석 맵
         self.login_frame()
+        self.expire_holds()
+
+    # 화면 전환: 처음 갈 때만 build(frame)로 위젯을 만들고, 이후에는 숨겨 둔 Frame을 다시 보여 줌
+    # 화면에 표시할 데이터는 각 화면 함수가 돌려받은 Frame의 위젯에 다시 채운다.
+    def show_screen(self, name, build):
+        screen = self.screens.get(name)
+        if screen is None:
+            screen = ttk.Frame(self.main_frame)
+            build(screen)
+            self.screens[name] = screen
+        if self.current_screen is not screen:
+            if self.current_screen is not None:
+                self.current_screen.grid_remove()
+            screen.grid(row=0, column=0)
+            self.current_screen = screen
+        return screen
+
+    # 목록 화면(날짜/시간)에 새 항목을 채움
+    def fill_listbox(self, listbox, items):
+        listbox.delete(0, tk.END)
+        listbox.insert(tk.END, *items)
+
+    # 결제하지 않은 좌석 홀드를 만료 시각에 풀고, 결제 전 예약 내역도 취소 (1초마다 실행)
+    # 좌석 화면이 열려 있으면 다른 사람의 예매/만료로 바뀐 좌석도 이때 좌석표에 반영
+    # 키오스크 모드에서는 좌석 조회가 서버 왕복이라 화면 스레드에서 기다리지 않고 poll_seats로 넘김
+    def expire_holds(self):
+        self.service.expire_holds()
+        if getattr(self.current_screen, "seat_canvas", None) is not None and self.seat_map_view is not None:
+            if self.booking_system is None:
+                self.poll_seats()
+            else:
+                self.refresh_seats()
+        self.after(1000, self.expire_holds)
+
+    # 서버 좌석 조회를 스레드에서 실행하고, 끝났을 때 아직 같은 회차 좌석 화면이면 좌석표에 반영
+    # 지난 조회가 끝나지 않았으면 이번 주기는 건너뜀
+    def poll_seats(self):
+        if self.seat_poll is not None:
+            return
+        showtime = (self.selected_movie, self.selected_date, self.selected_time)
+        self.seat_poll = self.service.submit(self.service.seat_map, *showtime)
+        self.after(20, self.finish_seat_poll, self.seat_poll, showtime)
+
+    def finish_seat_poll(self, future, showtime):
+        if not future.done():
+            self.after(20, self.finish_seat_poll, future, showtime)
+            return
+        self.seat_poll = None
+        if future.exception() is not None or future.result() is None:
+            return  # 다음 주기에 다시 조회 (끊긴 연결은 다음 요청 때 다시 연결됨)
+        still_showing = (getattr(self.current_screen, "seat_canvas", None) is not None and self.seat_map_view is not None
+                         and showtime[0] is self.selected_movie and showtime[1:] == (self.selected_date, self.selected_time))
+        if still_showing:
+            self.show_seats(future.result())
+
+    # 스레드 풀에서 도는 작업(비밀번호 해시 등)이 끝나면 callback(결과)를 화면 스레드에서 호출
+    # 작업이 예외로 끝나면(저장 실패, 서버 연결 끊김 등) callback 대신 오류를 보여 줌
+    def wait_for(self, future, callback):
+        if future.done():
+            self.pending = None
+            error = future.exception()
+            if error is not None:
+                messagebox.showerror("오류", f"처리하지 못했습니다: {error}")
+                return
+            callback(future.result())
+            return
+        self.pending = future
+        self.after(20, self.wait_for, future, callback)
+
+    # 키오스크 모드에서 서버 조회가 실패했을 때 (연결이 끊겼거나 서버가 꺼져 있음). 화면은 그대로 두고 다시 누를 수 있음
+    def show_connection_error(self, error):
+        messagebox.showerror("오류", f"예매 서버와 통신하지 못했습니다: {error}")
 
     def login_frame(self):
-        for widget in self.main_frame.winfo_children():
-            widget.destroy()
-        ttk.Label(self.main_frame, text="영화 예매 시스템에 오신 것을 환영합니다").grid(row=0, column=0, columnspan=2, pady=10)
-        
-        ttk.Button(self.main_frame, text="관리자 로그인", command=self.admin_login).grid(row=1, column=0, columnspan=2, pady=10)
-        ttk.Button(self.main_frame, text="사용자 로그인", command=self.user_login_frame).grid(row=2, column=0, columnspan=2, pady=10)
-        ttk.Button(self.main_frame, text="회원가입", command=self.user_register_frame).grid(row=3, column=0, columnspan=2, pady=10)
-        
-        self.directory_label = ttk.Label(self.main_frame, text=f"movies.txt 파일은 이 디렉토리에 있습니다: {self.booking_system.file_path}")
+        self.show_screen("login", self.build_login_frame)
+
+    def build_login_frame(self, frame):
+        ttk.Label(frame, text="영화 예매 시스템에 오신 것을 환영합니다").grid(row=0, column=0, columnspan=2, pady=10)
+
+        ttk.Button(frame, text="관리자 로그인", command=self.admin_login).grid(row=1, column=0, columnspan=2, pady=10)
+        ttk.Button(frame, text="사용자 로그인", command=self.user_login_frame).grid(row=2, column=0, columnspan=2, pady=10)
+        ttk.Button(frame, text="회원가입", command=self.user_register_frame).grid(row=3, column=0, columnspan=2, pady=10)
+
+        if self.booking_system is None:
+            location = f"예매 서버에 연결되었습니다: {self.service.address}"
+        else:
+            location = f"movies.txt 파일은 이 디렉토리에 있습니다: {self.booking_system.file_path}"
+        self.directory_label = ttk.Label(frame, text=location)
         self.directory_label.grid(row=4, column=0, columnspan=2, pady=10)
 
     def admin_login(self):
+        if self.booking_system is None:
+            messagebox.showerror("오류", "키오스크 모드에서는 관리자 기능을 사용할 수 없습니다.")
+            return
         password = simpledialog.askstring("비밀번호", "관리자 비밀번호를 입력하세요:", show='*')
         if password == self.booking_system.admin_password:
             self.admin_panel()
@@ -141,54 +132,90 @@ class Application(tk.Tk):
             messagebox.showerror("오류", "비밀번호가 틀렸습니다")
 
     def admin_panel(self):
-        for widget in self.main_frame.winfo_children():
-            widget.destroy()
-        self.main_frame.grid(row=0, column=0, padx=10, pady=10)
-        
-        ttk.Button(self.main_frame, text="영화 관리", command=self.manage_movies).grid(row=0, column=0, pady=10)
-        ttk.Button(self.main_frame, text="연락처 관리", command=self.contact_management).grid(row=1, column=0, pady=10)
-        ttk.Button(self.main_frame, text="로그아웃", command=self.login_frame).grid(row=2, column=0, pady=10)
+        self.show_screen("admin_panel", self.build_admin_panel)
+
+    def build_admin_panel(self, frame):
+        ttk.Button(frame, text="영화 관리", command=self.manage_movies).grid(row=0, column=0, pady=10)
+        ttk.Button(frame, text="연락처 관리", command=self.contact_management).grid(row=1, column=0, pady=10)
+        ttk.Button(frame, text="예매 현황", command=self.view_bookings).grid(row=2, column=0, pady=10)
+        ttk.Button(frame, text="매출 통계", command=self.view_statistics).grid(row=3, column=0, pady=10)
+        ttk.Button(frame, text="로그아웃", command=self.login_frame).grid(row=4, column=0, pady=10)
+
+    # 회차별 예매 현황과 영화 매출 (회원 전체를 돌지 않고 BookingIndex에서 바로 꺼냄)
+    def view_bookings(self):
+        title = simpledialog.askstring("예매 현황", "영화 제목을 입력하세요:")
+        date = simpledialog.askstring("예매 현황", "날짜를 입력하세요 (YYYY-MM-DD):", initialvalue=self.booking_system.today)
+        times = parse_showtimes(simpledialog.askstring("예매 현황", "상영 시간을 입력하세요 (HH:MM):") or "")
+        if not title or not date or times is None:
+            messagebox.showerror("오류", "영화 제목, 날짜, 상영 시간을 모두 입력하세요")
+            return
+        title, date, time = title.strip(), date.strip(), times[0]
+        # 색인은 저널에 기록할 때(service.lock 안) 바뀌므로 읽을 때도 같은 잠금을 잡음
+        with self.service.lock:
+            booking_index = self.service.get_booking_index()
+            lines = [f"{phone_number}: {', '.join(reservation['좌석'])} ({reservation.get('결제 방법', '결제 전')})"
+                     for phone_number, reservation in booking_index.bookings(title, date, time)]
+            if not lines:
+                lines.append("예매 내역이 없습니다.")
+            lines.append(f"예매 좌석: {booking_index.booked_seats(title, date, time)}석")
+            lines.append(f"{title} 매출: {booking_index.movie_revenue(title)}원")
+        messagebox.showinfo("예매 현황", "\n".join(lines))
+
+    # 저널로 갱신되는 열 단위 표에서 매출/점유율/연령대 통계를 집계해 보여 줌
+    def view_statistics(self):
+        capacities = {movie.title: movie.layout.seat_count for movie in self.booking_system.movies}
+        with self.service.lock:
+            lines = self.statistics_lines(self.service.statistics_table(), capacities)
+
+        statistics_window = tk.Toplevel(self)
+        statistics_window.title("매출 통계")
+        text = tk.Text(statistics_window, width=50, height=30)
+        text.insert(tk.END, "\n".join(lines))
+        text.config(state='disabled')
+        text.pack(padx=10, pady=10)
+
+    def statistics_lines(self, table, capacities):
+        lines = ["[영화별 매출]"]
+        lines += [f"{movie}: {revenue}원" for movie, revenue in table.revenue_by_movie().items()]
+        lines.append("\n[날짜별 매출]")
+        lines += [f"{date}: {revenue}원" for date, revenue in table.revenue_by_date().items()]
+        lines.append("\n[결제 방법별 매출]")
+        lines += [f"{method}: {revenue}원" for method, revenue in table.revenue_by_method().items()]
+        lines.append("\n[회차별 점유율]")
+        lines += [f"{movie} {date} {time}: {rate:.0%}"
+                  for (movie, date, time), rate in table.occupancy(capacities.get).items()]
+        lines.append("\n[연령대 구성]")
+        lines += [f"{group}: {count}명" for group, count in table.age_mix().items()]
+        return lines
     
     def manage_movies(self):
-        for widget in self.main_frame.winfo_children():
-            widget.destroy()
-        self.main_frame.grid(row=0, column=0, padx=10, pady=10)
-        
-        ttk.Label(self.main_frame, text="등록된 영화 목록").grid(row=0, column=0)
-        
-        self.movies_listbox = tk.Listbox(self.main_frame, width=30, height=20)
-        self.movies_listbox.grid(row=1, column=0)
-        
+        self.show_screen("manage_movies", self.build_manage_movies)
         self.update_movie_list()
-        
-        ttk.Button(self.main_frame, text="영화 추가", command=self.add_movie).grid(row=2, column=0, pady=5)
-        ttk.Button(self.main_frame, text="영화 조회", command=self.view_movies).grid(row=3, column=0, pady=5)
-        ttk.Button(self.main_frame, text="뒤로", command=self.admin_panel).grid(row=4, column=0, pady=5)
 
-    def update_movie_list(self):
-        self.booking_system.sort_movies()
-        self.movies_listbox.delete(0, tk.END)
-        for movie in self.booking_system.movies:
-            self.movies_listbox.insert(tk.END, movie.title)
+    def build_manage_movies(self, frame):
+        ttk.Label(frame, text="등록된 영화 목록").grid(row=0, column=0)
 
-    def confirm_time_selection(self):
-        try:
-            index = self.time_listbox.curselection()[0]
-            self.selected_time = self.time_listbox.get(index).strip()
-            print(f"Selected time: {self.selected_time}")  # 디버깅을 위해 추가
-            print(f"Available times: {list(self.selected_movie.seats.keys())}")  # 디버깅을 위해 추가
-            self.select_seat()
-        except IndexError:
-            messagebox.showerror("오류", "상영 시간을 선택하세요.")
+        self.movies_listbox = VirtualList(frame, self.booking_system.movies, lambda movie: movie.title, height=20, width=30)
+        self.movies_listbox.grid(row=1, column=0)
+
+        ttk.Button(frame, text="영화 추가", command=self.add_movie).grid(row=2, column=0, pady=5)
+        ttk.Button(frame, text="영화 조회", command=self.view_movies).grid(row=3, column=0, pady=5)
+        ttk.Button(frame, text="뒤로", command=self.admin_panel).grid(row=4, column=0, pady=5)
+
+    # 정렬된 영화 목록에서 보이는 줄만 다시 그림
+    def update_movie_list(self):
+        self.movies_listbox.refresh()
 
     def add_movie(self):
         new_title = simpledialog.askstring("영화 추가", "새 영화 제목을 입력하세요:")
-        new_times = simpledialog.askstring("영화 추가", "새 영화 시간을 입력하세요 (쉼표로 구분):").split(',')
+        new_times = parse_showtimes(simpledialog.askstring("영화 추가", "새 영화 시간을 입력하세요 (쉼표로 구분):") or "")
+        if new_times is None:
+            messagebox.showerror("오류", "상영 시간은 HH:MM 형식으로 입력하세요")
+            return
         new_theater = simpledialog.askstring("영화 추가", "새 영화 상영관을 입력하세요:")
         new_age_limit = simpledialog.askstring("영화 추가", "새 영화 연령 제한을 입력하세요:")
-        self.booking_system.movies.append(Movie(new_title, new_times, new_theater, new_age_limit))
-        self.booking_system.sort_movies()
-        self.booking_system.save_movies()
+        new_movie = Movie(new_title, new_times, new_theater, new_age_limit, self.booking_system.layout_for(new_theater))
+        self.booking_system.add_movie(new_movie)
         self.update_movie_list()
         messagebox.showinfo("성공", "영화가 성공적으로 추가되었습니다")
 
@@ -206,7 +233,7 @@ class Application(tk.Tk):
         search_button.pack(pady=5)
 
     def search_movies(self, name, search_window):
-        found_movies = self.booking_system.binary_search_movie_by_name(name)
+        found_movies = self.booking_system.search_movie_by_name(name)
         if found_movies:
             movies_list = "\n".join([f"{idx + 1}. {movie.title} ({movie.age_limit})" for idx, movie in enumerate(found_movies)])
             movies_label = tk.Label(search_window, text=movies_list)
@@ -250,7 +277,12 @@ class Application(tk.Tk):
 
     def edit_movie_details(self, movie, details_window):
         new_title = simpledialog.askstring("영화 수정", "새 영화 제목을 입력하세요:", initialvalue=movie.title)
-        new_times = simpledialog.askstring("영화 수정", "새 영화 시간을 입력하세요 (쉼표로 구분):", initialvalue=','.join(movie.times)).split(',')
+        new_times = simpledialog.askstring("영화 수정", "새 영화 시간을 입력하세요 (쉼표로 구분):", initialvalue=','.join(movie.times))
+        if new_times is not None:
+            new_times = parse_showtimes(new_times)
+            if new_times is None:
+                messagebox.showerror("오류", "상영 시간은 HH:MM 형식으로 입력하세요")
+                return
         new_theater = simpledialog.askstring("영화 수정", "새 상영관을 입력하세요:", initialvalue=movie.theater)
         new_age_limit = simpledialog.askstring("영화 수정", "새 연령 제한을 입력하세요:", initialvalue=movie.age_limit)
         if new_title is not None and new_times is not None and new_theater is not None and new_age_limit is not None:
@@ -274,17 +306,17 @@ class Application(tk.Tk):
                 messagebox.showerror("오류", "영화 삭제에 실패했습니다")
 
     def contact_management(self):
-        for widget in self.main_frame.winfo_children():
-            widget.destroy()
-        self.main_frame.grid(row=0, column=0, padx=10, pady=10)
+        self.show_screen("contact_management", self.build_contact_management)
+        self.load_contacts()
 
-        listbox_frame = ttk.Frame(self.main_frame)
+    def build_contact_management(self, frame):
+        listbox_frame = ttk.Frame(frame)
         listbox_frame.grid(row=0, column=0, padx=10, pady=10)
 
-        self.contact_listbox = tk.Listbox(listbox_frame, width=60, height=10)  # 넓이를 더 넓게 설정
+        self.contact_listbox = VirtualList(listbox_frame, self.contact_store, Contact.print_info, height=10, width=60)  # 넓이를 더 넓게 설정
         self.contact_listbox.grid(row=0, column=0, padx=(0, 10))
 
-        button_frame = ttk.Frame(self.main_frame)
+        button_frame = ttk.Frame(frame)
         button_frame.grid(row=0, column=1, padx=10, pady=10)
 
         ttk.Button(button_frame, text="검색", command=self.on_search_contact).grid(row=0, column=0, pady=5)
@@ -294,12 +326,9 @@ class Application(tk.Tk):
         ttk.Button(button_frame, text="홈", command=self.on_home).grid(row=4, column=0, pady=5)
         ttk.Button(button_frame, text="뒤로", command=self.admin_panel).grid(row=5, column=0, pady=5)
 
-        self.load_contacts()
-
     def on_add_contact(self):
         contact = self.set_contact()
         if contact:
-            self.contact_list.append(contact)
             self.refresh_listbox(self.contact_listbox)
 
     def on_delete_contact(self):
@@ -321,53 +350,53 @@ class Application(tk.Tk):
                 self.update_contact(phone_number, new_password)
                 self.refresh_listbox(self.contact_listbox)
 
+    # 전체 회원 목록으로 되돌리고 보이는 줄만 다시 그림
     def refresh_listbox(self, listbox):
-        listbox.delete(0, tk.END)
-        for contact in self.contact_list:
-            listbox.insert(tk.END, contact.print_info())
+        listbox.set_rows(self.contact_store)
 
     def on_home(self):
         self.refresh_listbox(self.contact_listbox)
 
     def load_contacts(self):
-        self.load_contacts_from_file()
         self.refresh_listbox(self.contact_listbox)
 
     def user_login_frame(self):
-        for widget in self.main_frame.winfo_children():
-            widget.destroy()
-        self.main_frame.grid(row=0, column=0, padx=10, pady=10)
-        
-        ttk.Label(self.main_frame, text="전화번호를 입력하세요 (예: 010-1234-5678):").grid(row=0, column=0, sticky='e')
-        self.phone_entry = ttk.Entry(self.main_frame)
+        self.show_screen("user_login", self.build_user_login_frame)
+        self.phone_entry.delete(0, tk.END)
+        self.password_entry.delete(0, tk.END)
+
+    def build_user_login_frame(self, frame):
+        ttk.Label(frame, text="전화번호를 입력하세요 (예: 010-1234-5678):").grid(row=0, column=0, sticky='e')
+        self.phone_entry = ttk.Entry(frame)
         self.phone_entry.grid(row=0, column=1)
-        
-        ttk.Label(self.main_frame, text="비밀번호를 입력하세요:").grid(row=1, column=0, sticky='e')
-        self.password_entry = ttk.Entry(self.main_frame, show="*")
+
+        ttk.Label(frame, text="비밀번호를 입력하세요:").grid(row=1, column=0, sticky='e')
+        self.password_entry = ttk.Entry(frame, show="*")
         self.password_entry.grid(row=1, column=1)
-        
-        ttk.Button(self.main_frame, text="로그인", command=self.user_login).grid(row=2, column=0, columnspan=2, pady=10)
-        ttk.Button(self.main_frame, text="뒤로", command=self.login_frame).grid(row=3, column=0, columnspan=2, pady=10)
+
+        ttk.Button(frame, text="로그인", command=self.user_login).grid(row=2, column=0, columnspan=2, pady=10)
+        ttk.Button(frame, text="뒤로", command=self.login_frame).grid(row=3, column=0, columnspan=2, pady=10)
 
     def user_register_frame(self):
-        for widget in self.main_frame.winfo_children():
-            widget.destroy()
-        self.main_frame.grid(row=0, column=0, padx=10, pady=10)
-        
-        ttk.Label(self.main_frame, text="전화번호를 입력하세요 (예: 010-1234-5678):").grid(row=0, column=0, sticky='e')
-        self.register_phone_entry = ttk.Entry(self.main_frame)
+        self.show_screen("user_register", self.build_user_register_frame)
+        for entry in (self.register_phone_entry, self.register_password_entry, self.register_confirm_password_entry):
+            entry.delete(0, tk.END)
+
+    def build_user_register_frame(self, frame):
+        ttk.Label(frame, text="전화번호를 입력하세요 (예: 010-1234-5678):").grid(row=0, column=0, sticky='e')
+        self.register_phone_entry = ttk.Entry(frame)
         self.register_phone_entry.grid(row=0, column=1)
-        
-        ttk.Label(self.main_frame, text="비밀번호를 입력하세요:").grid(row=1, column=0, sticky='e')
-        self.register_password_entry = ttk.Entry(self.main_frame, show="*")
+
+        ttk.Label(frame, text="비밀번호를 입력하세요:").grid(row=1, column=0, sticky='e')
+        self.register_password_entry = ttk.Entry(frame, show="*")
         self.register_password_entry.grid(row=1, column=1)
-        
-        ttk.Label(self.main_frame, text="비밀번호를 다시 입력하세요:").grid(row=2, column=0, sticky='e')
-        self.register_confirm_password_entry = ttk.Entry(self.main_frame, show="*")
+
+        ttk.Label(frame, text="비밀번호를 다시 입력하세요:").grid(row=2, column=0, sticky='e')
+        self.register_confirm_password_entry = ttk.Entry(frame, show="*")
         self.register_confirm_password_entry.grid(row=2, column=1)
-        
-        ttk.Button(self.main_frame, text="가입", command=self.user_register).grid(row=3, column=0, columnspan=2, pady=10)
-        ttk.Button(self.main_frame, text="뒤로", command=self.login_frame).grid(row=4, column=0, columnspan=2, pady=10)
+
+        ttk.Button(frame, text="가입", command=self.user_register).grid(row=3, column=0, columnspan=2, pady=10)
+        ttk.Button(frame, text="뒤로", command=self.login_frame).grid(row=4, column=0, columnspan=2, pady=10)
 
     def user_register(self):
         phone_number = self.register_phone_entry.get()
@@ -382,172 +411,217 @@ class Application(tk.Tk):
             messagebox.showerror("오류", "비밀번호가 일치하지 않습니다. 다시 입력하세요.")
             return
         
-        if phone_number in [contact.phone_number for contact in self.contact_list]:
+        if self.pending is None:
+            self.wait_for(self.service.submit(self.service.register, phone_number, password), self.on_registered)
+
+    def on_registered(self, contact):
+        if contact is None:
             messagebox.showerror("오류", "이미 가입된 전화번호입니다.")
             return
-        
-        new_contact = Contact(phone_number, password)
-        self.contact_list.append(new_contact)
-        self.save_contacts_to_file()
         messagebox.showinfo("가입 완료", "회원가입이 완료되었습니다.")
         self.login_frame()
 
     def user_login(self):
         phone_number = self.phone_entry.get()
         password = self.password_entry.get()
-        
-        for contact in self.contact_list:
-            if contact.phone_number == phone_number and contact.password == password:
-                self.current_user = contact
-                self.user_main_menu()
-                return
+
+        if self.pending is None:
+            self.wait_for(self.service.submit(self.service.login, phone_number, password), self.on_logged_in)
+
+    def on_logged_in(self, contact):
+        if contact is not None:
+            self.current_user = contact
+            self.user_main_menu()
+            return
         messagebox.showerror("오류", "전화번호 또는 비밀번호가 올바르지 않습니다.")
         
     def user_main_menu(self):
-        for widget in self.main_frame.winfo_children():
-            widget.destroy()
-        self.main_frame.grid(row=0, column=0, padx=10, pady=10)
-        
-        ttk.Label(self.main_frame, text=f"{self.current_user.phone_number}으로 로그인되었습니다.").grid(row=0, column=0, columnspan=2, pady=10)
-        
-        ttk.Button(self.main_frame, text="영화 예매", command=self.make_reservation).grid(row=1, column=0, columnspan=2, pady=10)
-        ttk.Button(self.main_frame, text="예매 내역 조회", command=self.view_reservations).grid(row=2, column=0, columnspan=2, pady=10)
-        ttk.Button(self.main_frame, text="로그아웃", command=self.login_frame).grid(row=3, column=0, columnspan=2, pady=10)
+        self.show_screen("user_main_menu", self.build_user_main_menu)
+        self.user_label.configure(text=f"{self.current_user.phone_number}으로 로그인되었습니다.")
+
+    def build_user_main_menu(self, frame):
+        self.user_label = ttk.Label(frame)
+        self.user_label.grid(row=0, column=0, columnspan=2, pady=10)
+
+        ttk.Button(frame, text="영화 예매", command=self.make_reservation).grid(row=1, column=0, columnspan=2, pady=10)
+        ttk.Button(frame, text="예매 내역 조회", command=self.view_reservations).grid(row=2, column=0, columnspan=2, pady=10)
+        ttk.Button(frame, text="로그아웃", command=self.login_frame).grid(row=3, column=0, columnspan=2, pady=10)
 
     def make_reservation(self):
-        for widget in self.main_frame.winfo_children():
-            widget.destroy()
-        self.main_frame.grid(row=0, column=0, padx=10, pady=10)
-        
-        ttk.Label(self.main_frame, text="영화를 선택하세요:").grid(row=0, column=0, columnspan=2, pady=10)
-        
-        self.movie_listbox = tk.Listbox(self.main_frame)
-        for movie in self.booking_system.movies:
-            self.movie_listbox.insert(tk.END, f"{movie.title} (연령 제한: {movie.age_limit})")
+        try:
+            movies = self.service.list_movies()
+        except OSError as error:
+            self.show_connection_error(error)
+            return
+        self.show_screen("make_reservation", self.build_make_reservation)
+        self.movie_choices = movies
+        self.movie_listbox.set_rows(self.movie_choices)
+
+    def build_make_reservation(self, frame):
+        ttk.Label(frame, text="영화를 선택하세요:").grid(row=0, column=0, columnspan=2, pady=10)
+
+        self.movie_listbox = VirtualList(frame, [], lambda movie: f"{movie.title} (연령 제한: {movie.age_limit})")
         self.movie_listbox.grid(row=1, column=0, columnspan=2, pady=10)
-        
-        ttk.Button(self.main_frame, text="선택", command=self.select_movie_for_reservation).grid(row=2, column=0, columnspan=2, pady=10)
-        
+
+        ttk.Button(frame, text="선택", command=self.select_movie_for_reservation).grid(row=2, column=0, columnspan=2, pady=10)
+
     def select_movie_for_reservation(self):
         try:
             index = self.movie_listbox.curselection()[0]
-            self.selected_movie = self.booking_system.movies[index]
+            self.selected_movie = self.movie_choices[index]
             self.select_age_groups()
         except IndexError:
             messagebox.showerror("오류", "영화를 선택하세요.")
     
     def select_age_groups(self):
-        for widget in self.main_frame.winfo_children():
-            widget.destroy()
-        self.main_frame.grid(row=0, column=0, padx=10, pady=10)
-        
-        ttk.Label(self.main_frame, text="연령대별 인원수를 선택하세요:").grid(row=0, column=0, columnspan=2, pady=10)
-        
-        ttk.Label(self.main_frame, text="성인 (19세 이상):").grid(row=1, column=0, pady=5)
-        self.adult_spinbox = ttk.Spinbox(self.main_frame, from_=0, to=10)
+        self.show_screen("select_age_groups", self.build_select_age_groups)
+        for spinbox in (self.adult_spinbox, self.teen_spinbox, self.child_spinbox):
+            spinbox.set(0)
+
+    def build_select_age_groups(self, frame):
+        ttk.Label(frame, text="연령대별 인원수를 선택하세요:").grid(row=0, column=0, columnspan=2, pady=10)
+
+        ttk.Label(frame, text="성인 (19세 이상):").grid(row=1, column=0, pady=5)
+        self.adult_spinbox = ttk.Spinbox(frame, from_=0, to=10)
         self.adult_spinbox.grid(row=1, column=1, pady=5)
-        
-        ttk.Label(self.main_frame, text="청소년 (13-18세):").grid(row=2, column=0, pady=5)
-        self.teen_spinbox = ttk.Spinbox(self.main_frame, from_=0, to=10)
+
+        ttk.Label(frame, text="청소년 (13-18세):").grid(row=2, column=0, pady=5)
+        self.teen_spinbox = ttk.Spinbox(frame, from_=0, to=10)
         self.teen_spinbox.grid(row=2, column=1, pady=5)
-        
-        ttk.Label(self.main_frame, text="어린이 (12세 이하):").grid(row=3, column=0, pady=5)
-        self.child_spinbox = ttk.Spinbox(self.main_frame, from_=0, to=10)
+
+        ttk.Label(frame, text="어린이 (12세 이하):").grid(row=3, column=0, pady=5)
+        self.child_spinbox = ttk.Spinbox(frame, from_=0, to=10)
         self.child_spinbox.grid(row=3, column=1, pady=5)
-        
-        ttk.Button(self.main_frame, text="다음", command=self.check_age_groups).grid(row=4, column=0, columnspan=2, pady=10)
+
+        ttk.Button(frame, text="다음", command=self.check_age_groups).grid(row=4, column=0, columnspan=2, pady=10)
 
     def check_age_groups(self):
         adults = int(self.adult_spinbox.get())
         teens = int(self.teen_spinbox.get())
         children = int(self.child_spinbox.get())
-        
-        if self.selected_movie.age_limit == "ALL" or self.selected_movie.age_limit == "Unknown Age":
-            self.age_groups = {'성인': adults, '청소년': teens, '어린이': children}
-            self.select_date()
-        elif self.selected_movie.age_limit == "19세" and teens == 0 and children == 0 and adults > 0:
-            self.age_groups = {'성인': adults, '청소년': teens, '어린이': children}
-            self.select_date()
-        elif self.selected_movie.age_limit == "15세" and children == 0 and (adults > 0 or teens > 0):
-            self.age_groups = {'성인': adults, '청소년': teens, '어린이': children}
+        age_groups = {'성인': adults, '청소년': teens, '어린이': children}
+
+        if adults + teens + children == 0:
+            messagebox.showerror("오류", "인원수를 선택하세요.")
+            return
+        try:
+            allowed = self.service.check_age(self.selected_movie, age_groups)
+        except OSError as error:
+            self.show_connection_error(error)
+            return
+        if allowed:
+            self.age_groups = age_groups
             self.select_date()
         else:
             messagebox.showerror("오류", f"해당 영화는 {self.selected_movie.age_limit} 관람가입니다. 연령대가 맞지 않습니다.")
             self.user_main_menu()
 
     def select_date(self):
-        for widget in self.main_frame.winfo_children():
-            widget.destroy()
-        self.main_frame.grid(row=0, column=0, padx=10, pady=10)
-        
-        today = datetime.datetime.today()
-        self.selected_date = today.strftime('%Y-%m-%d')
-        ttk.Label(self.main_frame, text=f"오늘 날짜로 예약됩니다: {self.selected_date}").grid(row=0, column=0, columnspan=2, pady=10)
-        
-        ttk.Button(self.main_frame, text="다음", command=self.select_time).grid(row=1, column=0, columnspan=2, pady=10)
+        try:
+            dates = self.service.booking_dates()
+        except OSError as error:
+            self.show_connection_error(error)
+            return
+        self.show_screen("select_date", self.build_select_date)
+        self.available_dates = dates
+        self.fill_listbox(self.date_listbox, self.available_dates)
+
+    def build_select_date(self, frame):
+        ttk.Label(frame, text="예매할 날짜를 선택하세요:").grid(row=0, column=0, columnspan=2, pady=10)
+
+        self.date_listbox = tk.Listbox(frame)
+        self.date_listbox.grid(row=1, column=0, columnspan=2, pady=10)
+
+        ttk.Button(frame, text="다음", command=self.confirm_date_selection).grid(row=2, column=0, columnspan=2, pady=10)
+        ttk.Button(frame, text="뒤로", command=self.select_age_groups).grid(row=3, column=0, columnspan=2, pady=10)
+
+    def confirm_date_selection(self):
+        try:
+            index = self.date_listbox.curselection()[0]
+            self.selected_date = self.available_dates[index]
+            self.select_time()
+        except IndexError:
+            messagebox.showerror("오류", "날짜를 선택하세요.")
     
     def select_time(self):
-        for widget in self.main_frame.winfo_children():
-            widget.destroy()
-        self.main_frame.grid(row=0, column=0, padx=10, pady=10)
+        self.show_screen("select_time", self.build_select_time)
+        self.time_label.configure(text=f"{self.selected_movie.title}의 가능한 상영 시간:")
+        self.available_times = self.selected_movie.times  # 불러올 때 이미 시간별로 나뉘어 있음
+        self.fill_listbox(self.time_listbox, self.available_times)
 
-        ttk.Label(self.main_frame, text=f"{self.selected_movie.title}의 가능한 상영 시간:").grid(row=0, column=0, columnspan=2, pady=10)
+    def build_select_time(self, frame):
+        self.time_label = ttk.Label(frame)
+        self.time_label.grid(row=0, column=0, columnspan=2, pady=10)
 
-        self.time_listbox = tk.Listbox(self.main_frame)
-        self.available_times = []
-        for time in self.selected_movie.times:
-            for individual_time in time.split(';'):
-                trimmed_time = individual_time.strip()
-                if trimmed_time:  # 빈 문자열을 제외
-                    self.available_times.append(trimmed_time)
-                    self.time_listbox.insert(tk.END, trimmed_time)
+        self.time_listbox = tk.Listbox(frame)
         self.time_listbox.grid(row=1, column=0, columnspan=2, pady=10)
 
-        ttk.Button(self.main_frame, text="확인", command=self.confirm_time_selection).grid(row=2, column=0, columnspan=2, pady=10)
-        ttk.Button(self.main_frame, text="뒤로", command=self.select_age_groups).grid(row=3, column=0, columnspan=2, pady=10)
+        ttk.Button(frame, text="확인", command=self.confirm_time_selection).grid(row=2, column=0, columnspan=2, pady=10)
+        ttk.Button(frame, text="뒤로", command=self.select_date).grid(row=3, column=0, columnspan=2, pady=10)
+
     def confirm_time_selection(self):
         try:
             index = self.time_listbox.curselection()[0]
             self.selected_time = self.time_listbox.get(index).strip()
-            print(f"Selected time: {self.selected_time}")  # 디버깅을 위해 추가
-            print(f"Available times: {list(self.selected_movie.seats.keys())}")  # 디버깅을 위해 추가
             self.select_seat()
         except IndexError:
             messagebox.showerror("오류", "상영 시간을 선택하세요.")
 
+    # 좌석 화면은 상영관 배치마다 한 번 만들고, 회차가 바뀌면 좌석표의 바뀐 칸만 다시 칠함
     def select_seat(self):
-        for widget in self.main_frame.winfo_children():
-            widget.destroy()
-        self.main_frame.grid(row=0, column=0, padx=10, pady=10)
-
-        ttk.Label(self.main_frame, text=f"{self.selected_movie.title}의 {self.selected_time} 상영 시간의 가능한 좌석:").grid(row=0, column=0, columnspan=6, pady=10)
-        ttk.Label(self.main_frame, text="스크린").grid(row=1, column=0, columnspan=6, pady=5)
-
-        self.seat_buttons = []
-        self.selected_seats = []
         try:
-            # self.selected_time을 포함하는 키를 찾습니다.
-            selected_time_key = None
-            for time_key in self.selected_movie.seats.keys():
-                if self.selected_time in time_key.split(';'):
-                    selected_time_key = time_key
-                    break
-
-            if selected_time_key is None:
-                raise KeyError(f"Selected time '{self.selected_time}' not found in seats")
-
-            for i, seat in enumerate(self.selected_movie.seats[selected_time_key]):
-                row = i // 6
-                col = i % 6
-                seat_button = ttk.Checkbutton(self.main_frame, text=seat, command=lambda s=seat: self.toggle_seat(s))
-                seat_button.grid(row=row+2, column=col, padx=5, pady=5)
-                self.seat_buttons.append(seat_button)
-        except KeyError as e:
-            print(e)
+            seat_map = self.service.seat_map(self.selected_movie, self.selected_date, self.selected_time)
+        except OSError as error:
+            self.show_connection_error(error)
+            return
+        layout = self.selected_movie.layout
+        screen = self.show_screen(("select_seat", layout), lambda frame: self.build_select_seat(frame, layout))
+        self.seat_canvas = screen.seat_canvas
+        screen.seat_label.configure(text=f"{self.selected_movie.title}의 {self.selected_time} 상영 시간의 가능한 좌석:")
 
         self.selected_seats = []
-        ttk.Button(self.main_frame, text="선택 완료", command=self.save_seat).grid(row=8, column=0, columnspan=6, pady=10)
-        ttk.Button(self.main_frame, text="뒤로", command=self.select_time).grid(row=9, column=0, columnspan=6, pady=10)
+        self.seat_map_view = None
+        if seat_map is None:
+            self.seat_canvas.grid_remove()
+            return
+        self.show_seats(seat_map)
+        self.seat_canvas.grid()
+
+    def build_select_seat(self, frame, layout):
+        frame.seat_label = ttk.Label(frame)
+        frame.seat_label.grid(row=0, column=0, pady=10)
+
+        frame.seat_canvas = SeatCanvas(frame, layout, self.toggle_seat)
+        frame.seat_canvas.grid(row=1, column=0, padx=5, pady=5)
+
+        ttk.Button(frame, text="추천 좌석", command=self.recommend_seats).grid(row=2, column=0, pady=10)
+        ttk.Button(frame, text="선택 완료", command=self.save_seat).grid(row=3, column=0, pady=10)
+        ttk.Button(frame, text="뒤로", command=self.select_time).grid(row=4, column=0, pady=10)
+
+    # 회차의 현재 좌석 상태를 좌석표에 반영. 다른 사람이 먼저 잡은 좌석은 선택에서 뺌 (좌석 맵이 없으면 False)
+    def refresh_seats(self):
+        seat_map = self.service.seat_map(self.selected_movie, self.selected_date, self.selected_time)
+        if seat_map is None:
+            return False
+        self.show_seats(seat_map)
+        return True
+
+    def show_seats(self, seat_map):
+        self.selected_seats = [seat for seat in self.selected_seats if seat_map.is_free(seat)]
+        self.seat_map_view = seat_map
+        self.seat_canvas.show(seat_map, self.selected_seats)
+
+    # 인원수만큼 붙어 있는 가장 좋은 좌석을 골라 체크
+    def recommend_seats(self):
+        try:
+            seats = self.service.find_best_seats(self.selected_movie, self.selected_date, self.selected_time, sum(self.age_groups.values()))
+            if seats is None:
+                messagebox.showerror("오류", "인원수만큼 붙어 있는 빈 좌석이 없습니다.")
+                return
+            self.selected_seats = seats
+            self.refresh_seats()
+        except OSError as error:
+            self.show_connection_error(error)
 
     def toggle_seat(self, seat):
         if seat in self.selected_seats:
@@ -557,49 +631,35 @@ class Application(tk.Tk):
                 self.selected_seats.append(seat)
             else:
                 messagebox.showerror("오류", "선택한 좌석 수가 인원 수를 초과했습니다.")
-
-    def save_seat(self):
-        if len(self.selected_seats) == sum(self.age_groups.values()):
-            selected_time_key = None
-            for time_key in self.selected_movie.seats.keys():
-                if self.selected_time in time_key.split(';'):
-                    selected_time_key = time_key
-                    break
-
-            if selected_time_key is None:
-                messagebox.showerror("오류", "선택된 시간에 대한 좌석 정보를 찾을 수 없습니다.")
                 return
+        self.seat_canvas.show(self.seat_map_view, self.selected_seats)
 
-            for seat in self.selected_seats:
-                index = self.selected_movie.seats[selected_time_key].index(seat)
-                self.selected_movie.seats[selected_time_key][index] = '■'
-            self.confirm_reservation()
-        else:
+    # 좌석 홀드는 스레드에서 처리 (키오스크 모드의 서버 왕복, 저널 기록이 화면을 멈추지 않도록)
+    def save_seat(self):
+        if self.seat_map_view is None:
+            messagebox.showerror("오류", "선택된 시간에 대한 좌석 정보를 찾을 수 없습니다.")
+            return
+        if len(self.selected_seats) != sum(self.age_groups.values()):
             messagebox.showerror("오류", "선택한 좌석 수가 인원 수와 맞지 않습니다.")
+            return
+        if self.pending is None:
+            future = self.service.submit(self.service.hold, self.current_user, self.selected_movie, self.selected_date,
+                                         self.selected_time, list(self.selected_seats), dict(self.age_groups))
+            self.wait_for(future, self.on_held)
+
+    def on_held(self, reservation):
+        # 다른 사용자가 먼저 잡은 좌석이 있으면 하나도 잡지 않고 다시 선택
+        self.reservation = reservation
+        if reservation is None:
+            messagebox.showerror("오류", "이미 예약된 좌석이 포함되어 있습니다.")
+            self.select_seat()
+            return
+        self.confirm_reservation()
 
     
     def confirm_reservation(self):
-        for widget in self.main_frame.winfo_children():
-            widget.destroy()
-        self.main_frame.grid(row=0, column=0, padx=10, pady=10)
-
-        total_cost = (
-            self.age_groups['성인'] * self.booking_system.ticket_prices['성인'] +
-            self.age_groups['청소년'] * self.booking_system.ticket_prices['청소년'] +
-            self.age_groups['어린이'] * self.booking_system.ticket_prices['어린이']
-        )
-
-        reservation_info = {
-            "영화": self.selected_movie.title,
-            "날짜": self.selected_date,
-            "시간": self.selected_time,
-            "좌석": self.selected_seats,
-            "연령대": self.age_groups,
-            "총액": total_cost
-        }
-
-        self.current_user.reservations.append(reservation_info)
-        self.save_contacts_to_file()
+        self.show_screen("confirm_reservation", self.build_confirm_reservation)
+        total_cost = self.reservation["총액"]
 
         age_groups_str = ", ".join([f"{k} {v}명" for k, v in self.age_groups.items() if v > 0])
         reservation_details = (
@@ -611,47 +671,113 @@ class Application(tk.Tk):
             f"총액: {total_cost}원"
         )
 
-        ttk.Label(self.main_frame, text="예약 정보:").grid(row=0, column=0, columnspan=2, pady=10)
-        ttk.Label(self.main_frame, text=reservation_details).grid(row=1, column=0, columnspan=2, pady=10)
+        self.reservation_label.configure(text=reservation_details)
+
+    def build_confirm_reservation(self, frame):
+        ttk.Label(frame, text="예약 정보:").grid(row=0, column=0, columnspan=2, pady=10)
+        self.reservation_label = ttk.Label(frame)
+        self.reservation_label.grid(row=1, column=0, columnspan=2, pady=10)
 
-        ttk.Button(self.main_frame, text="결제 (카드)", command=lambda: self.complete_payment("카드")).grid(row=2, column=0, pady=10)
-        ttk.Button(self.main_frame, text="결제 (현금)", command=lambda: self.complete_payment("현금")).grid(row=2, column=1, pady=10)
-        ttk.Button(self.main_frame, text="취소", command=self.cancel_reservation).grid(row=3, column=0, columnspan=2, pady=10)
+        ttk.Button(frame, text="결제 (카드)", command=lambda: self.complete_payment("카드")).grid(row=2, column=0, pady=10)
+        ttk.Button(frame, text="결제 (현금)", command=lambda: self.complete_payment("현금")).grid(row=2, column=1, pady=10)
+        ttk.Button(frame, text="취소", command=self.cancel_reservation).grid(row=3, column=0, columnspan=2, pady=10)
     
+    # 결제 기록이 디스크에 남을 때까지 스레드에서 기다리고, 화면은 그동안 멈추지 않음
     def complete_payment(self, method):
-        self.current_user.reservations[-1]["결제 방법"] = method
-        self.save_contacts_to_file()
+        if self.pending is None:
+            future = self.service.submit(self.service.pay, self.current_user, self.reservation["예약번호"], method)
+            self.wait_for(future, lambda paid: self.on_paid(paid, method))
+
+    def on_paid(self, paid, method):
+        # 홀드를 확정 예약으로 전환. 이미 만료되었으면 좌석과 예약이 풀린 상태
+        if not paid:
+            messagebox.showerror("오류", "좌석 선점 시간이 지나 예약이 취소되었습니다. 다시 예매해 주세요.")
+            self.user_main_menu()
+            return
         messagebox.showinfo("결제 완료", f"결제가 완료되었습니다! ({method})")
         self.user_main_menu()
     
     def cancel_reservation(self):
-        self.current_user.reservations.pop()
-        self.save_contacts_to_file()
+        if self.pending is None:
+            future = self.service.submit(self.service.cancel, self.current_user, self.reservation["예약번호"])
+            self.wait_for(future, self.on_cancelled)
+
+    def on_cancelled(self, cancelled):
         messagebox.showinfo("예약 취소", "예약이 취소되었습니다.")
         self.user_main_menu()
     
-    def view_reservations(self):
-        for widget in self.main_frame.winfo_children():
-            widget.destroy()
-        self.main_frame.grid(row=0, column=0, padx=10, pady=10)
-    
-        if not self.current_user.reservations:
-            ttk.Label(self.main_frame, text="예매 내역이 없습니다.").grid(row=0, column=0, pady=10)
+    # 예매 내역을 (영화, 날짜, 시간) 순으로 한 쪽에 page_size개씩 보여 줌. movie를 주면 그 영화만
+    def view_reservations(self, page=0, movie=None):
+        self.show_screen("view_reservations", self.build_view_reservations)
+
+        page_size = len(self.reservation_labels)
+        reservations = self.current_user.reservation_index.range(movie)
+        page_count = max(1, (len(reservations) + page_size - 1) // page_size)
+        page = max(0, min(page, page_count - 1))
+        first = page * page_size
+        shown = reservations[first:first + page_size]
+        for i, label in enumerate(self.reservation_labels):
+            if i >= len(shown):
+                label.grid_remove()
+                continue
+            reservation = shown[i]
+            age_groups_str = ", ".join([f"{k} {v}명" for k, v in reservation['연령대'].items() if v > 0])
+            reservation_details = (
+                f"{first + i + 1}. 영화: {reservation['영화']}\n"
+                f"날짜: {reservation['날짜']}\n"
+                f"시간: {reservation['시간']}\n"
+                f"좌석: {', '.join(reservation['좌석'])}\n"
+                f"연령대: {age_groups_str}\n"
+                f"총액: {reservation['총액']}원\n"
+                f"결제 방법: {reservation.get('결제 방법', 'N/A')}\n"
+            )
+            label.configure(text=reservation_details)
+            label.grid()
+
+        if not reservations:
+            message = "예매 내역이 없습니다." if movie is None else "해당 영화를 찾을 수 없습니다."
+            self.page_label.configure(text=message)
         else:
-            for i, reservation in enumerate(self.current_user.reservations):
-                age_groups_str = ", ".join([f"{k} {v}명" for k, v in reservation['연령대'].items() if v > 0])
-                reservation_details = (
-                    f"{i+1}. 영화: {reservation['영화']}\n"
-                    f"날짜: {reservation['날짜']}\n"
-                    f"시간: {reservation['시간']}\n"
-                    f"좌석: {', '.join(reservation['좌석'])}\n"
-                    f"연령대: {age_groups_str}\n"
-                    f"총액: {reservation['총액']}원\n"
-                    f"결제 방법: {reservation.get('결제 방법', 'N/A')}\n"
-                )
-                ttk.Label(self.main_frame, text=reservation_details).grid(row=i, column=0, pady=10)
-    
-        ttk.Button(self.main_frame, text="뒤로", command=self.user_main_menu).grid(row=i+1, column=0, pady=10)
+            self.page_label.configure(text=f"{page + 1} / {page_count}")
+        self.previous_page_button.configure(command=lambda: self.view_reservations(page - 1, movie))
+        self.next_page_button.configure(command=lambda: self.view_reservations(page + 1, movie))
+        if page > 0:
+            self.previous_page_button.grid()
+        else:
+            self.previous_page_button.grid_remove()
+        if page < page_count - 1:
+            self.next_page_button.grid()
+        else:
+            self.next_page_button.grid_remove()
+
+        if movie is None:
+            self.reservation_filter_button.configure(text="영화로 찾기", command=self.search_reservations_by_movie)
+        else:
+            self.reservation_filter_button.configure(text="전체 보기", command=self.view_reservations)
+
+    # 예매 내역 한 쪽(5건) 자리를 미리 만들어 두고 쪽이 바뀌면 글자만 바꿈
+    def build_view_reservations(self, frame):
+        self.reservation_labels = []
+        for row_index in range(5):
+            label = ttk.Label(frame)
+            label.grid(row=row_index, column=0, columnspan=2, pady=10)
+            self.reservation_labels.append(label)
+
+        self.page_label = ttk.Label(frame)
+        self.page_label.grid(row=5, column=0, columnspan=2, pady=5)
+        self.previous_page_button = ttk.Button(frame, text="이전")
+        self.previous_page_button.grid(row=6, column=0, pady=5)
+        self.next_page_button = ttk.Button(frame, text="다음")
+        self.next_page_button.grid(row=6, column=1, pady=5)
+
+        self.reservation_filter_button = ttk.Button(frame)
+        self.reservation_filter_button.grid(row=7, column=0, columnspan=2, pady=5)
+        ttk.Button(frame, text="뒤로", command=self.user_main_menu).grid(row=8, column=0, columnspan=2, pady=10)
+
+    def search_reservations_by_movie(self):
+        movie = simpledialog.askstring("검색", "검색할 영화 제목을 입력하세요:")
+        if movie:
+            self.view_reservations(0, movie.strip())
 
 
     # 연락처 관리 함수들
@@ -659,60 +785,43 @@ class Application(tk.Tk):
         phone_number = simpledialog.askstring("Input", "전화번호:")
         password = simpledialog.askstring("Input", "비밀번호:")
         if phone_number and password:
-            for contact in self.contact_list:
-                if contact.phone_number == phone_number:
-                    messagebox.showerror("Error", "이미 가입된 사용자입니다.")
-                    return None
-            return Contact(phone_number, password)
+            contact = self.service.register(phone_number, password)
+            if contact is None:
+                messagebox.showerror("Error", "이미 가입된 사용자입니다.")
+            return contact
         return None
 
     def delete_contact(self, phone_number):
-        for i, contact in enumerate(self.contact_list):
-            if contact.phone_number == phone_number:
-                del self.contact_list[i]
-                messagebox.showinfo("Deleted", f"[삭제] 전화번호: {phone_number}")
-                return
+        if self.service.delete_contact(phone_number):
+            messagebox.showinfo("Deleted", f"[삭제] 전화번호: {phone_number}")
+            return
         messagebox.showerror("Error", f"일치하는 연락처를 찾을 수 없습니다: {phone_number}")
 
     def search_contact(self, phone_number):
-        found_contacts = sorted([contact for contact in self.contact_list if phone_number in contact.phone_number], key=lambda x: x.phone_number)
-        self.contact_listbox.delete(0, tk.END)
-        for contact in found_contacts:
-            self.contact_listbox.insert(tk.END, contact.print_info())
+        found_contacts = self.contact_store.search(phone_number)
+        self.contact_listbox.set_rows(found_contacts)
 
     def update_contact(self, phone_number, new_password):
-        for contact in self.contact_list:
-            if contact.phone_number == phone_number:
-                contact.password = new_password
-                messagebox.showinfo("Updated", f"[수정] 전화번호: {phone_number}, 새로운 비밀번호: {new_password}")
-                return
+        if self.service.update_password(phone_number, new_password):
+            messagebox.showinfo("Updated", f"[수정] 전화번호: {phone_number}, 비밀번호가 변경되었습니다.")
+            return
         messagebox.showerror("Error", "일치하는 연락처를 찾을 수 없습니다.")
 
-    def save_contacts_to_file(self, filename=r"C:\Users\LG\Desktop\reservations.txt"):
-        with open(filename, "w", encoding="utf-8") as file:
-            for contact in self.contact_list:
-                reservations = repr(contact.reservations)
-                file.write(f"{contact.phone_number}|{contact.password}|{reservations}\n")
-
+    # 스냅샷 + 저널을 재생해 회원 정보를 불러옴. 저널이 없으면 예전 reservations.txt를 한 번 옮겨 옴
     def load_contacts_from_file(self, filename=r"C:\Users\LG\Desktop\reservations.txt"):
-        if os.path.exists(filename):
-            with open(filename, "r", encoding="utf-8") as file:
-                lines = file.readlines()
-                self.contact_list.clear()
-                for line in lines:
-                    parts = line.strip().split('|')
-                    if len(parts) == 3:
-                        phone_number = parts[0]
-                        password = parts[1]
-                        reservations = eval(parts[2])
-                        self.contact_list.append(Contact(phone_number, password, reservations))
-                self.contact_list.sort(key=lambda x: x.phone_number)
-        else:
-            messagebox.showerror("Error", "저장된 연락처 파일을 찾을 수 없습니다.")
-
-# 프로그램 실행
-file_path = r"C:\Users\LG\Desktop\movies.txt"
-contact_list = []
-booking_system = BookingSystem(file_path)
-app = Application(booking_system, contact_list)
-app.mainloop()
\ No newline at end of file
+        self.service.load_contacts(filename)
+
+# 프로그램 실행 (python 최종(3).py 서버주소:포트 로 실행하면 예매 서버에 붙는 키오스크 모드)
+if len(sys.argv) > 1:
+    host, port = sys.argv[1].rsplit(":", 1)
+    service = RemoteBookingService(host, int(port))
+else:
+    file_path = r"C:\Users\LG\Desktop\movies.txt"
+    contact_store = ContactStore()
+    seat_store = SeatOccupancyFile(r"C:\Users\LG\Desktop\seats.bin")
+    booking_system = BookingSystem(file_path, seat_store)
+    journal = ReservationJournal(r"C:\Users\LG\Desktop\reservations.journal", r"C:\Users\LG\Desktop\reservations.snapshot")
+    service = BookingService(booking_system, contact_store, journal, WriteBehindWorker())
+app = Application(service)
+app.mainloop()
+service.close()  # 창을 닫으면 밀린 저장을 마저 쓰고 fsync
\ No newline at end of file